@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ml_training.benchmark import (
+    DEFAULT_BATCH_SIZES,
+    DEFAULT_OPTIMIZATION_LEVELS,
+    DEFAULT_THREAD_COUNTS,
+    BenchmarkConfig,
+    run_benchmark,
+)
+from ml_training.sessions import GRAPH_OPTIMIZATION_LEVELS
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sklearn and ONNX inference throughput and latency.")
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--split", choices=("train", "validation", "test"), default="test")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_THREAD_COUNTS),
+        help="ONNX Runtime intra-op thread counts; 0 lets ONNX Runtime decide.",
+    )
+    parser.add_argument(
+        "--optimization-levels",
+        choices=GRAPH_OPTIMIZATION_LEVELS,
+        nargs="+",
+        default=list(DEFAULT_OPTIMIZATION_LEVELS),
+    )
+    parser.add_argument("--min-rows", type=int, default=4096, help="Rows scored per measurement.")
+    parser.add_argument("--skip-sklearn", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(
+        BenchmarkConfig(
+            data_dir=args.data_dir,
+            artifact_dir=args.artifact_dir,
+            split=args.split,
+            batch_sizes=tuple(args.batch_sizes),
+            thread_counts=tuple(args.threads),
+            optimization_levels=tuple(args.optimization_levels),
+            min_rows=args.min_rows,
+            include_sklearn=not args.skip_sklearn,
+        )
+    )
+    print(f"{'runtime':<8} {'threads':>7} {'opt':>9} {'batch':>6} {'rows/s':>12} {'p50 us/row':>11} {'p99 us/row':>11}")
+    for run in report["runs"]:
+        threads = "-" if run["threads"] is None else str(run["threads"])
+        level = run["graph_optimization_level"] or "-"
+        print(
+            f"{run['runtime']:<8} {threads:>7} {level:>9} {run['batch_size']:>6} "
+            f"{run['rows_per_second']:>12.0f} {run['per_row_latency_us']['p50']:>11.1f} "
+            f"{run['per_row_latency_us']['p99']:>11.1f}"
+        )
+    print(f"report: {report['report_path']}")
+
+
+if __name__ == "__main__":
+    main()
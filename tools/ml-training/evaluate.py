@@ -2,31 +2,163 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Dict, List
 
-from ml_training.model import EvaluationConfig, evaluate_artifacts
+from ml_training.evaluation import CONFIDENCE_THRESHOLDS, threshold_key
+from ml_training.feature_cache import FeatureCacheConfig
+from ml_training.model import EvaluationConfig, ParityConfig, evaluate_artifacts
+from ml_training.parallel_evaluation import EVALUATION_SPLITS, ParallelEvaluationConfig, evaluate_in_parallel
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Evaluate sklearn and ONNX transaction classifiers.")
     parser.add_argument("--data-dir", type=Path, default=Path("data"))
     parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
-    parser.add_argument("--split", choices=("train", "validation", "test"), default="test")
+    parser.add_argument("--split", choices=EVALUATION_SPLITS, default="test")
+    parser.add_argument(
+        "--splits",
+        choices=EVALUATION_SPLITS,
+        nargs="+",
+        help="Evaluate several splits concurrently in a process pool and write evaluation-summary.json.",
+    )
+    parser.add_argument(
+        "--extra-data-dirs",
+        type=Path,
+        nargs="+",
+        default=[],
+        help="Additional dataset directories evaluated alongside --data-dir in the process pool.",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size; 0 uses every CPU.")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows scored per evaluation chunk.")
+    parser.add_argument(
+        "--save-probabilities",
+        action="store_true",
+        help="Spill per-runtime probability matrices and true label indices to .npy files.",
+    )
+    parser.add_argument(
+        "--confidence-thresholds",
+        type=float,
+        nargs="+",
+        default=list(CONFIDENCE_THRESHOLDS),
+        help="Report how many predictions fall below each routing threshold.",
+    )
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="Compare sklearn and ONNX probabilities row by row and exit non-zero when tolerances are exceeded.",
+    )
+    parser.add_argument("--max-probability-diff", type=float, default=1e-4, help="Parity tolerance.")
+    parser.add_argument("--max-disagreement-rate", type=float, default=0.0, help="Parity argmax tolerance.")
+    parser.add_argument("--worst-rows", type=int, default=20, help="Disagreeing rows listed in the parity report.")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Reuse cached feature matrices from this directory.",
+    )
+    parser.add_argument("--cache-max-mb", type=int, default=2048, help="Feature cache size limit.")
     return parser.parse_args()
 
 
+def feature_cache_config(args: argparse.Namespace) -> FeatureCacheConfig | None:
+    if args.cache_dir is None:
+        return None
+    return FeatureCacheConfig(cache_dir=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
+def parity_config(args: argparse.Namespace) -> ParityConfig | None:
+    if not args.parity:
+        return None
+    return ParityConfig(
+        max_probability_diff=args.max_probability_diff,
+        max_disagreement_rate=args.max_disagreement_rate,
+        worst_rows=args.worst_rows,
+    )
+
+
 def main() -> None:
     args = parse_args()
+    if args.splits or args.extra_data_dirs:
+        evaluate_many(args)
+        return
     result = evaluate_artifacts(
         EvaluationConfig(
             data_dir=args.data_dir,
             artifact_dir=args.artifact_dir,
             split=args.split,
+            feature_cache=feature_cache_config(args),
+            chunk_size=args.chunk_size,
+            save_probabilities=args.save_probabilities,
+            confidence_thresholds=tuple(args.confidence_thresholds),
+            parity=parity_config(args),
         )
     )
     print(f"split: {args.split}")
     print(f"sklearn accuracy: {result['sklearn']['accuracy']:.4f}")
     print(f"onnx accuracy: {result['onnx']['accuracy']:.4f}")
+    confidence = result["onnx"]["confidence"]
+    for threshold in args.confidence_thresholds:
+        key = threshold_key(threshold)
+        print(f"onnx {key}: {confidence[key]} / {confidence['count']}")
+    for name, metrics in result.get("onnx_variants", {}).items():
+        print(
+            f"onnx {name} accuracy: {metrics['accuracy']:.4f} "
+            f"(delta {metrics['accuracy_delta']:+.4f}, macro_f1 delta {metrics['macro_f1_delta']:+.4f}, "
+            f"{metrics['model_bytes']} bytes)"
+        )
+    for runtime, path in result.get("probability_files", {}).items():
+        print(f"{runtime} probabilities: {path}")
     print(f"metrics: {result['metrics_path']}")
+    if "parity" in result:
+        check_parity([result["parity"]])
+
+
+def evaluate_many(args: argparse.Namespace) -> None:
+    summary = evaluate_in_parallel(
+        ParallelEvaluationConfig(
+            artifact_dir=args.artifact_dir,
+            data_dirs=(args.data_dir, *args.extra_data_dirs),
+            splits=tuple(args.splits or (args.split,)),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            confidence_thresholds=tuple(args.confidence_thresholds),
+            parity=parity_config(args),
+            save_probabilities=args.save_probabilities,
+            feature_cache=feature_cache_config(args),
+        )
+    )
+    print(f"{'dataset':<32} {'split':<10} {'rows':>8} {'sklearn':>8} {'onnx':>8} {'seconds':>8}")
+    for evaluation in summary["evaluations"]:
+        print(
+            f"{str(evaluation['dataset_id'] or evaluation['data_dir']):<32} {evaluation['split']:<10} "
+            f"{evaluation['rows']:>8} {evaluation['sklearn']['accuracy']:>8.4f} "
+            f"{evaluation['onnx']['accuracy']:>8.4f} {evaluation['elapsed_seconds']:>8.1f}"
+        )
+        for runtime, path in evaluation.get("probability_files", {}).items():
+            print(f"  {runtime} probabilities: {path}")
+    for skipped in summary["skipped"]:
+        print(f"skipped {skipped['data_dir']} {skipped['split']}: {skipped['reason']}")
+    print(f"workers: {summary['workers']}, elapsed: {summary['elapsed_seconds']:.1f}s")
+    print(f"summary: {summary['summary_path']}")
+    if args.parity:
+        check_parity([evaluation["parity"] for evaluation in summary["evaluations"]])
+
+
+def check_parity(reports: List[Dict[str, object]]) -> None:
+    for report in reports:
+        print(
+            f"parity: max abs probability diff {report['max_abs_probability_diff']:.3g}, "
+            f"argmax disagreements {report['argmax_disagreements']}/{report['rows']} "
+            f"({report['argmax_disagreement_rate']:.4%})"
+        )
+        for row in report["worst_rows"]:
+            if row["argmax_disagrees"]:
+                print(
+                    f"  row {row['row']}: sklearn {row['reference_label']} ({row['reference_confidence']:.4f}) "
+                    f"onnx {row['candidate_label']} ({row['candidate_confidence']:.4f}) {row['text']!r}"
+                )
+    failed = [report for report in reports if not report["passed"]]
+    if failed:
+        raise SystemExit(f"parity check failed for {len(failed)} of {len(reports)} evaluations")
 
 
 if __name__ == "__main__":
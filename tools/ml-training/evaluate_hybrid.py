@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ml_training.hybrid import HYBRID_STRATEGIES, PRIMARY_STRATEGIES, HybridEvaluationConfig, evaluate_hybrid
+from ml_training.paths import RULES_PATH
+from ml_training.thresholds import LLM_ROUTING_THRESHOLD
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare rule, ML and hybrid classification with the classifier-service rule engine."
+    )
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--split", choices=("train", "validation", "test"), default="test")
+    parser.add_argument("--rules", type=Path, default=RULES_PATH, help="classifier-rules.yaml to evaluate.")
+    parser.add_argument(
+        "--confidence-threshold",
+        type=float,
+        default=LLM_ROUTING_THRESHOLD,
+        help="Predictions below this confidence are routed to the LLM.",
+    )
+    parser.add_argument(
+        "--primary",
+        choices=PRIMARY_STRATEGIES,
+        default="rule",
+        help="Strategy consulted first by the hybrid; the other one is used when it is not confident.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = evaluate_hybrid(
+        HybridEvaluationConfig(
+            data_dir=args.data_dir,
+            artifact_dir=args.artifact_dir,
+            split=args.split,
+            rules_path=args.rules,
+            confidence_threshold=args.confidence_threshold,
+            primary=args.primary,
+            chunk_size=args.chunk_size,
+        )
+    )
+    print(f"split: {args.split}")
+    print(f"{'strategy':<8} {'accuracy':>8} {'macro_f1':>8} {'accepted':>8} {'acc@thr':>8} {'llm':>8}")
+    for strategy in HYBRID_STRATEGIES:
+        metrics = report["strategies"][strategy]
+        routing = metrics["routing"]
+        accepted_accuracy = routing["accepted_accuracy"]
+        print(
+            f"{strategy:<8} {metrics['accuracy']:>8.4f} {metrics['macro_f1']:>8.4f} "
+            f"{routing['auto_accept_rate']:>8.4f} "
+            f"{'n/a' if accepted_accuracy is None else format(accepted_accuracy, '.4f'):>8} "
+            f"{routing['llm_fallback_rate']:>8.4f}"
+        )
+    sources = report["strategies"]["hybrid"]["routing"]["sources"]
+    print("hybrid sources: " + ", ".join(f"{source} {count}" for source, count in sources.items()))
+    print(f"rule/ml agreement: {report['rule_ml_agreement']:.4f}")
+    print(f"report: {report['report_path']}")
+
+
+if __name__ == "__main__":
+    main()
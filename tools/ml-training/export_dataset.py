@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from ml_training.dataset import DatasetExportConfig, export_datasets
+from ml_training.dataset import CSV_FORMAT, DATASET_FORMATS, DatasetExportConfig, export_datasets
 from ml_training.realistic_generator import (
     BALANCED_PROFILE,
     REALISTIC_PROFILE,
@@ -38,6 +38,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--users-per-split", type=int, default=64)
     parser.add_argument("--holdout-ratio", type=float, default=0.18)
     parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--format",
+        choices=DATASET_FORMATS,
+        default=CSV_FORMAT,
+        help="parquet writes typed, compressed columnar splits (requires pyarrow).",
+    )
     return parser.parse_args()
 
 
@@ -59,6 +65,7 @@ def main() -> None:
             users_per_split=args.users_per_split,
             holdout_ratio=args.holdout_ratio,
             seed=args.seed,
+            output_format=args.format,
         )
     )
 
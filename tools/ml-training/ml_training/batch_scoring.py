@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, TextIO
+
+import numpy as np
+import pandas as pd
+
+from .model import (
+    LABELS_FILENAME,
+    ONNX_MODEL_FILENAME,
+    SKLEARN_MODEL_FILENAME,
+    feature_frame,
+    load_labels,
+    predict_onnx_probabilities,
+)
+from .sessions import SessionConfig, get_pipeline
+
+RUNTIMES = ("onnx", "sklearn")
+PASSTHROUGH_COLUMNS = ["transactionId"]
+INPUT_COLUMNS = ["amount", "description", "merchantName", "mccCode"]
+FORMAT_BY_SUFFIX = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+@dataclass(frozen=True)
+class BatchScoringConfig:
+    input_path: Path
+    output_path: Path
+    artifact_dir: Path
+    runtime: str = "onnx"
+    chunk_size: int = 10000
+    top_k: int = 3
+    session_config: SessionConfig | None = None
+
+
+Scorer = Callable[[pd.DataFrame], np.ndarray]
+
+
+def score_file(config: BatchScoringConfig) -> Dict[str, object]:
+    validate_batch_config(config)
+    labels, scorer = build_scorer(config)
+    output_format = file_format(config.output_path)
+    top_k = min(config.top_k, len(labels))
+
+    rows = 0
+    chunks = 0
+    config.output_path.parent.mkdir(parents=True, exist_ok=True)
+    with config.output_path.open("w", newline="", encoding="utf-8") as file:
+        writer = build_writer(file, output_format, top_k)
+        for chunk in iter_transaction_chunks(config.input_path, config.chunk_size):
+            probabilities = scorer(feature_frame(chunk))
+            writer(score_records(chunk, labels, probabilities, top_k))
+            rows += len(chunk)
+            chunks += 1
+
+    return {
+        "runtime": config.runtime,
+        "rows": rows,
+        "chunks": chunks,
+        "output_path": str(config.output_path),
+    }
+
+
+def build_scorer(config: BatchScoringConfig) -> tuple[List[str], Scorer]:
+    if config.runtime == "sklearn":
+        pipeline = get_pipeline(config.artifact_dir / SKLEARN_MODEL_FILENAME)
+        labels = [str(label) for label in pipeline.named_steps["classifier"].classes_]
+        return labels, pipeline.predict_proba
+
+    labels = load_labels(config.artifact_dir / LABELS_FILENAME)
+    model_path = config.artifact_dir / ONNX_MODEL_FILENAME
+
+    def score(features: pd.DataFrame) -> np.ndarray:
+        return predict_onnx_probabilities(
+            model_path=model_path,
+            features=features,
+            labels=labels,
+            session_config=config.session_config,
+        )
+
+    return labels, score
+
+
+def iter_transaction_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if file_format(path) == "jsonl":
+        yield from iter_jsonl_chunks(path, chunk_size)
+        return
+
+    with pd.read_csv(
+        path,
+        dtype={"mccCode": "string", "transactionId": "string"},
+        chunksize=chunk_size,
+    ) as reader:
+        for chunk in reader:
+            yield normalize_input_chunk(chunk, path)
+
+
+def iter_jsonl_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    records: List[Dict[str, object]] = []
+    with path.open("r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            records.append(json.loads(line))
+            if len(records) >= chunk_size:
+                yield normalize_input_chunk(pd.DataFrame.from_records(records), path)
+                records = []
+    if records:
+        yield normalize_input_chunk(pd.DataFrame.from_records(records), path)
+
+
+def normalize_input_chunk(chunk: pd.DataFrame, path: Path) -> pd.DataFrame:
+    if "amount" not in chunk.columns or "description" not in chunk.columns:
+        raise ValueError(f"Batch input must contain 'amount' and 'description' columns: {path}")
+    for column in INPUT_COLUMNS:
+        if column not in chunk.columns:
+            chunk[column] = ""
+    chunk["mccCode"] = [normalize_mcc_code(value) for value in chunk["mccCode"].astype(object)]
+    return chunk.reset_index(drop=True)
+
+
+def normalize_mcc_code(value: object) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def score_records(
+    chunk: pd.DataFrame,
+    labels: List[str],
+    probabilities: np.ndarray,
+    top_k: int,
+) -> List[Dict[str, object]]:
+    matrix = np.asarray(probabilities)
+    top_indices = np.argsort(-matrix, axis=1, kind="stable")[:, :top_k]
+    top_scores = np.take_along_axis(matrix, top_indices, axis=1)
+    passthrough = [column for column in PASSTHROUGH_COLUMNS if column in chunk.columns]
+    passthrough_values = {
+        column: [None if pd.isna(value) else value for value in chunk[column].astype(object)]
+        for column in passthrough
+    }
+
+    records = []
+    for row_index in range(matrix.shape[0]):
+        record: Dict[str, object] = {
+            column: values[row_index]
+            for column, values in passthrough_values.items()
+        }
+        record["category"] = labels[int(top_indices[row_index, 0])]
+        record["confidence"] = float(top_scores[row_index, 0])
+        record["top"] = [
+            {"category": labels[int(index)], "confidence": float(score)}
+            for index, score in zip(top_indices[row_index], top_scores[row_index])
+        ]
+        records.append(record)
+    return records
+
+
+def build_writer(
+    file: TextIO,
+    output_format: str,
+    top_k: int,
+) -> Callable[[List[Dict[str, object]]], None]:
+    if output_format == "jsonl":
+        def write_jsonl(records: List[Dict[str, object]]) -> None:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False))
+                file.write("\n")
+
+        return write_jsonl
+
+    fieldnames = PASSTHROUGH_COLUMNS + ["category", "confidence"]
+    for rank in range(1, top_k + 1):
+        fieldnames += [f"top_{rank}_category", f"top_{rank}_confidence"]
+    writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+
+    def write_csv(records: List[Dict[str, object]]) -> None:
+        for record in records:
+            row = {column: record.get(column, "") for column in PASSTHROUGH_COLUMNS}
+            row["category"] = record["category"]
+            row["confidence"] = f"{record['confidence']:.6f}"
+            for rank, item in enumerate(record["top"], start=1):
+                row[f"top_{rank}_category"] = item["category"]
+                row[f"top_{rank}_confidence"] = f"{item['confidence']:.6f}"
+            writer.writerow(row)
+
+    return write_csv
+
+
+def file_format(path: Path) -> str:
+    output_format = FORMAT_BY_SUFFIX.get(path.suffix.lower())
+    if output_format is None:
+        raise ValueError(f"Unsupported batch file format (expected .csv or .jsonl): {path}")
+    return output_format
+
+
+def validate_batch_config(config: BatchScoringConfig) -> None:
+    if config.runtime not in RUNTIMES:
+        raise ValueError("runtime must be 'onnx' or 'sklearn'")
+    if config.chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    if config.top_k <= 0:
+        raise ValueError("top_k must be greater than 0")
+    file_format(config.input_path)
+    file_format(config.output_path)
+    if config.input_path.resolve() == config.output_path.resolve():
+        raise ValueError("output_path must differ from input_path")
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dataset import load_export_metadata, split_path
+from .model import (
+    LABELS_FILENAME,
+    ONNX_MODEL_FILENAME,
+    SKLEARN_MODEL_FILENAME,
+    feature_frame,
+    find_probability_output,
+    load_dataset,
+    load_labels,
+    onnx_feed,
+    write_json,
+)
+from .sessions import SessionConfig, create_session, get_pipeline, validate_session_config
+
+BENCHMARK_FILENAME = "benchmark.json"
+DEFAULT_BATCH_SIZES = (1, 8, 64, 512, 4096)
+DEFAULT_THREAD_COUNTS = (1, 0)
+DEFAULT_OPTIMIZATION_LEVELS = ("basic", "all")
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    data_dir: Path
+    artifact_dir: Path
+    split: str = "test"
+    batch_sizes: Tuple[int, ...] = DEFAULT_BATCH_SIZES
+    thread_counts: Tuple[int, ...] = DEFAULT_THREAD_COUNTS
+    optimization_levels: Tuple[str, ...] = DEFAULT_OPTIMIZATION_LEVELS
+    min_rows: int = 4096
+    min_batches: int = 5
+    warmup_batches: int = 2
+    include_sklearn: bool = True
+
+
+def run_benchmark(config: BenchmarkConfig) -> Dict[str, object]:
+    validate_benchmark_config(config)
+    df = load_dataset(split_path(config.data_dir, config.split))
+    if df.empty:
+        raise ValueError(f"Benchmark split is empty: {config.split}")
+    features = feature_frame(df)
+    labels = load_labels(config.artifact_dir / LABELS_FILENAME)
+
+    runs: List[Dict[str, object]] = []
+    if config.include_sklearn:
+        pipeline = get_pipeline(config.artifact_dir / SKLEARN_MODEL_FILENAME)
+        for batch_size in config.batch_sizes:
+            batches = [features.iloc[indices] for indices in batch_indices(len(features), batch_size, config)]
+            measurement = measure(pipeline.predict_proba, batches, batch_size, config.warmup_batches)
+            runs.append({"runtime": "sklearn", "threads": None, "graph_optimization_level": None, **measurement})
+
+    model_path = config.artifact_dir / ONNX_MODEL_FILENAME
+    for optimization_level in config.optimization_levels:
+        for threads in config.thread_counts:
+            session_config = SessionConfig(
+                intra_op_num_threads=threads,
+                inter_op_num_threads=1 if threads else 0,
+                graph_optimization_level=optimization_level,
+            )
+            session = create_session(model_path, session_config)
+
+            def score(feed: Dict[str, np.ndarray]) -> np.ndarray:
+                return find_probability_output(session.run(None, feed), labels)
+
+            for batch_size in config.batch_sizes:
+                batches = [
+                    onnx_feed(features.iloc[indices])
+                    for indices in batch_indices(len(features), batch_size, config)
+                ]
+                measurement = measure(score, batches, batch_size, config.warmup_batches)
+                runs.append(
+                    {
+                        "runtime": "onnx",
+                        "threads": threads,
+                        "graph_optimization_level": optimization_level,
+                        **measurement,
+                    }
+                )
+
+    report = {
+        "dataset": load_export_metadata(config.data_dir),
+        "split": config.split,
+        "split_rows": int(len(df)),
+        "environment": benchmark_environment(),
+        "model_files": {
+            "sklearn_bytes": file_size(config.artifact_dir / SKLEARN_MODEL_FILENAME),
+            "onnx_bytes": file_size(model_path),
+        },
+        "runs": runs,
+    }
+    report_path = config.artifact_dir / BENCHMARK_FILENAME
+    write_json(report_path, report)
+    report["report_path"] = str(report_path)
+    return report
+
+
+def batch_indices(row_count: int, batch_size: int, config: BenchmarkConfig) -> List[np.ndarray]:
+    batch_count = config.warmup_batches + max(config.min_batches, math.ceil(config.min_rows / batch_size))
+    offsets = np.arange(batch_count * batch_size) % row_count
+    return [offsets[start:start + batch_size] for start in range(0, offsets.size, batch_size)]
+
+
+def measure(
+    predict: Callable[[object], object],
+    batches: List[object],
+    batch_size: int,
+    warmup_batches: int,
+) -> Dict[str, object]:
+    for batch in batches[:warmup_batches]:
+        predict(batch)
+
+    durations = []
+    for batch in batches[warmup_batches:]:
+        started = time.perf_counter()
+        predict(batch)
+        durations.append(time.perf_counter() - started)
+
+    seconds = np.asarray(durations, dtype=np.float64)
+    per_row_us = seconds / batch_size * 1e6
+    total_rows = batch_size * seconds.size
+    return {
+        "batch_size": batch_size,
+        "batches": int(seconds.size),
+        "rows": int(total_rows),
+        "rows_per_second": float(total_rows / seconds.sum()) if seconds.sum() > 0 else 0.0,
+        "batch_latency_ms": percentiles(seconds * 1000.0),
+        "per_row_latency_us": percentiles(per_row_us),
+    }
+
+
+def percentiles(values: np.ndarray) -> Dict[str, float]:
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def benchmark_environment() -> Dict[str, object]:
+    import onnxruntime
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit_learn": sklearn.__version__,
+        "onnxruntime": onnxruntime.__version__,
+    }
+
+
+def file_size(path: Path) -> int | None:
+    return path.stat().st_size if path.exists() else None
+
+
+def validate_benchmark_config(config: BenchmarkConfig) -> None:
+    if not config.batch_sizes or any(batch_size <= 0 for batch_size in config.batch_sizes):
+        raise ValueError("batch_sizes must contain positive integers")
+    if config.min_rows <= 0:
+        raise ValueError("min_rows must be greater than 0")
+    if config.min_batches <= 0:
+        raise ValueError("min_batches must be greater than 0")
+    if config.warmup_batches < 0:
+        raise ValueError("warmup_batches must be greater than or equal to 0")
+    for threads in config.thread_counts:
+        for level in config.optimization_levels:
+            validate_session_config(SessionConfig(intra_op_num_threads=threads, graph_optimization_level=level))
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+from scipy.optimize import minimize_scalar
+from scipy.special import expit, log_softmax
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from .evaluation import expected_calibration_error
+from .model import evaluate_predictions, feature_frame, iter_dataset_chunks, label_array
+
+TEMPERATURE_CALIBRATION = "temperature"
+CALIBRATION_METHODS = (TEMPERATURE_CALIBRATION,)
+TEMPERATURE_BOUNDS = (0.05, 20.0)
+
+
+def calibrate_pipeline(
+    pipeline: Pipeline,
+    validation_path: Path,
+    method: str = TEMPERATURE_CALIBRATION,
+    chunk_size: int = 50000,
+) -> Tuple[Dict[str, object], Dict[str, object]]:
+    if method not in CALIBRATION_METHODS:
+        raise ValueError(f"calibration must be one of: {', '.join(CALIBRATION_METHODS)}")
+    classifier = pipeline.named_steps["classifier"]
+    labels = [str(label) for label in classifier.classes_]
+    all_scores, y_true = validation_scores(pipeline, validation_path, chunk_size)
+    label_index = {label: index for index, label in enumerate(labels)}
+    true_indices = np.fromiter((label_index.get(label, -1) for label in y_true), dtype=np.int64, count=len(y_true))
+    known = true_indices >= 0
+    scores, true_indices = all_scores[known], true_indices[known]
+    if true_indices.size == 0:
+        raise ValueError(f"Validation split has no rows with training labels: {validation_path}")
+
+    result = minimize_scalar(
+        lambda log_temperature: negative_log_likelihood(classifier, scores, true_indices, np.exp(log_temperature)),
+        bounds=tuple(np.log(TEMPERATURE_BOUNDS)),
+        method="bounded",
+    )
+    temperature = float(np.exp(result.x))
+    before = calibration_statistics(classifier, scores, true_indices, 1.0)
+    after = calibration_statistics(classifier, scores, true_indices, temperature)
+    classifier.coef_ = classifier.coef_ / temperature
+    classifier.intercept_ = classifier.intercept_ / temperature
+
+    probabilities = np.exp(scaled_log_probabilities(classifier, all_scores, temperature))
+    validation_metrics = evaluate_predictions(
+        labels=labels,
+        y_true=y_true.tolist(),
+        y_pred=[labels[index] for index in probabilities.argmax(axis=1)],
+        confidences=probabilities.max(axis=1).tolist(),
+    )
+    calibration = {
+        "method": method,
+        "temperature": temperature,
+        "folded_into_classifier": True,
+        "validation_rows": int(true_indices.size),
+        "before": before,
+        "after": after,
+    }
+    return calibration, validation_metrics
+
+
+def validation_scores(pipeline: Pipeline, path: Path, chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    classifier = pipeline.named_steps["classifier"]
+    features = pipeline.named_steps["features"]
+    scores = []
+    labels = []
+    for chunk in iter_dataset_chunks(path, chunk_size):
+        scores.append(classifier.decision_function(features.transform(feature_frame(chunk))))
+        labels.append(label_array(chunk))
+    return np.concatenate(scores), np.concatenate(labels)
+
+
+def scaled_log_probabilities(classifier: object, scores: np.ndarray, temperature: float) -> np.ndarray:
+    scaled = np.asarray(scores, dtype=np.float64) / temperature
+    if scaled.ndim == 1:
+        return np.log(np.clip(np.column_stack([expit(-scaled), expit(scaled)]), 1e-15, 1.0))
+    if isinstance(classifier, LogisticRegression) and classifier.solver != "liblinear":
+        return log_softmax(scaled, axis=1)
+    probabilities = expit(scaled)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    return np.log(np.clip(probabilities, 1e-15, 1.0))
+
+
+def negative_log_likelihood(
+    classifier: object,
+    scores: np.ndarray,
+    true_indices: np.ndarray,
+    temperature: float,
+) -> float:
+    log_probabilities = scaled_log_probabilities(classifier, scores, temperature)
+    return float(-log_probabilities[np.arange(true_indices.size), true_indices].mean())
+
+
+def calibration_statistics(
+    classifier: object,
+    scores: np.ndarray,
+    true_indices: np.ndarray,
+    temperature: float,
+) -> Dict[str, float]:
+    probabilities = np.exp(scaled_log_probabilities(classifier, scores, temperature))
+    return {
+        "expected_calibration_error": expected_calibration_error(
+            probabilities.max(axis=1),
+            probabilities.argmax(axis=1) == true_indices,
+        ),
+        "negative_log_likelihood": negative_log_likelihood(classifier, scores, true_indices, temperature),
+        "mean_confidence": float(probabilities.max(axis=1).mean()),
+    }
@@ -38,6 +38,14 @@ SPLIT_FILENAMES = {
     "test": "test.csv",
 }
 
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+DATASET_FORMATS = (CSV_FORMAT, PARQUET_FORMAT)
+DATASET_FORMAT_SUFFIXES = {
+    PARQUET_FORMAT: ".parquet",
+    CSV_FORMAT: ".csv",
+}
+
 EXPORT_METADATA_FILENAME = "export-metadata.json"
 
 
@@ -57,6 +65,7 @@ class DatasetExportConfig:
     users_per_split: int = 64
     holdout_ratio: float = 0.18
     seed: int = 42
+    output_format: str = CSV_FORMAT
 
 
 def export_datasets(config: DatasetExportConfig) -> Dict[str, Dict[str, object]]:
@@ -81,8 +90,14 @@ def export_datasets(config: DatasetExportConfig) -> Dict[str, Dict[str, object]]
             )
         )
         validate_rows(rows)
-        output_path = config.output_dir / SPLIT_FILENAMES[split_name]
-        write_rows(output_path, rows)
+        output_path = split_path(config.output_dir, split_name, config.output_format)
+        for stale_format in DATASET_FORMATS:
+            if stale_format != config.output_format:
+                split_path(config.output_dir, split_name, stale_format).unlink(missing_ok=True)
+        if config.output_format == PARQUET_FORMAT:
+            write_parquet_rows(output_path, rows)
+        else:
+            write_rows(output_path, rows)
         row_summary = summarize_rows(rows)
         summary[split_name] = {
             "path": str(output_path),
@@ -164,6 +179,8 @@ def validate_export_config(config: DatasetExportConfig) -> None:
         raise ValueError("users_per_split must be greater than 0")
     if config.holdout_ratio < 0 or config.holdout_ratio >= 1:
         raise ValueError("holdout_ratio must be in range [0.0, 1.0)")
+    if config.output_format not in DATASET_FORMATS:
+        raise ValueError("output_format must be 'csv' or 'parquet'")
 
 
 def split_per_category_count(config: DatasetExportConfig, split_name: str) -> int:
@@ -202,6 +219,46 @@ def write_rows(output_path: Path, rows: Iterable[Dict[str, object]]) -> None:
             writer.writerow({column: row.get(column, "") for column in CSV_COLUMNS})
 
 
+def write_parquet_rows(output_path: Path, rows: Iterable[Dict[str, object]]) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = list(rows)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    columns = {
+        column: [optional_text(row.get(column)) for row in rows]
+        for column in CSV_COLUMNS
+        if column not in {"amount", "timestamp"}
+    }
+    table = pa.table(
+        {
+            **{column: pa.array(values, type=pa.string()) for column, values in columns.items()},
+            "amount": pa.array([float(row["amount"]) for row in rows], type=pa.float32()),
+            "timestamp": pa.array(
+                [optional_text(row.get("timestamp")) for row in rows],
+                type=pa.string(),
+            ).cast(pa.timestamp("s", tz="UTC")),
+        }
+    ).select(CSV_COLUMNS)
+    pq.write_table(table, output_path, compression="zstd")
+
+
+def optional_text(value: object) -> str | None:
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def split_path(data_dir: Path, split_name: str, dataset_format: str | None = None) -> Path:
+    if dataset_format is not None:
+        return data_dir / f"{split_name}{DATASET_FORMAT_SUFFIXES[dataset_format]}"
+    for suffix in DATASET_FORMAT_SUFFIXES.values():
+        path = data_dir / f"{split_name}{suffix}"
+        if path.exists():
+            return path
+    return data_dir / SPLIT_FILENAMES[split_name]
+
+
 def read_rows(input_path: Path) -> List[Dict[str, str]]:
     with input_path.open("r", newline="", encoding="utf-8") as file:
         return list(csv.DictReader(file))
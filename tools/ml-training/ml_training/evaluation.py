@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Dict, Sequence
+
+import numpy as np
+
+CONFIDENCE_HISTOGRAM_BINS = 10000
+REPORTED_HISTOGRAM_BINS = 20
+CONFIDENCE_THRESHOLDS = (0.50, 0.70, 0.80, 0.90, 0.95)
+CONFIDENCE_QUANTILES = (0.50, 0.90, 0.99)
+CALIBRATION_BINS = 15
+
+
+class ConfidenceSketch:
+    def __init__(
+        self,
+        thresholds: Sequence[float] = CONFIDENCE_THRESHOLDS,
+        bins: int = CONFIDENCE_HISTOGRAM_BINS,
+    ) -> None:
+        if bins <= 0 or bins % REPORTED_HISTOGRAM_BINS:
+            raise ValueError(f"bins must be a positive multiple of {REPORTED_HISTOGRAM_BINS}")
+        self.thresholds = tuple(sorted(float(threshold) for threshold in thresholds))
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.below = np.zeros(len(self.thresholds), dtype=np.int64)
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, confidences: Sequence[float] | np.ndarray) -> "ConfidenceSketch":
+        values = np.asarray(confidences, dtype=np.float64).ravel()
+        if values.size == 0:
+            return self
+        bins = np.clip((values * self.bins).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(bins, minlength=self.bins)
+        self.below += np.asarray([(values < threshold).sum() for threshold in self.thresholds], dtype=np.int64)
+        self.total += float(values.sum())
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        return self
+
+    def merge(self, other: "ConfidenceSketch") -> "ConfidenceSketch":
+        if other.bins != self.bins or other.thresholds != self.thresholds:
+            raise ValueError("Only sketches with identical bins and thresholds can be merged")
+        self.counts += other.counts
+        self.below += other.below
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def quantile(self, quantile: float) -> float:
+        if not 0.0 <= quantile <= 1.0:
+            raise ValueError("quantile must be in range [0.0, 1.0]")
+        if self.count == 0:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        target = quantile * (cumulative[-1] - 1) + 0.5
+        index = min(int(np.searchsorted(cumulative, target, side="left")), self.bins - 1)
+        before = cumulative[index - 1] if index > 0 else 0
+        in_bin = self.counts[index]
+        fraction = (target - before) / in_bin if in_bin else 0.0
+        value = (index + fraction) / self.bins
+        return float(min(max(value, self.minimum), self.maximum))
+
+    def count_below(self, threshold: float) -> int:
+        threshold = float(threshold)
+        if threshold in self.thresholds:
+            return int(self.below[self.thresholds.index(threshold)])
+        raise KeyError(f"Threshold {threshold} is not tracked by this sketch")
+
+    def summary(self, quantiles: Sequence[float] = CONFIDENCE_QUANTILES) -> Dict[str, object]:
+        count = self.count
+        summary: Dict[str, object] = {
+            "count": count,
+            "mean": self.total / count if count else 0.0,
+            "min": self.minimum if count else 0.0,
+            "max": self.maximum if count else 0.0,
+        }
+        for quantile in quantiles:
+            summary[quantile_key(quantile)] = self.quantile(quantile)
+        for threshold, below in zip(self.thresholds, self.below):
+            summary[threshold_key(threshold)] = int(below)
+        summary["histogram"] = self.counts.reshape((REPORTED_HISTOGRAM_BINS, -1)).sum(axis=1).tolist()
+        return summary
+
+
+class MetricsAccumulator:
+    def __init__(self, labels: Sequence[str], confidence_thresholds: Sequence[float] = CONFIDENCE_THRESHOLDS) -> None:
+        self.labels = [str(label) for label in labels]
+        self.label_index = {label: index for index, label in enumerate(self.labels)}
+        size = len(self.labels)
+        self.confusion = np.zeros((size, size), dtype=np.int64)
+        self.predicted_counts = np.zeros(size, dtype=np.int64)
+        self.rows = 0
+        self.correct = 0
+        self.confidence = ConfidenceSketch(confidence_thresholds)
+        self.calibration_rows = np.zeros(CALIBRATION_BINS, dtype=np.int64)
+        self.calibration_correct = np.zeros(CALIBRATION_BINS, dtype=np.int64)
+        self.calibration_confidence = np.zeros(CALIBRATION_BINS, dtype=np.float64)
+
+    def label_indices(self, labels: Sequence[object]) -> np.ndarray:
+        return np.fromiter(
+            (self.label_index.get(str(label), -1) for label in labels),
+            dtype=np.int64,
+            count=len(labels),
+        )
+
+    def update(
+        self,
+        true_indices: np.ndarray,
+        predicted_indices: np.ndarray,
+        confidences: np.ndarray | None = None,
+    ) -> None:
+        true_indices = np.asarray(true_indices, dtype=np.int64)
+        predicted_indices = np.asarray(predicted_indices, dtype=np.int64)
+        size = len(self.labels)
+        known = true_indices >= 0
+        self.rows += int(true_indices.size)
+        self.correct += int((true_indices == predicted_indices).sum())
+        self.predicted_counts += np.bincount(predicted_indices, minlength=size)
+        self.confusion += np.bincount(
+            true_indices[known] * size + predicted_indices[known],
+            minlength=size * size,
+        ).reshape((size, size))
+        if confidences is not None:
+            confidences = np.asarray(confidences, dtype=np.float64)
+            self.confidence.update(confidences)
+            bins = calibration_bins(confidences)
+            self.calibration_rows += np.bincount(bins, minlength=CALIBRATION_BINS)
+            self.calibration_correct += np.bincount(bins[true_indices == predicted_indices], minlength=CALIBRATION_BINS)
+            self.calibration_confidence += np.bincount(bins, weights=confidences, minlength=CALIBRATION_BINS)
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        if other.labels != self.labels:
+            raise ValueError("Only accumulators with identical labels can be merged")
+        self.confusion += other.confusion
+        self.predicted_counts += other.predicted_counts
+        self.rows += other.rows
+        self.correct += other.correct
+        self.confidence.merge(other.confidence)
+        self.calibration_rows += other.calibration_rows
+        self.calibration_correct += other.calibration_correct
+        self.calibration_confidence += other.calibration_confidence
+        return self
+
+    def metrics(self) -> Dict[str, object]:
+        true_positive = np.diag(self.confusion).astype(np.float64)
+        support = self.confusion.sum(axis=1)
+        false_positive = self.predicted_counts - true_positive
+        false_negative = support - true_positive
+        precision = safe_divide(true_positive, self.predicted_counts)
+        recall = safe_divide(true_positive, support)
+        f1 = safe_divide(2.0 * true_positive, 2.0 * true_positive + false_positive + false_negative)
+        return {
+            "accuracy": float(self.correct / self.rows) if self.rows else 0.0,
+            "macro_f1": float(f1.mean()) if f1.size else 0.0,
+            "weighted_f1": float((f1 * support).sum() / support.sum()) if support.sum() else 0.0,
+            "per_category": {
+                label: {
+                    "precision": float(precision[index]),
+                    "recall": float(recall[index]),
+                    "f1": float(f1[index]),
+                    "support": int(support[index]),
+                }
+                for index, label in enumerate(self.labels)
+            },
+            "confidence": self.confidence.summary(),
+            "expected_calibration_error": binned_calibration_error(
+                self.calibration_rows,
+                self.calibration_correct,
+                self.calibration_confidence,
+            ),
+            "confusion_matrix": self.confusion.tolist(),
+            "labels": self.labels,
+        }
+
+
+class ParityTracker:
+    def __init__(self, labels: Sequence[str], worst_rows: int = 20) -> None:
+        self.labels = [str(label) for label in labels]
+        self.worst_rows = worst_rows
+        self.rows = 0
+        self.disagreements = 0
+        self.max_diff = 0.0
+        self.diff_sum = 0.0
+        self.worst: Dict[str, np.ndarray] = {}
+
+    def update(
+        self,
+        reference: np.ndarray,
+        candidate: np.ndarray,
+        details: Dict[str, np.ndarray] | None = None,
+    ) -> None:
+        reference = np.asarray(reference, dtype=np.float64)
+        candidate = np.asarray(candidate, dtype=np.float64)
+        if reference.shape[0] == 0:
+            return
+        row_diff = np.abs(reference - candidate).max(axis=1)
+        reference_pred = reference.argmax(axis=1)
+        candidate_pred = candidate.argmax(axis=1)
+        disagree = reference_pred != candidate_pred
+        self.max_diff = max(self.max_diff, float(row_diff.max()))
+        self.diff_sum += float(row_diff.sum())
+        self.disagreements += int(disagree.sum())
+
+        if self.worst_rows > 0:
+            score = row_diff + disagree
+            keep = np.argsort(-score, kind="stable")[:self.worst_rows]
+            self.merge_worst({
+                "row": self.rows + keep,
+                "score": score[keep],
+                "max_abs_probability_diff": row_diff[keep],
+                "reference_label": reference_pred[keep],
+                "candidate_label": candidate_pred[keep],
+                "reference_confidence": reference[keep, reference_pred[keep]],
+                "candidate_confidence": candidate[keep, candidate_pred[keep]],
+                **{name: np.asarray(values, dtype=object)[keep] for name, values in (details or {}).items()},
+            })
+        self.rows += int(reference.shape[0])
+
+    def merge_worst(self, chunk: Dict[str, np.ndarray]) -> None:
+        if self.worst:
+            chunk = {name: np.concatenate([self.worst[name], values]) for name, values in chunk.items()}
+        keep = np.argsort(-chunk["score"], kind="stable")[:self.worst_rows]
+        self.worst = {name: values[keep] for name, values in chunk.items()}
+
+    def report(self, max_probability_diff: float, max_disagreement_rate: float) -> Dict[str, object]:
+        disagreement_rate = self.disagreements / self.rows if self.rows else 0.0
+        worst_rows = []
+        for index in range(len(self.worst.get("row", []))):
+            row = {name: python_value(values[index]) for name, values in self.worst.items() if name != "score"}
+            row["reference_label"] = self.labels[row["reference_label"]]
+            row["candidate_label"] = self.labels[row["candidate_label"]]
+            row["argmax_disagrees"] = row["reference_label"] != row["candidate_label"]
+            worst_rows.append(row)
+        return {
+            "rows": self.rows,
+            "max_abs_probability_diff": self.max_diff,
+            "mean_abs_probability_diff": self.diff_sum / self.rows if self.rows else 0.0,
+            "argmax_disagreements": self.disagreements,
+            "argmax_disagreement_rate": disagreement_rate,
+            "tolerances": {
+                "max_abs_probability_diff": max_probability_diff,
+                "argmax_disagreement_rate": max_disagreement_rate,
+            },
+            "passed": self.max_diff <= max_probability_diff and disagreement_rate <= max_disagreement_rate,
+            "worst_rows": worst_rows,
+        }
+
+
+class NpyRowWriter:
+    def __init__(self, path: Path, columns: int, dtype: object = np.float32) -> None:
+        self.path = path
+        self.columns = columns
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self.written = False
+        self.raw_path = path.with_name(f"{path.name}.part")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.raw_file = self.raw_path.open("wb")
+
+    def append(self, values: np.ndarray) -> None:
+        array = np.ascontiguousarray(values, dtype=self.dtype)
+        if self.columns and array.reshape((array.shape[0], -1)).shape[1] != self.columns:
+            raise ValueError(f"Expected {self.columns} columns, got array of shape {array.shape}")
+        self.raw_file.write(array.tobytes())
+        self.rows += int(array.shape[0])
+
+    def close(self) -> Path:
+        self.raw_file.close()
+        shape = (self.rows, self.columns) if self.columns else (self.rows,)
+        self.written = True
+        with self.path.open("wb") as output, self.raw_path.open("rb") as raw:
+            np.lib.format.write_array_header_1_0(
+                output,
+                {"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False, "shape": shape},
+            )
+            shutil.copyfileobj(raw, output, length=16 * 1024 * 1024)
+        self.raw_path.unlink()
+        return self.path
+
+    def discard(self) -> None:
+        self.raw_file.close()
+        self.raw_path.unlink(missing_ok=True)
+        if self.written:
+            self.path.unlink(missing_ok=True)
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def calibration_bins(confidences: np.ndarray) -> np.ndarray:
+    return np.clip((confidences * CALIBRATION_BINS).astype(np.int64), 0, CALIBRATION_BINS - 1)
+
+
+def expected_calibration_error(
+    confidences: Sequence[float] | np.ndarray,
+    correct: Sequence[bool] | np.ndarray,
+) -> float:
+    confidences = np.asarray(confidences, dtype=np.float64)
+    if confidences.size == 0:
+        return 0.0
+    correct = np.asarray(correct, dtype=bool)
+    bins = calibration_bins(confidences)
+    return binned_calibration_error(
+        np.bincount(bins, minlength=CALIBRATION_BINS),
+        np.bincount(bins[correct], minlength=CALIBRATION_BINS),
+        np.bincount(bins, weights=confidences, minlength=CALIBRATION_BINS),
+    )
+
+
+def binned_calibration_error(rows: np.ndarray, correct: np.ndarray, confidence: np.ndarray) -> float:
+    total = rows.sum()
+    if total == 0:
+        return 0.0
+    return float(np.abs(correct - confidence).sum() / total)
+
+
+def python_value(value: object) -> object:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def quantile_key(quantile: float) -> str:
+    return f"p{quantile * 100:g}".replace(".", "_")
+
+
+def threshold_key(threshold: float) -> str:
+    return f"below_{threshold:.2f}".replace(".", "_")
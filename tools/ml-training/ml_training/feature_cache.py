@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+
+FEATURE_CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+OBJECTS_FILENAME = "objects.joblib"
+
+CacheEntry = Dict[str, object]
+
+
+@dataclass(frozen=True)
+class FeatureCacheConfig:
+    cache_dir: Path
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+
+
+def cached_entry(
+    config: FeatureCacheConfig | None,
+    key: Callable[[], str],
+    build: Callable[[], CacheEntry],
+) -> CacheEntry:
+    if config is None:
+        return build()
+    validate_feature_cache_config(config)
+    entry_key = key()
+    entry = load_entry(config, entry_key)
+    if entry is not None:
+        return entry
+    entry = build()
+    store_entry(config, entry_key, entry)
+    evict_entries(config, keep=entry_key)
+    return entry
+
+
+def cache_key(*parts: object) -> str:
+    document = json.dumps([FEATURE_CACHE_VERSION, *parts], sort_keys=True, default=list)
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_entry(config: FeatureCacheConfig, key: str) -> CacheEntry | None:
+    entry_dir = config.cache_dir / key
+    if not entry_dir.is_dir():
+        return None
+    entry: CacheEntry = {}
+    try:
+        for path in entry_dir.iterdir():
+            if path.suffix == ".npz":
+                entry[path.stem] = sparse.load_npz(path)
+            elif path.suffix == ".npy":
+                array = np.load(path, allow_pickle=False)
+                entry[path.stem] = array.astype(object) if array.dtype.kind == "U" else array
+            elif path.name == OBJECTS_FILENAME:
+                entry.update(joblib.load(path))
+        os.utime(entry_dir)
+    except FileNotFoundError:
+        return None
+    return entry
+
+
+def store_entry(config: FeatureCacheConfig, key: str, entry: CacheEntry) -> None:
+    config.cache_dir.mkdir(parents=True, exist_ok=True)
+    staging_dir = config.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+    staging_dir.mkdir()
+    objects = {}
+    for name, value in entry.items():
+        if sparse.issparse(value):
+            sparse.save_npz(staging_dir / f"{name}.npz", sparse.csr_matrix(value))
+        elif isinstance(value, np.ndarray):
+            array = value.astype(str) if value.dtype == object else value
+            np.save(staging_dir / f"{name}.npy", array, allow_pickle=False)
+        else:
+            objects[name] = value
+    if objects:
+        joblib.dump(objects, staging_dir / OBJECTS_FILENAME)
+    try:
+        os.replace(staging_dir, config.cache_dir / key)
+    except OSError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def evict_entries(config: FeatureCacheConfig, keep: str | None = None) -> List[str]:
+    entries: List[Tuple[float, int, Path]] = []
+    for entry_dir in config.cache_dir.iterdir():
+        if entry_dir.is_dir() and not entry_dir.name.startswith("."):
+            try:
+                size = sum(path.stat().st_size for path in entry_dir.iterdir())
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            except FileNotFoundError:
+                continue
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, entry_dir in sorted(entries, key=lambda item: item[0]):
+        if total <= config.max_bytes:
+            break
+        if entry_dir.name == keep:
+            continue
+        # Readers must see a whole entry or none of it, so the directory leaves its key before it is deleted.
+        doomed_dir = config.cache_dir / f".{entry_dir.name}.{uuid.uuid4().hex}.evict"
+        try:
+            os.replace(entry_dir, doomed_dir)
+        except FileNotFoundError:
+            continue
+        shutil.rmtree(doomed_dir, ignore_errors=True)
+        total -= size
+        evicted.append(entry_dir.name)
+    return evicted
+
+
+def cache_size_bytes(config: FeatureCacheConfig) -> int:
+    if not config.cache_dir.is_dir():
+        return 0
+    return sum(path.stat().st_size for path in config.cache_dir.rglob("*") if path.is_file())
+
+
+def validate_feature_cache_config(config: FeatureCacheConfig) -> None:
+    if config.max_bytes <= 0:
+        raise ValueError("feature cache max_bytes must be greater than 0")
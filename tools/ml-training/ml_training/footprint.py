@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .sessions import SessionConfig, create_session
+
+FOOTPRINT_TOLERANCES: Dict[str, Tuple[float, float]] = {
+    "text_vocabulary_size": (0.10, 0.0),
+    "nonzero_coefficients": (0.10, 0.0),
+    "sklearn_bytes": (0.10, 0.0),
+    "onnx_bytes": (0.10, 0.0),
+    "session_seconds": (0.50, 0.05),
+    "first_inference_ms": (0.50, 5.0),
+    "resident_memory_delta_bytes": (0.20, 16.0 * 1024 * 1024),
+}
+
+
+def measure_footprint(
+    pipeline: object,
+    sklearn_model_path: Path,
+    onnx_model_path: Path,
+    onnx_variants: Dict[str, Path],
+    sample_feed: Dict[str, np.ndarray],
+) -> Dict[str, object]:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        cold_start = executor.submit(measure_cold_start, onnx_model_path, sample_feed).result()
+    return {
+        **coefficient_summary(pipeline),
+        "sklearn_bytes": sklearn_model_path.stat().st_size,
+        "onnx_bytes": onnx_model_path.stat().st_size,
+        "onnx_variant_bytes": {name: path.stat().st_size for name, path in onnx_variants.items()},
+        **cold_start,
+    }
+
+
+def coefficient_summary(pipeline: object) -> Dict[str, int]:
+    coefficients = np.asarray(pipeline.named_steps["classifier"].coef_)
+    return {
+        "text_vocabulary_size": len(pipeline.named_steps["features"].named_transformers_["text"].vocabulary_),
+        "coefficients": int(coefficients.size),
+        "nonzero_coefficients": int(np.count_nonzero(coefficients)),
+    }
+
+
+def measure_cold_start(onnx_model_path: Path, sample_feed: Dict[str, np.ndarray]) -> Dict[str, object]:
+    # Imported before the baseline so the module's own load cost stays out of resident_memory_delta_bytes.
+    import onnxruntime  # noqa: F401
+
+    resident_before = resident_memory_bytes()
+    started = time.perf_counter()
+    session = create_session(onnx_model_path, SessionConfig())
+    session_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    session.run(None, sample_feed)
+    first_inference_ms = (time.perf_counter() - started) * 1000.0
+    started = time.perf_counter()
+    session.run(None, sample_feed)
+    second_inference_ms = (time.perf_counter() - started) * 1000.0
+    resident_after = resident_memory_bytes()
+    return {
+        "session_seconds": session_seconds,
+        "first_inference_ms": first_inference_ms,
+        "second_inference_ms": second_inference_ms,
+        "resident_memory_bytes": resident_after,
+        "resident_memory_delta_bytes": (
+            resident_after - resident_before if resident_after is not None and resident_before is not None else None
+        ),
+    }
+
+
+def resident_memory_bytes() -> int | None:
+    status_path = Path("/proc/self/status")
+    if status_path.exists():
+        for line in status_path.read_text(encoding="utf-8").splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def load_footprint(metadata_path: Path) -> Dict[str, object] | None:
+    if not metadata_path.exists():
+        return None
+    return json.loads(metadata_path.read_text(encoding="utf-8")).get("footprint")
+
+
+def compare_footprint(
+    current: Dict[str, object],
+    previous: Dict[str, object] | None,
+    baseline_dir: Path,
+) -> Dict[str, object]:
+    if previous is None:
+        return {"baseline": None, "deltas": {}, "regressions": []}
+    deltas = {}
+    regressions: List[str] = []
+    for name, (relative_tolerance, absolute_floor) in FOOTPRINT_TOLERANCES.items():
+        before, after = previous.get(name), current.get(name)
+        if before is None or after is None:
+            continue
+        change = after - before
+        relative_change = change / before if before > 0 else None
+        deltas[name] = {"previous": before, "current": after, "change": change, "relative_change": relative_change}
+        if change > absolute_floor and (relative_change is None or relative_change > relative_tolerance):
+            regressions.append(
+                f"{name} grew from {before:g} to {after:g}"
+                + (f" ({relative_change:+.1%}, tolerance {relative_tolerance:.0%})" if relative_change is not None else "")
+            )
+    return {"baseline": str(baseline_dir), "deltas": deltas, "regressions": regressions}
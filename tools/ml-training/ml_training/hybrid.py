@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from .dataset import load_export_metadata, split_path
+from .evaluation import MetricsAccumulator
+from .model import (
+    LABELS_FILENAME,
+    ONNX_MODEL_FILENAME,
+    feature_frame,
+    iter_dataset_chunks,
+    label_array,
+    load_labels,
+    predict_onnx_probabilities,
+    safe_artifact_suffix,
+    write_json,
+)
+from .paths import RULES_PATH
+from .rules import RULE_SOURCE, classify_rules, load_rule_set
+from .sessions import SessionConfig
+from .thresholds import LLM_ROUTING_THRESHOLD
+
+ML_SOURCE = "ML"
+LLM_SOURCE = "LLM"
+HYBRID_STRATEGIES = ("rule", "ml", "hybrid")
+PRIMARY_STRATEGIES = ("rule", "ml")
+
+
+@dataclass(frozen=True)
+class HybridEvaluationConfig:
+    data_dir: Path
+    artifact_dir: Path
+    split: str = "test"
+    rules_path: Path = RULES_PATH
+    confidence_threshold: float = LLM_ROUTING_THRESHOLD
+    primary: str = "rule"
+    chunk_size: int = 50000
+    session_config: SessionConfig | None = None
+
+
+def evaluate_hybrid(config: HybridEvaluationConfig) -> Dict[str, object]:
+    validate_hybrid_evaluation_config(config)
+    model_labels = load_labels(config.artifact_dir / LABELS_FILENAME)
+    rule_set = load_rule_set(config.rules_path)
+    labels = model_labels + [category for category in rule_set.categories if category not in model_labels]
+    dataset_metadata = load_export_metadata(config.data_dir)
+    dataset_suffix = safe_artifact_suffix(dataset_metadata.get("dataset_id") or config.data_dir.name)
+
+    accumulators = {strategy: MetricsAccumulator(labels) for strategy in HYBRID_STRATEGIES}
+    accepted = {strategy: 0 for strategy in HYBRID_STRATEGIES}
+    accepted_correct = {strategy: 0 for strategy in HYBRID_STRATEGIES}
+    sources = {RULE_SOURCE: 0, ML_SOURCE: 0, LLM_SOURCE: 0}
+    agreements = 0
+    threshold = config.confidence_threshold
+
+    for chunk in iter_dataset_chunks(split_path(config.data_dir, config.split), config.chunk_size):
+        true_indices = accumulators["rule"].label_indices(label_array(chunk))
+        rule_categories, rule_confidence = classify_rules(
+            rule_set,
+            chunk["description"].to_numpy(dtype=object),
+            chunk["merchantName"].to_numpy(dtype=object),
+            chunk["mccCode"].to_numpy(dtype=object),
+        )
+        probabilities = predict_onnx_probabilities(
+            model_path=config.artifact_dir / ONNX_MODEL_FILENAME,
+            features=feature_frame(chunk),
+            labels=model_labels,
+            session_config=config.session_config,
+        )
+        decisions = {
+            "rule": (accumulators["rule"].label_indices(rule_categories), rule_confidence),
+            "ml": (probabilities.argmax(axis=1), probabilities.max(axis=1).astype(np.float64)),
+        }
+        secondary = "ml" if config.primary == "rule" else "rule"
+        primary_indices, primary_confidence = decisions[config.primary]
+        secondary_indices, secondary_confidence = decisions[secondary]
+        primary_accepted = primary_confidence >= threshold
+        secondary_accepted = ~primary_accepted & (secondary_confidence >= threshold)
+        prefer_primary = primary_accepted | (~secondary_accepted & (primary_confidence >= secondary_confidence))
+        decisions["hybrid"] = (
+            np.where(prefer_primary, primary_indices, secondary_indices),
+            np.where(prefer_primary, primary_confidence, secondary_confidence),
+        )
+
+        for strategy, (predicted, confidence) in decisions.items():
+            accumulators[strategy].update(true_indices, predicted, confidence)
+            auto_accepted = confidence >= threshold
+            accepted[strategy] += int(auto_accepted.sum())
+            accepted_correct[strategy] += int((auto_accepted & (predicted == true_indices)).sum())
+        primary_source = RULE_SOURCE if config.primary == "rule" else ML_SOURCE
+        secondary_source = ML_SOURCE if config.primary == "rule" else RULE_SOURCE
+        sources[primary_source] += int(primary_accepted.sum())
+        sources[secondary_source] += int(secondary_accepted.sum())
+        sources[LLM_SOURCE] += int((~primary_accepted & ~secondary_accepted).sum())
+        agreements += int((decisions["rule"][0] == decisions["ml"][0]).sum())
+
+    rows = accumulators["rule"].rows
+    strategies = {}
+    for strategy, accumulator in accumulators.items():
+        metrics = accumulator.metrics()
+        metrics["routing"] = {
+            "rows": rows,
+            "auto_accepted": accepted[strategy],
+            "auto_accept_rate": accepted[strategy] / rows if rows else 0.0,
+            "accepted_accuracy": accepted_correct[strategy] / accepted[strategy] if accepted[strategy] else None,
+            "llm_calls": rows - accepted[strategy],
+            "llm_fallback_rate": (rows - accepted[strategy]) / rows if rows else 0.0,
+        }
+        strategies[strategy] = metrics
+    strategies["hybrid"]["routing"]["sources"] = sources
+
+    report = {
+        "dataset": dataset_metadata,
+        "split": config.split,
+        "rules_path": str(config.rules_path),
+        "confidence_threshold": threshold,
+        "primary": config.primary,
+        "rule_ml_agreement": agreements / rows if rows else 0.0,
+        "strategies": strategies,
+    }
+    report_path = config.artifact_dir / f"{config.split}-hybrid-{dataset_suffix}.json"
+    write_json(report_path, report)
+    report["report_path"] = str(report_path)
+    return report
+
+
+def validate_hybrid_evaluation_config(config: HybridEvaluationConfig) -> None:
+    if config.primary not in PRIMARY_STRATEGIES:
+        raise ValueError("primary must be 'rule' or 'ml'")
+    if not 0.0 <= config.confidence_threshold <= 1.0:
+        raise ValueError("confidence_threshold must be in range [0.0, 1.0]")
+    if config.chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
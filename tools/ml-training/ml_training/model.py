@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import inspect
 import json
-from dataclasses import dataclass
+import time
+import warnings
+from dataclasses import asdict, dataclass
 from pathlib import Path
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
 
 import joblib
 import numpy as np
@@ -18,15 +21,83 @@ from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precisio
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
-from .dataset import load_export_metadata
+from .dataset import load_export_metadata, split_path
+from .evaluation import (
+    CONFIDENCE_THRESHOLDS,
+    ConfidenceSketch,
+    MetricsAccumulator,
+    NpyRowWriter,
+    ParityTracker,
+    expected_calibration_error,
+)
+from .feature_cache import CacheEntry, FeatureCacheConfig, cache_key, cached_entry, file_digest
+from .footprint import coefficient_summary, compare_footprint, load_footprint, measure_footprint
+from .numeric_onnx import (
+    NUMERIC_FEATURES_FILENAME,
+    NUMERIC_ONNX_MODEL_FILENAME,
+    TEXT_INDICES_INPUT,
+    convert_pipeline_to_numeric_onnx,
+    get_numeric_feature_spec,
+    numeric_feature_spec,
+    numeric_feed,
+    numeric_spec_document,
+)
+from .onnx_optimization import ONNX_VARIANT_FILENAMES, export_onnx_variants, onnx_variant_paths
+from .sessions import SessionConfig, get_pipeline, get_session
 
 MISSING_MCC_TOKEN = "__MISSING_MCC__"
 AMOUNT_CLIP_MAX = 50000.0
+STRING_ONNX_INPUTS = "string"
+NUMERIC_ONNX_INPUTS = "numeric"
+ONNX_INPUT_FORMATS = (STRING_ONNX_INPUTS, NUMERIC_ONNX_INPUTS)
 SKLEARN_MODEL_FILENAME = "sklearn-pipeline.joblib"
 ONNX_MODEL_FILENAME = "transaction-classifier.onnx"
 LABELS_FILENAME = "labels.json"
 METRICS_FILENAME = "metrics.json"
 METADATA_FILENAME = "metadata.json"
+CALIBRATION_FILENAME = "calibration.json"
+
+TFIDF_MODEL_TYPE = "tfidf_logistic_regression"
+BOUNDED_TFIDF_MODEL_TYPE = "bounded_tfidf_logistic_regression"
+MODEL_TYPES = (TFIDF_MODEL_TYPE, BOUNDED_TFIDF_MODEL_TYPE)
+STREAMING_MODEL_TYPE = "streaming_tfidf_sgd"
+DEFAULT_VOCABULARY_SIZE = 2 ** 14
+PENALTIES = ("l2", "l1", "elasticnet")
+# scikit-learn 1.8 deprecated `penalty` in favour of selecting the regularization through `l1_ratio` alone.
+LOGISTIC_PENALTY_DEPRECATED = inspect.signature(LogisticRegression).parameters["penalty"].default == "deprecated"
+
+DATASET_COLUMNS = ("amount", "description", "merchantName", "mccCode", "label")
+CSV_DTYPES = {"mccCode": "string"}
+
+FeatureArrays = Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    model_type: str = TFIDF_MODEL_TYPE
+    vocabulary_size: int = DEFAULT_VOCABULARY_SIZE
+    ngram_range: Tuple[int, int] = (1, 2)
+    min_df: int = 1
+    max_features: int | None = None
+    sublinear_tf: bool = False
+    c: float = 1.0
+    class_weight: str | None = "balanced"
+    solver: str = "lbfgs"
+    max_iter: int = 1000
+    penalty: str = "l2"
+    l1_ratio: float = 0.5
+    prune_vocabulary: bool = False
+
+
+VECTORIZER_FIELDS = ("model_type", "vocabulary_size", "ngram_range", "min_df", "max_features", "sublinear_tf")
+
+
+@dataclass(frozen=True)
+class StreamingConfig:
+    chunk_size: int = 100000
+    epochs: int = 3
+    alpha: float = 1e-4
+    seed: int = 42
 
 
 @dataclass(frozen=True)
@@ -34,6 +105,21 @@ class TrainingConfig:
     data_dir: Path
     artifact_dir: Path
     target_opset: int = 15
+    optimize_onnx: bool = False
+    numeric_onnx: bool = False
+    pipeline: PipelineConfig = PipelineConfig()
+    feature_cache: FeatureCacheConfig | None = None
+    streaming: StreamingConfig | None = None
+    warm_start_from: Path | None = None
+    calibration: str | None = None
+    footprint_baseline: Path | None = None
+
+
+@dataclass(frozen=True)
+class ParityConfig:
+    max_probability_diff: float = 1e-4
+    max_disagreement_rate: float = 0.0
+    worst_rows: int = 20
 
 
 @dataclass(frozen=True)
@@ -41,27 +127,51 @@ class EvaluationConfig:
     data_dir: Path
     artifact_dir: Path
     split: str = "test"
+    session_config: SessionConfig | None = None
+    feature_cache: FeatureCacheConfig | None = None
+    chunk_size: int = 50000
+    save_probabilities: bool = False
+    confidence_thresholds: Tuple[float, ...] = CONFIDENCE_THRESHOLDS
+    parity: ParityConfig | None = None
 
 
 def train_model(config: TrainingConfig) -> Dict[str, str]:
     config.artifact_dir.mkdir(parents=True, exist_ok=True)
 
-    train_df = load_dataset(config.data_dir / "train.csv")
-    validation_df = load_dataset(config.data_dir / "validation.csv")
     dataset_metadata = load_export_metadata(config.data_dir)
-    pipeline = build_pipeline()
-    pipeline.fit(feature_frame(train_df), train_df["label"])
-
+    footprint_baseline = config.footprint_baseline or config.artifact_dir
+    previous_footprint = load_footprint(footprint_baseline / METADATA_FILENAME)
+    lineage = None
+    if config.streaming is not None and config.warm_start_from is not None:
+        raise ValueError("warm_start_from cannot be combined with streaming training")
+    if config.streaming is not None and (config.pipeline.penalty != "l2" or config.pipeline.prune_vocabulary):
+        raise ValueError("penalty and prune_vocabulary cannot be combined with streaming training")
+    if config.streaming is not None:
+        from .streaming import fit_streaming_pipeline
+
+        pipeline, validation_metrics = fit_streaming_pipeline(config.data_dir, config.pipeline, config.streaming)
+        model_type = STREAMING_MODEL_TYPE
+    elif config.warm_start_from is not None:
+        pipeline, validation_metrics, lineage = fit_warm_started_pipeline(config)
+        model_type = lineage["parent_model_type"] if lineage["warm_started"] else config.pipeline.model_type
+    else:
+        pipeline, validation_metrics = fit_pipeline(config)
+        model_type = config.pipeline.model_type
+    pruning = None
+    if config.pipeline.prune_vocabulary:
+        from .pruning import prune_pipeline
+
+        pipeline, validation_metrics, pruning = prune_pipeline(pipeline, config.data_dir, validation_metrics)
     labels = [str(label) for label in pipeline.named_steps["classifier"].classes_]
-    validation_features = feature_frame(validation_df)
-    validation_predictions = pipeline.predict(validation_features).tolist()
-    validation_confidences = pipeline.predict_proba(validation_features).max(axis=1).tolist()
-    validation_metrics = evaluate_predictions(
-        labels=labels,
-        y_true=validation_df["label"].tolist(),
-        y_pred=validation_predictions,
-        confidences=validation_confidences,
-    )
+    calibration = None
+    if config.calibration is not None:
+        from .calibration import calibrate_pipeline
+
+        calibration, validation_metrics = calibrate_pipeline(
+            pipeline,
+            split_path(config.data_dir, "validation"),
+            config.calibration,
+        )
 
     sklearn_model_path = config.artifact_dir / SKLEARN_MODEL_FILENAME
     onnx_model_path = config.artifact_dir / ONNX_MODEL_FILENAME
@@ -71,18 +181,41 @@ def train_model(config: TrainingConfig) -> Dict[str, str]:
 
     joblib.dump(pipeline, sklearn_model_path)
     export_onnx_model(pipeline, onnx_model_path, config.target_opset)
+    for stale_variant in ONNX_VARIANT_FILENAMES.values():
+        (config.artifact_dir / stale_variant).unlink(missing_ok=True)
+    (config.artifact_dir / NUMERIC_FEATURES_FILENAME).unlink(missing_ok=True)
+    calibration_path = config.artifact_dir / CALIBRATION_FILENAME
+    calibration_path.unlink(missing_ok=True)
+    if calibration is not None:
+        write_json(calibration_path, calibration)
+    onnx_variants = export_onnx_variants(onnx_model_path) if config.optimize_onnx else {}
+    if config.numeric_onnx:
+        onnx_variants["numeric"] = config.artifact_dir / NUMERIC_ONNX_MODEL_FILENAME
+        export_onnx_model(pipeline, onnx_variants["numeric"], config.target_opset, NUMERIC_ONNX_INPUTS)
     write_json(labels_path, {"labels": labels})
+    footprint = measure_footprint(
+        pipeline,
+        sklearn_model_path,
+        onnx_model_path,
+        onnx_variants,
+        onnx_feed(transaction_features(amount=25.0, description="coffee", merchant_name="starbucks", mcc_code="")),
+    )
+    footprint_comparison = compare_footprint(footprint, previous_footprint, footprint_baseline)
+    for regression in footprint_comparison["regressions"]:
+        warnings.warn(f"Model footprint regression: {regression}", RuntimeWarning, stacklevel=2)
     write_json(
         metrics_path,
         {
             "dataset": dataset_metadata,
             "validation": validation_metrics,
+            "pruning": pruning,
+            "calibration": calibration,
         },
     )
     write_json(
         metadata_path,
         {
-            "model_type": "tfidf_logistic_regression",
+            "model_type": model_type,
             "inputs": ["text", "mccCode", "amount"],
             "missing_mcc_token": MISSING_MCC_TOKEN,
             "amount_preprocessing": {
@@ -90,58 +223,258 @@ def train_model(config: TrainingConfig) -> Dict[str, str]:
                 "clip_max": AMOUNT_CLIP_MAX,
             },
             "target_opset": config.target_opset,
+            "pipeline": pipeline_config_document(config.pipeline, streaming=config.streaming is not None),
+            "streaming": asdict(config.streaming) if config.streaming is not None else None,
+            "text_vocabulary_size": len(pipeline.named_steps["features"].named_transformers_["text"].vocabulary_),
+            "onnx_variants": {
+                name: {
+                    "filename": path.name,
+                    "bytes": path.stat().st_size,
+                }
+                for name, path in onnx_variants.items()
+            },
+            "numeric_features": NUMERIC_FEATURES_FILENAME if config.numeric_onnx else None,
             "training_data": dataset_metadata,
+            "lineage": lineage,
+            "pruning": pruning,
+            "calibration": calibration,
+            "footprint": footprint,
+            "footprint_comparison": footprint_comparison,
         },
     )
 
-    return {
+    result = {
         "sklearn_model_path": str(sklearn_model_path),
         "onnx_model_path": str(onnx_model_path),
         "labels_path": str(labels_path),
         "metrics_path": str(metrics_path),
         "metadata_path": str(metadata_path),
     }
+    for name, path in onnx_variants.items():
+        result[f"onnx_{name}_model_path"] = str(path)
+    if calibration is not None:
+        result["calibration_path"] = str(calibration_path)
+    return result
+
+
+def fit_pipeline(config: TrainingConfig) -> Tuple[Pipeline, Dict[str, object]]:
+    training = training_features(config.data_dir, config.pipeline, config.feature_cache)
+    classifier = build_classifier(config.pipeline)
+    classifier.fit(training["x_train"], training["y_train"])
+    pipeline = Pipeline(steps=[("features", training["features"]), ("classifier", classifier)])
+
+    labels = [str(label) for label in classifier.classes_]
+    validation_metrics = evaluate_predictions(
+        labels=labels,
+        y_true=training["y_validation"].tolist(),
+        y_pred=classifier.predict(training["x_validation"]).tolist(),
+        confidences=classifier.predict_proba(training["x_validation"]).max(axis=1).tolist(),
+    )
+    return pipeline, validation_metrics
+
+
+def fit_warm_started_pipeline(config: TrainingConfig) -> Tuple[Pipeline, Dict[str, object], Dict[str, object]]:
+    parent_dir = config.warm_start_from
+    parent_model_path = parent_dir / SKLEARN_MODEL_FILENAME
+    parent_metadata_path = parent_dir / METADATA_FILENAME
+    parent_metadata = (
+        json.loads(parent_metadata_path.read_text(encoding="utf-8")) if parent_metadata_path.exists() else {}
+    )
+    parent_lineage = parent_metadata.get("lineage") or {}
+    parent = joblib.load(parent_model_path)
+    lineage = {
+        "parent_artifact_dir": str(parent_dir),
+        "parent_model_sha256": file_digest(parent_model_path),
+        "parent_model_type": parent_metadata.get("model_type"),
+        "parent_training_data": parent_metadata.get("training_data"),
+        "generation": int(parent_lineage.get("generation", 0)) + 1,
+        "warm_started": False,
+        "fallback_reason": None,
+        "vectorizer_mismatch": vectorizer_mismatch(config.pipeline, parent_metadata.get("pipeline")),
+    }
+
+    train_df = load_dataset(split_path(config.data_dir, "train"))
+    validation_df = load_dataset(split_path(config.data_dir, "validation"))
+    y_train = label_array(train_df)
+    parent_classifier = parent.named_steps.get("classifier")
+    labels = sorted(set(y_train.tolist()))
+    if not isinstance(parent_classifier, LogisticRegression):
+        lineage["fallback_reason"] = "parent classifier is not a LogisticRegression"
+    elif [str(label) for label in parent_classifier.classes_] != labels:
+        lineage["fallback_reason"] = "training labels differ from the parent model"
+    elif lineage["vectorizer_mismatch"] is None:
+        lineage["fallback_reason"] = "parent metadata does not record its vectorizer settings"
+    elif lineage["vectorizer_mismatch"]:
+        lineage["fallback_reason"] = (
+            f"vectorizer settings differ from the parent model: {', '.join(lineage['vectorizer_mismatch'])}"
+        )
+    if lineage["fallback_reason"] is not None:
+        pipeline, validation_metrics = fit_pipeline(config)
+        return pipeline, validation_metrics, lineage
+
+    features = parent.named_steps["features"]
+    classifier = build_classifier(config.pipeline)
+    classifier.set_params(warm_start=True)
+    classifier.coef_ = parent_classifier.coef_.copy()
+    classifier.intercept_ = parent_classifier.intercept_.copy()
+    started = time.perf_counter()
+    classifier.fit(features.transform(feature_frame(train_df)), y_train)
+    lineage["warm_started"] = True
+    lineage["fit_seconds"] = time.perf_counter() - started
+    lineage["classifier_iterations"] = int(np.max(classifier.n_iter_))
+    classifier.set_params(warm_start=False)
+
+    x_validation = features.transform(feature_frame(validation_df))
+    validation_metrics = evaluate_predictions(
+        labels=[str(label) for label in classifier.classes_],
+        y_true=label_array(validation_df).tolist(),
+        y_pred=classifier.predict(x_validation).tolist(),
+        confidences=classifier.predict_proba(x_validation).max(axis=1).tolist(),
+    )
+    pipeline = Pipeline(steps=[("features", features), ("classifier", classifier)])
+    return pipeline, validation_metrics, lineage
+
+
+def vectorizer_mismatch(
+    config: PipelineConfig,
+    parent_pipeline: Dict[str, object] | None,
+) -> Dict[str, Dict[str, object]] | None:
+    if parent_pipeline is None:
+        return None
+    requested = pipeline_config_document(config)
+    return {
+        name: {"requested": requested[name], "parent": parent_pipeline.get(name)}
+        for name in vectorizer_fields(config)
+        if requested[name] != parent_pipeline.get(name)
+    }
 
 
 def evaluate_artifacts(config: EvaluationConfig) -> Dict[str, object]:
-    split_path = config.data_dir / f"{config.split}.csv"
-    df = load_dataset(split_path)
+    if config.chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    if config.parity is not None:
+        validate_parity_config(config.parity)
+    dataset_path = split_path(config.data_dir, config.split)
+    sklearn_model_path = config.artifact_dir / SKLEARN_MODEL_FILENAME
+    onnx_model_path = config.artifact_dir / ONNX_MODEL_FILENAME
     labels = load_labels(config.artifact_dir / LABELS_FILENAME)
+    metadata_path = config.artifact_dir / METADATA_FILENAME
+    artifact_metadata = json.loads(metadata_path.read_text(encoding="utf-8")) if metadata_path.exists() else {}
     dataset_metadata = load_export_metadata(config.data_dir)
+    dataset_suffix = safe_artifact_suffix(dataset_metadata.get("dataset_id") or config.data_dir.name)
+    report_prefix = f"{config.split}-evaluation-{dataset_suffix}"
 
-    pipeline = joblib.load(config.artifact_dir / SKLEARN_MODEL_FILENAME)
-    features = feature_frame(df)
-    sklearn_probabilities = pipeline.predict_proba(features)
-    sklearn_pred = pipeline.predict(features).tolist()
-    onnx_probabilities = predict_onnx_probabilities(
-        model_path=config.artifact_dir / ONNX_MODEL_FILENAME,
-        features=features,
-        labels=labels,
+    pipeline = get_pipeline(sklearn_model_path)
+    classifier = pipeline.named_steps["classifier"]
+    variant_paths = onnx_variant_paths(config.artifact_dir)
+    runtimes = ["sklearn", "onnx", *variant_paths]
+    accumulators = {runtime: MetricsAccumulator(labels, config.confidence_thresholds) for runtime in runtimes}
+    max_probability_diffs = {name: 0.0 for name in variant_paths}
+    parity = ParityTracker(labels, config.parity.worst_rows) if config.parity is not None else None
+    writers = {}
+    if config.save_probabilities:
+        writers = {
+            runtime: NpyRowWriter(config.artifact_dir / f"{report_prefix}-{runtime}-probabilities.npy", len(labels))
+            for runtime in runtimes
+        }
+        writers["y_true"] = NpyRowWriter(config.artifact_dir / f"{report_prefix}-y-true.npy", 0, np.int16)
+
+    label_positions = np.asarray(
+        [labels.index(str(label)) for label in classifier.classes_],
+        dtype=np.int64,
     )
-    onnx_pred = labels_from_probabilities(labels, onnx_probabilities)
+    try:
+        for chunk in evaluation_chunks(config, dataset_path, pipeline.named_steps["features"]):
+            true_indices = accumulators["sklearn"].label_indices(chunk["y"])
+            features = {name: chunk[name] for name in ("text", "mccCode", "amount")}
+            probabilities = {"sklearn": np.zeros((true_indices.size, len(labels)), dtype=np.float32)}
+            probabilities["sklearn"][:, label_positions] = classifier.predict_proba(chunk["x"])
+            sklearn_pred = accumulators["sklearn"].label_indices(classifier.predict(chunk["x"]))
+            for name, model_path in (("onnx", onnx_model_path), *variant_paths.items()):
+                probabilities[name] = predict_onnx_probabilities(
+                    model_path=model_path,
+                    features=features,
+                    labels=labels,
+                    session_config=config.session_config,
+                )
+            for runtime, runtime_probabilities in probabilities.items():
+                predicted = sklearn_pred if runtime == "sklearn" else runtime_probabilities.argmax(axis=1)
+                accumulators[runtime].update(true_indices, predicted, runtime_probabilities.max(axis=1))
+                if runtime in writers:
+                    writers[runtime].append(runtime_probabilities)
+            for name in variant_paths:
+                max_probability_diffs[name] = max(
+                    max_probability_diffs[name],
+                    float(np.abs(probabilities[name] - probabilities["onnx"]).max(initial=0.0)),
+                )
+            if parity is not None:
+                parity.update(
+                    probabilities["sklearn"],
+                    probabilities["onnx"],
+                    {"label": chunk["y"], "text": chunk["text"], "mccCode": chunk["mccCode"]},
+                )
+            if writers:
+                writers["y_true"].append(true_indices)
+        probability_files = {runtime: str(writer.close()) for runtime, writer in writers.items()}
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+
+    onnx_metrics = accumulators["onnx"].metrics()
+    onnx_metrics["model_bytes"] = onnx_model_path.stat().st_size
+    variant_metrics = {}
+    for name, variant_path in variant_paths.items():
+        metrics = accumulators[name].metrics()
+        metrics["model_bytes"] = variant_path.stat().st_size
+        metrics["accuracy_delta"] = metrics["accuracy"] - onnx_metrics["accuracy"]
+        metrics["macro_f1_delta"] = metrics["macro_f1"] - onnx_metrics["macro_f1"]
+        metrics["max_probability_diff"] = max_probability_diffs[name]
+        variant_metrics[name] = metrics
 
     result = {
         "dataset": dataset_metadata,
-        "sklearn": evaluate_predictions(
-            labels,
-            df["label"].tolist(),
-            sklearn_pred,
-            confidences=sklearn_probabilities.max(axis=1).tolist(),
-        ),
-        "onnx": evaluate_predictions(
-            labels,
-            df["label"].tolist(),
-            onnx_pred,
-            confidences=onnx_probabilities.max(axis=1).tolist(),
-        ),
+        "sklearn": accumulators["sklearn"].metrics(),
+        "onnx": onnx_metrics,
+        "model": {
+            **coefficient_summary(pipeline),
+            "sklearn_bytes": sklearn_model_path.stat().st_size,
+            "onnx_bytes": onnx_metrics["model_bytes"],
+            "pruning": artifact_metadata.get("pruning"),
+        },
     }
-    dataset_suffix = safe_artifact_suffix(dataset_metadata.get("dataset_id") or config.data_dir.name)
-    metrics_path = config.artifact_dir / f"{config.split}-evaluation-{dataset_suffix}.json"
+    if variant_metrics:
+        result["onnx_variants"] = variant_metrics
+    if parity is not None:
+        result["parity"] = parity.report(config.parity.max_probability_diff, config.parity.max_disagreement_rate)
+    if writers:
+        result["probability_files"] = probability_files
+    metrics_path = config.artifact_dir / f"{report_prefix}.json"
     write_json(metrics_path, result)
     result["metrics_path"] = str(metrics_path)
     return result
 
 
+def evaluation_chunks(
+    config: EvaluationConfig,
+    dataset_path: Path,
+    fitted_features: ColumnTransformer,
+) -> Iterator[CacheEntry]:
+    if config.feature_cache is None:
+        for chunk in iter_dataset_chunks(dataset_path, config.chunk_size):
+            yield frame_features(chunk, fitted_features)
+        return
+
+    dataset_digest = file_digest(dataset_path)
+    features_digest = joblib.hash(fitted_features)
+    for index, chunk in enumerate(iter_dataset_chunks(dataset_path, config.chunk_size)):
+        yield cached_entry(
+            config.feature_cache,
+            lambda: cache_key("evaluation", dataset_digest, features_digest, config.chunk_size, index),
+            lambda: frame_features(chunk, fitted_features),
+        )
+
+
 def predict_sklearn_scores(
     model_path: Path,
     amount: float,
@@ -170,26 +503,46 @@ def predict_onnx_scores(
     description: str,
     merchant_name: str,
     mcc_code: str,
+    session_config: SessionConfig | None = None,
 ) -> List[Tuple[str, float]]:
     labels = load_labels(labels_path)
-    features = feature_frame(
-        transaction_frame(
-            amount=amount,
-            description=description,
-            merchant_name=merchant_name,
-            mcc_code=mcc_code,
-        )
+    features = transaction_features(
+        amount=amount,
+        description=description,
+        merchant_name=merchant_name,
+        mcc_code=mcc_code,
+    )
+    probabilities = predict_onnx_probabilities(
+        model_path=model_path,
+        features=features,
+        labels=labels,
+        session_config=session_config,
     )
-    probabilities = predict_onnx_probabilities(model_path=model_path, features=features, labels=labels)
     return sort_scores(labels, probabilities[0])
 
 
-def build_pipeline() -> Pipeline:
-    features = ColumnTransformer(
+def build_pipeline(config: PipelineConfig | None = None) -> Pipeline:
+    pipeline_config = config or PipelineConfig()
+    return Pipeline(
+        steps=[
+            ("features", build_features(pipeline_config)),
+            ("classifier", build_classifier(pipeline_config)),
+        ]
+    )
+
+
+def build_features(config: PipelineConfig) -> ColumnTransformer:
+    validate_pipeline_config(config)
+    return ColumnTransformer(
         transformers=[
             (
                 "text",
-                TfidfVectorizer(ngram_range=(1, 2), min_df=1),
+                TfidfVectorizer(
+                    ngram_range=tuple(config.ngram_range),
+                    min_df=config.min_df,
+                    max_features=text_feature_limit(config),
+                    sublinear_tf=config.sublinear_tf,
+                ),
                 "text",
             ),
             (
@@ -205,30 +558,169 @@ def build_pipeline() -> Pipeline:
         ],
         sparse_threshold=0.3,
     )
-    return Pipeline(
-        steps=[
-            ("features", features),
-            (
-                "classifier",
-                LogisticRegression(
-                    max_iter=1000,
-                    class_weight="balanced",
-                    random_state=42,
-                ),
-            ),
-        ]
+
+
+def text_feature_limit(config: PipelineConfig) -> int | None:
+    if config.model_type == BOUNDED_TFIDF_MODEL_TYPE:
+        return min(config.max_features or config.vocabulary_size, config.vocabulary_size)
+    return config.max_features
+
+
+def validate_parity_config(config: ParityConfig) -> None:
+    if config.max_probability_diff < 0:
+        raise ValueError("max_probability_diff must be greater than or equal to 0")
+    if not 0.0 <= config.max_disagreement_rate <= 1.0:
+        raise ValueError("max_disagreement_rate must be in range [0.0, 1.0]")
+    if config.worst_rows < 0:
+        raise ValueError("worst_rows must be greater than or equal to 0")
+
+
+def validate_pipeline_config(config: PipelineConfig) -> None:
+    if config.model_type not in MODEL_TYPES:
+        raise ValueError(f"model_type must be one of: {', '.join(MODEL_TYPES)}")
+    if config.vocabulary_size <= 0:
+        raise ValueError("vocabulary_size must be greater than 0")
+    if config.penalty not in PENALTIES:
+        raise ValueError(f"penalty must be one of: {', '.join(PENALTIES)}")
+    if not 0.0 <= config.l1_ratio <= 1.0:
+        raise ValueError("l1_ratio must be in range [0.0, 1.0]")
+    if config.penalty != "l2" and config.solver != "saga":
+        raise ValueError(f"penalty {config.penalty} requires solver saga")
+
+
+def build_classifier(config: PipelineConfig) -> LogisticRegression:
+    validate_pipeline_config(config)
+    return LogisticRegression(
+        C=config.c,
+        solver=config.solver,
+        max_iter=config.max_iter,
+        class_weight=config.class_weight,
+        random_state=42,
+        **regularization_params(config),
     )
 
 
-def load_dataset(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, dtype={"mccCode": "string"})
-    required = {
-        "amount",
-        "description",
-        "merchantName",
-        "mccCode",
-        "label",
+def regularization_params(config: PipelineConfig) -> Dict[str, object]:
+    if config.penalty == "l2":
+        return {}
+    l1_ratio = 1.0 if config.penalty == "l1" else config.l1_ratio
+    if LOGISTIC_PENALTY_DEPRECATED:
+        return {"l1_ratio": l1_ratio}
+    if config.penalty == "l1":
+        return {"penalty": "l1"}
+    return {"penalty": "elasticnet", "l1_ratio": l1_ratio}
+
+
+def training_features(
+    data_dir: Path,
+    config: PipelineConfig,
+    feature_cache: FeatureCacheConfig | None = None,
+) -> CacheEntry:
+    return cached_entry(
+        feature_cache,
+        lambda: cache_key(
+            "training",
+            file_digest(split_path(data_dir, "train")),
+            file_digest(split_path(data_dir, "validation")),
+            vectorizer_config_key(config),
+        ),
+        lambda: fit_training_features(data_dir, config),
+    )
+
+
+def fit_training_features(data_dir: Path, config: PipelineConfig) -> CacheEntry:
+    train_df = load_dataset(split_path(data_dir, "train"))
+    validation_df = load_dataset(split_path(data_dir, "validation"))
+    features = build_features(config)
+    started = time.perf_counter()
+    x_train = features.fit_transform(feature_frame(train_df))
+    fit_seconds = time.perf_counter() - started
+    # Terms pruned by min_df/max_features are kept only for introspection and would bloat the artifact.
+    features.named_transformers_["text"].stop_words_ = set()
+    return {
+        "features": features,
+        "x_train": x_train,
+        "y_train": label_array(train_df),
+        "x_validation": features.transform(feature_frame(validation_df)),
+        "y_validation": label_array(validation_df),
+        "fit_seconds": fit_seconds,
     }
+
+
+def frame_features(df: pd.DataFrame, features: ColumnTransformer) -> CacheEntry:
+    frame = feature_frame(df)
+    return {
+        "x": features.transform(frame),
+        "y": label_array(df),
+        "text": frame["text"].to_numpy(dtype=object),
+        "mccCode": frame["mccCode"].to_numpy(dtype=object),
+        "amount": frame["amount"].to_numpy(dtype=np.float32),
+    }
+
+
+def label_array(df: pd.DataFrame) -> np.ndarray:
+    return df["label"].astype(str).to_numpy(dtype=object)
+
+
+def vectorizer_config_key(config: PipelineConfig) -> Tuple[object, ...]:
+    return tuple(getattr(config, name) for name in vectorizer_fields(config))
+
+
+def vectorizer_fields(config: PipelineConfig, streaming: bool = False) -> Tuple[str, ...]:
+    if streaming or config.model_type == BOUNDED_TFIDF_MODEL_TYPE:
+        return VECTORIZER_FIELDS
+    return tuple(name for name in VECTORIZER_FIELDS if name != "vocabulary_size")
+
+
+def pipeline_config_document(config: PipelineConfig, streaming: bool = False) -> Dict[str, object]:
+    ignored = set(VECTORIZER_FIELDS) - set(vectorizer_fields(config, streaming))
+    return {
+        key: (list(value) if isinstance(value, tuple) else value)
+        for key, value in asdict(config).items()
+        if key not in ignored
+    }
+
+
+def load_dataset(path: Path, columns: Sequence[str] | None = DATASET_COLUMNS) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+    else:
+        df = pd.read_csv(
+            path,
+            dtype=CSV_DTYPES,
+            usecols=lambda column: columns is None or column in columns,
+        )
+    return validate_dataset_columns(df, columns)
+
+
+def iter_dataset_chunks(
+    path: Path,
+    chunk_size: int,
+    columns: Sequence[str] | None = DATASET_COLUMNS,
+) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(
+            batch_size=chunk_size,
+            columns=list(columns) if columns is not None else None,
+        ):
+            yield validate_dataset_columns(batch.to_pandas(), columns)
+        return
+
+    with pd.read_csv(
+        path,
+        dtype=CSV_DTYPES,
+        usecols=lambda column: columns is None or column in columns,
+        chunksize=chunk_size,
+    ) as reader:
+        for chunk in reader:
+            yield validate_dataset_columns(chunk, columns)
+
+
+def validate_dataset_columns(df: pd.DataFrame, columns: Sequence[str] | None = DATASET_COLUMNS) -> pd.DataFrame:
+    required = set(DATASET_COLUMNS if columns is None else columns)
     missing = sorted(required - set(df.columns))
     if missing:
         raise ValueError(f"Dataset is missing columns: {', '.join(missing)}")
@@ -266,14 +758,96 @@ def feature_frame(df: pd.DataFrame) -> pd.DataFrame:
 
 def transform_amount_feature(values: pd.Series) -> pd.Series:
     numeric = pd.to_numeric(values, errors="coerce").fillna(0.0).astype("float32")
-    clipped = numeric.clip(lower=-AMOUNT_CLIP_MAX, upper=AMOUNT_CLIP_MAX)
-    transformed = np.sign(clipped) * np.log1p(np.abs(clipped))
-    return pd.Series(transformed, index=values.index, dtype="float32")
+    return pd.Series(transform_amount_values(numeric.to_numpy()), index=values.index, dtype="float32")
 
 
-def export_onnx_model(pipeline: Pipeline, output_path: Path, target_opset: int) -> None:
+def transform_amount_values(values: np.ndarray) -> np.ndarray:
+    clipped = np.clip(values.astype(np.float32), -AMOUNT_CLIP_MAX, AMOUNT_CLIP_MAX)
+    return (np.sign(clipped) * np.log1p(np.abs(clipped))).astype(np.float32)
+
+
+def transaction_features(
+    amount: object,
+    description: object,
+    merchant_name: object,
+    mcc_code: object,
+) -> FeatureArrays:
+    return feature_arrays([amount], [description], [merchant_name], [mcc_code])
+
+
+def records_feature_arrays(records: Sequence[Mapping[str, object]]) -> FeatureArrays:
+    return feature_arrays(
+        [record.get("amount") for record in records],
+        [record.get("description") for record in records],
+        [record.get("merchantName") for record in records],
+        [record.get("mccCode") for record in records],
+    )
+
+
+def feature_arrays(
+    amounts: Sequence[object],
+    descriptions: Sequence[object],
+    merchant_names: Sequence[object],
+    mcc_codes: Sequence[object],
+) -> FeatureArrays:
+    text = np.empty(len(descriptions), dtype=object)
+    text[:] = [
+        f"{text_value(description)} {text_value(merchant_name)}".strip()
+        for description, merchant_name in zip(descriptions, merchant_names)
+    ]
+    mcc = np.empty(len(mcc_codes), dtype=object)
+    mcc[:] = [text_value(mcc_code) or MISSING_MCC_TOKEN for mcc_code in mcc_codes]
+    numeric = np.fromiter((numeric_value(amount) for amount in amounts), dtype=np.float64, count=len(amounts))
+    return {
+        "text": text,
+        "mccCode": mcc,
+        "amount": transform_amount_values(numeric),
+    }
+
+
+def text_value(value: object) -> str:
+    if is_missing(value):
+        return ""
+    return str(value)
+
+
+def numeric_value(value: object) -> float:
+    if is_missing(value):
+        return 0.0
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if np.isnan(result) else result
+
+
+def is_missing(value: object) -> bool:
+    if value is None or value is pd.NA:
+        return True
+    return isinstance(value, (float, np.floating)) and bool(np.isnan(value))
+
+
+def export_onnx_model(
+    pipeline: Pipeline,
+    output_path: Path,
+    target_opset: int,
+    inputs: str = STRING_ONNX_INPUTS,
+) -> None:
+    if inputs not in ONNX_INPUT_FORMATS:
+        raise ValueError(f"inputs must be one of: {', '.join(ONNX_INPUT_FORMATS)}")
+    if inputs == NUMERIC_ONNX_INPUTS:
+        output_path.write_bytes(convert_pipeline_to_numeric_onnx(pipeline, target_opset).SerializeToString())
+        write_json(
+            output_path.parent / NUMERIC_FEATURES_FILENAME,
+            numeric_spec_document(numeric_feature_spec(pipeline), MISSING_MCC_TOKEN),
+        )
+        return
+    output_path.write_bytes(convert_pipeline_to_onnx(pipeline, target_opset).SerializeToString())
+
+
+def convert_pipeline_to_onnx(pipeline: Pipeline, target_opset: int) -> object:
     classifier = pipeline.named_steps["classifier"]
-    onnx_model = convert_sklearn(
+    return convert_sklearn(
         pipeline,
         initial_types=[
             ("text", StringTensorType([None, 1])),
@@ -283,27 +857,52 @@ def export_onnx_model(pipeline: Pipeline, output_path: Path, target_opset: int)
         options={id(classifier): {"zipmap": False}},
         target_opset=target_opset,
     )
-    output_path.write_bytes(onnx_model.SerializeToString())
 
 
-def predict_onnx(model_path: Path, features: pd.DataFrame, labels: List[str]) -> List[str]:
-    probabilities = predict_onnx_probabilities(model_path=model_path, features=features, labels=labels)
+def predict_onnx(
+    model_path: Path,
+    features: pd.DataFrame | FeatureArrays,
+    labels: List[str],
+    session_config: SessionConfig | None = None,
+) -> List[str]:
+    probabilities = predict_onnx_probabilities(
+        model_path=model_path,
+        features=features,
+        labels=labels,
+        session_config=session_config,
+    )
     return labels_from_probabilities(labels, probabilities)
 
 
-def predict_onnx_probabilities(model_path: Path, features: pd.DataFrame, labels: List[str]) -> np.ndarray:
-    import onnxruntime as ort
-
-    session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
-    feed = {
-        "text": features["text"].astype(str).to_numpy(dtype=object).reshape((-1, 1)),
-        "mccCode": features["mccCode"].astype(str).to_numpy(dtype=object).reshape((-1, 1)),
-        "amount": features["amount"].to_numpy(dtype=np.float32).reshape((-1, 1)),
-    }
+def predict_onnx_probabilities(
+    model_path: Path,
+    features: pd.DataFrame | FeatureArrays,
+    labels: List[str],
+    session_config: SessionConfig | None = None,
+) -> np.ndarray:
+    session = get_session(model_path, session_config)
+    feed = onnx_feed(features)
+    if any(model_input.name == TEXT_INDICES_INPUT for model_input in session.get_inputs()):
+        spec = get_numeric_feature_spec(Path(model_path).parent / NUMERIC_FEATURES_FILENAME)
+        feed = numeric_feed(spec, feed["text"], feed["mccCode"], feed["amount"])
     outputs = session.run(None, feed)
     return find_probability_output(outputs, labels)
 
 
+def onnx_feed(features: pd.DataFrame | FeatureArrays) -> Dict[str, np.ndarray]:
+    if isinstance(features, pd.DataFrame):
+        return {
+            "text": features["text"].astype(str).to_numpy(dtype=object).reshape((-1, 1)),
+            "mccCode": features["mccCode"].astype(str).to_numpy(dtype=object).reshape((-1, 1)),
+            "amount": features["amount"].to_numpy(dtype=np.float32).reshape((-1, 1)),
+        }
+    return {
+        "text": np.asarray(features["text"], dtype=object).reshape((-1, 1)),
+        "mccCode": np.asarray(features["mccCode"], dtype=object).reshape((-1, 1)),
+        "amount": np.asarray(features["amount"], dtype=np.float32).reshape((-1, 1)),
+    }
+
+
 def find_probability_output(outputs: List[object], labels: List[str]) -> np.ndarray:
     for output in outputs:
         array = np.asarray(output)
@@ -350,6 +949,10 @@ def evaluate_predictions(
             for index, label in enumerate(labels)
         },
         "confidence": confidence_summary(confidence_values),
+        "expected_calibration_error": expected_calibration_error(
+            confidence_values,
+            [true == predicted for true, predicted in zip(y_true, y_pred)],
+        ),
         "confusion_matrix": confusion_matrix(y_true, y_pred, labels=labels).tolist(),
         "labels": labels,
     }
@@ -360,29 +963,11 @@ def labels_from_probabilities(labels: List[str], probabilities: object) -> List[
     return [labels[int(index)] for index in indices]
 
 
-def confidence_summary(confidences: List[float]) -> Dict[str, float | int]:
-    if not confidences:
-        return {
-            "count": 0,
-            "mean": 0.0,
-            "min": 0.0,
-            "p50": 0.0,
-            "p90": 0.0,
-            "max": 0.0,
-            "below_0_70": 0,
-            "below_0_90": 0,
-        }
-    values = np.asarray(confidences, dtype=np.float32)
-    return {
-        "count": int(values.size),
-        "mean": float(values.mean()),
-        "min": float(values.min()),
-        "p50": float(np.quantile(values, 0.50)),
-        "p90": float(np.quantile(values, 0.90)),
-        "max": float(values.max()),
-        "below_0_70": int((values < 0.70).sum()),
-        "below_0_90": int((values < 0.90).sum()),
-    }
+def confidence_summary(
+    confidences: List[float],
+    thresholds: Sequence[float] = CONFIDENCE_THRESHOLDS,
+) -> Dict[str, object]:
+    return ConfidenceSketch(thresholds).update(confidences).summary()
 
 
 def sort_scores(labels: List[str], probabilities: object) -> List[Tuple[str, float]]:
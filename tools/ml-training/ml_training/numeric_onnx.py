@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+NUMERIC_ONNX_MODEL_FILENAME = "transaction-classifier.numeric.onnx"
+NUMERIC_FEATURES_FILENAME = "numeric-features.json"
+NUMERIC_FEATURES_FORMAT_VERSION = 1
+NUMERIC_ONNX_MIN_OPSET = 13
+TEXT_INDICES_INPUT = "text_indices"
+TEXT_COUNTS_INPUT = "text_counts"
+MCC_INDEX_INPUT = "mcc_index"
+AMOUNT_INPUT = "amount"
+NUMERIC_INPUTS = (TEXT_INDICES_INPUT, TEXT_COUNTS_INPUT, MCC_INDEX_INPUT, AMOUNT_INPUT)
+
+
+@dataclass(frozen=True)
+class NumericFeatureSpec:
+    vocabulary: Tuple[str, ...]
+    lowercase: bool
+    token_pattern: str
+    ngram_range: Tuple[int, int]
+    mcc_categories: Tuple[str, ...]
+    term_index: Dict[str, int] = field(init=False, repr=False, compare=False)
+    mcc_index: Dict[str, int] = field(init=False, repr=False, compare=False)
+    pattern: "re.Pattern[str]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "term_index", {term: index for index, term in enumerate(self.vocabulary)})
+        object.__setattr__(self, "mcc_index", {code: index for index, code in enumerate(self.mcc_categories)})
+        object.__setattr__(self, "pattern", re.compile(self.token_pattern))
+
+    @property
+    def text_padding_index(self) -> int:
+        return len(self.vocabulary)
+
+    @property
+    def mcc_unknown_index(self) -> int:
+        return len(self.mcc_categories)
+
+
+SpecKey = Tuple[str, int, int]
+
+_SPECS: Dict[SpecKey, NumericFeatureSpec] = {}
+
+
+def numeric_feature_spec(pipeline: object) -> NumericFeatureSpec:
+    features = pipeline.named_steps["features"]
+    vectorizer = features.named_transformers_["text"]
+    unsupported = {
+        "analyzer": (vectorizer.analyzer, "word"),
+        "strip_accents": (vectorizer.strip_accents, None),
+        "preprocessor": (vectorizer.preprocessor, None),
+        "tokenizer": (vectorizer.tokenizer, None),
+        "stop_words": (vectorizer.stop_words, None),
+        "binary": (vectorizer.binary, False),
+        "norm": (vectorizer.norm, "l2"),
+    }
+    for name, (value, supported) in unsupported.items():
+        if value != supported:
+            raise ValueError(f"Numeric ONNX export does not support TfidfVectorizer {name}={value!r}")
+    vocabulary = [""] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        vocabulary[index] = term
+    return NumericFeatureSpec(
+        vocabulary=tuple(vocabulary),
+        lowercase=bool(vectorizer.lowercase),
+        token_pattern=vectorizer.token_pattern,
+        ngram_range=tuple(int(value) for value in vectorizer.ngram_range),
+        mcc_categories=tuple(str(category) for category in features.named_transformers_["mcc"].categories_[0]),
+    )
+
+
+def numeric_spec_document(spec: NumericFeatureSpec, missing_mcc_token: str) -> Dict[str, object]:
+    return {
+        "format_version": NUMERIC_FEATURES_FORMAT_VERSION,
+        "inputs": {
+            TEXT_INDICES_INPUT: {"type": "int64", "shape": ["batch", "terms"]},
+            TEXT_COUNTS_INPUT: {"type": "float32", "shape": ["batch", "terms"]},
+            MCC_INDEX_INPUT: {"type": "int64", "shape": ["batch", 1]},
+            AMOUNT_INPUT: {"type": "float32", "shape": ["batch", 1]},
+        },
+        "text": {
+            "lowercase": spec.lowercase,
+            "token_pattern": spec.token_pattern,
+            "ngram_range": list(spec.ngram_range),
+            "ngram_separator": " ",
+            "padding_index": spec.text_padding_index,
+            "vocabulary": list(spec.vocabulary),
+        },
+        "mccCode": {
+            "missing_token": missing_mcc_token,
+            "unknown_index": spec.mcc_unknown_index,
+            "categories": list(spec.mcc_categories),
+        },
+    }
+
+
+def load_numeric_feature_spec(path: Path) -> NumericFeatureSpec:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    if document.get("format_version") != NUMERIC_FEATURES_FORMAT_VERSION:
+        raise ValueError(f"Unsupported numeric feature spec version in {path}: {document.get('format_version')}")
+    return NumericFeatureSpec(
+        vocabulary=tuple(document["text"]["vocabulary"]),
+        lowercase=bool(document["text"]["lowercase"]),
+        token_pattern=document["text"]["token_pattern"],
+        ngram_range=tuple(int(value) for value in document["text"]["ngram_range"]),
+        mcc_categories=tuple(document["mccCode"]["categories"]),
+    )
+
+
+def get_numeric_feature_spec(path: Path) -> NumericFeatureSpec:
+    resolved_path = Path(path).resolve()
+    stat = resolved_path.stat()
+    key = (str(resolved_path), stat.st_mtime_ns, stat.st_size)
+    spec = _SPECS.get(key)
+    if spec is None:
+        for stale_key in [cached for cached in _SPECS if cached[0] == key[0]]:
+            del _SPECS[stale_key]
+        spec = load_numeric_feature_spec(resolved_path)
+        _SPECS[key] = spec
+    return spec
+
+
+def analyze_text(spec: NumericFeatureSpec, text: str) -> List[str]:
+    if spec.lowercase:
+        text = text.lower()
+    tokens = spec.pattern.findall(text)
+    min_n, max_n = spec.ngram_range
+    terms = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+        terms.extend(" ".join(tokens[start:start + n]) for start in range(len(tokens) - n + 1))
+    return terms
+
+
+def text_term_counts(spec: NumericFeatureSpec, text: str) -> Dict[int, int]:
+    counts: Dict[int, int] = {}
+    for term in analyze_text(spec, text):
+        index = spec.term_index.get(term)
+        if index is not None:
+            counts[index] = counts.get(index, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def numeric_feed(
+    spec: NumericFeatureSpec,
+    texts: Sequence[object],
+    mcc_codes: Sequence[object],
+    amounts: Sequence[float] | np.ndarray,
+) -> Dict[str, np.ndarray]:
+    rows = [text_term_counts(spec, str(text)) for text in np.asarray(texts, dtype=object).reshape(-1)]
+    codes = np.asarray(mcc_codes, dtype=object).reshape(-1)
+    width = max([len(counts) for counts in rows] + [1])
+    indices = np.full((len(rows), width), spec.text_padding_index, dtype=np.int64)
+    counts = np.zeros((len(rows), width), dtype=np.float32)
+    for row, term_counts in enumerate(rows):
+        indices[row, :len(term_counts)] = list(term_counts)
+        counts[row, :len(term_counts)] = list(term_counts.values())
+    return {
+        TEXT_INDICES_INPUT: indices,
+        TEXT_COUNTS_INPUT: counts,
+        MCC_INDEX_INPUT: np.fromiter(
+            (spec.mcc_index.get(str(code), spec.mcc_unknown_index) for code in codes),
+            dtype=np.int64,
+            count=codes.size,
+        ).reshape((-1, 1)),
+        AMOUNT_INPUT: np.asarray(amounts, dtype=np.float32).reshape((-1, 1)),
+    }
+
+
+def convert_pipeline_to_numeric_onnx(pipeline: object, target_opset: int) -> object:
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from sklearn.linear_model import LogisticRegression
+
+    if target_opset < NUMERIC_ONNX_MIN_OPSET:
+        raise ValueError(f"Numeric ONNX export requires target_opset >= {NUMERIC_ONNX_MIN_OPSET}")
+    spec = numeric_feature_spec(pipeline)
+    features = pipeline.named_steps["features"]
+    classifier = pipeline.named_steps["classifier"]
+    vectorizer = features.named_transformers_["text"]
+    scaler = features.named_transformers_["amount"]
+    labels = [str(label) for label in classifier.classes_]
+    text_size = len(spec.vocabulary)
+    mcc_size = len(spec.mcc_categories)
+
+    coefficients = np.asarray(classifier.coef_, dtype=np.float64).T
+    if coefficients.shape[0] != text_size + mcc_size + 1:
+        raise ValueError("Classifier coefficients do not match the text, mcc and amount feature layout")
+    idf = np.asarray(vectorizer.idf_, dtype=np.float64) if vectorizer.use_idf else np.ones(text_size)
+    amount_scale = float(scaler.scale_[0]) if scaler.with_std else 1.0
+    amount_mean = float(scaler.mean_[0]) if scaler.with_mean else 0.0
+    amount_weights = coefficients[-1:] / amount_scale
+    intercepts = np.asarray(classifier.intercept_, dtype=np.float64) - amount_mean * amount_weights[0]
+    zero_row = np.zeros((1, coefficients.shape[1]))
+    initializers = {
+        "idf_table": np.concatenate([idf, [0.0]]),
+        "text_weights": np.vstack([coefficients[:text_size], zero_row]),
+        "mcc_weights": np.vstack([coefficients[text_size:text_size + mcc_size], zero_row]),
+        "amount_weights": amount_weights,
+        "intercepts": intercepts,
+        "one": np.ones(1),
+        "norm_floor": np.asarray([np.finfo(np.float32).tiny]),
+    }
+    axes = {"axis_1": np.asarray([1], dtype=np.int64)}
+
+    nodes = []
+    if vectorizer.sublinear_tf:
+        nodes += [
+            helper.make_node("Max", [TEXT_COUNTS_INPUT, "one"], ["tf_floor"]),
+            helper.make_node("Log", ["tf_floor"], ["tf_log"]),
+            helper.make_node("Add", ["tf_log", "one"], ["tf"]),
+        ]
+    else:
+        nodes.append(helper.make_node("Identity", [TEXT_COUNTS_INPUT], ["tf"]))
+    nodes += [
+        helper.make_node("Gather", ["idf_table", TEXT_INDICES_INPUT], ["idf"], axis=0),
+        helper.make_node("Mul", ["tf", "idf"], ["tfidf"]),
+        helper.make_node("Mul", ["tfidf", "tfidf"], ["tfidf_squared"]),
+        helper.make_node("ReduceSum", ["tfidf_squared", "axis_1"], ["norm_squared"], keepdims=1),
+        helper.make_node("Sqrt", ["norm_squared"], ["norm"]),
+        helper.make_node("Max", ["norm", "norm_floor"], ["safe_norm"]),
+        helper.make_node("Div", ["tfidf", "safe_norm"], ["text_values"]),
+        helper.make_node("Unsqueeze", ["text_values", "axis_1"], ["text_row"]),
+        helper.make_node("Gather", ["text_weights", TEXT_INDICES_INPUT], ["term_weights"], axis=0),
+        helper.make_node("MatMul", ["text_row", "term_weights"], ["text_scores_3d"]),
+        helper.make_node("Squeeze", ["text_scores_3d", "axis_1"], ["text_scores"]),
+        helper.make_node("Gather", ["mcc_weights", MCC_INDEX_INPUT], ["mcc_scores_3d"], axis=0),
+        helper.make_node("Squeeze", ["mcc_scores_3d", "axis_1"], ["mcc_scores"]),
+        helper.make_node("MatMul", [AMOUNT_INPUT, "amount_weights"], ["amount_scores"]),
+        helper.make_node("Add", ["text_scores", "mcc_scores"], ["feature_scores"]),
+        helper.make_node("Add", ["feature_scores", "amount_scores"], ["linear_scores"]),
+        helper.make_node("Add", ["linear_scores", "intercepts"], ["scores"]),
+    ]
+    if len(labels) == 2:
+        nodes += [
+            helper.make_node("Sigmoid", ["scores"], ["positive"]),
+            helper.make_node("Sub", ["one", "positive"], ["negative"]),
+            helper.make_node("Concat", ["negative", "positive"], ["probabilities"], axis=1),
+        ]
+    elif isinstance(classifier, LogisticRegression) and classifier.solver != "liblinear":
+        nodes.append(helper.make_node("Softmax", ["scores"], ["probabilities"], axis=1))
+    else:
+        nodes += [
+            helper.make_node("Sigmoid", ["scores"], ["class_scores"]),
+            helper.make_node("ReduceSum", ["class_scores", "axis_1"], ["class_score_sum"], keepdims=1),
+            helper.make_node("Div", ["class_scores", "class_score_sum"], ["probabilities"]),
+        ]
+    nodes += [
+        helper.make_node("ArgMax", ["probabilities"], ["label_index"], axis=1, keepdims=0),
+        helper.make_node("Gather", ["class_labels", "label_index"], ["label"], axis=0),
+    ]
+
+    used = {name for node in nodes for name in node.input}
+    graph = helper.make_graph(
+        nodes,
+        "transaction_classifier_numeric",
+        inputs=[
+            helper.make_tensor_value_info(TEXT_INDICES_INPUT, TensorProto.INT64, [None, None]),
+            helper.make_tensor_value_info(TEXT_COUNTS_INPUT, TensorProto.FLOAT, [None, None]),
+            helper.make_tensor_value_info(MCC_INDEX_INPUT, TensorProto.INT64, [None, 1]),
+            helper.make_tensor_value_info(AMOUNT_INPUT, TensorProto.FLOAT, [None, 1]),
+        ],
+        outputs=[
+            helper.make_tensor_value_info("label", TensorProto.STRING, [None]),
+            helper.make_tensor_value_info("probabilities", TensorProto.FLOAT, [None, len(labels)]),
+        ],
+        initializer=[
+            *(
+                numpy_helper.from_array(value.astype(np.float32), name)
+                for name, value in initializers.items()
+                if name in used
+            ),
+            *(numpy_helper.from_array(value, name) for name, value in axes.items()),
+            helper.make_tensor(
+                "class_labels",
+                TensorProto.STRING,
+                [len(labels)],
+                [label.encode("utf-8") for label in labels],
+            ),
+        ],
+    )
+    opset_imports = [helper.make_opsetid("", target_opset)]
+    model = helper.make_model(graph, opset_imports=opset_imports)
+    model.ir_version = helper.find_min_ir_version_for(opset_imports)
+    onnx.checker.check_model(model)
+    return model
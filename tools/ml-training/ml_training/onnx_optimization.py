@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from .numeric_onnx import NUMERIC_ONNX_MODEL_FILENAME
+from .sessions import graph_optimization_level
+
+OPTIMIZED_ONNX_MODEL_FILENAME = "transaction-classifier.optimized.onnx"
+QUANTIZED_ONNX_MODEL_FILENAME = "transaction-classifier.int8.onnx"
+ONNX_VARIANT_FILENAMES = {
+    "optimized": OPTIMIZED_ONNX_MODEL_FILENAME,
+    "int8": QUANTIZED_ONNX_MODEL_FILENAME,
+    "numeric": NUMERIC_ONNX_MODEL_FILENAME,
+}
+OFFLINE_OPTIMIZATION_LEVEL = "extended"
+POST_TRANSFORM_OPS = {
+    "SOFTMAX": "Softmax",
+    "LOGISTIC": "Sigmoid",
+    "NONE": "Identity",
+}
+
+
+def export_onnx_variants(onnx_model_path: Path) -> Dict[str, Path]:
+    artifact_dir = onnx_model_path.parent
+    optimized_path = artifact_dir / OPTIMIZED_ONNX_MODEL_FILENAME
+    quantized_path = artifact_dir / QUANTIZED_ONNX_MODEL_FILENAME
+    optimize_onnx_model(onnx_model_path, optimized_path)
+    quantize_onnx_model(onnx_model_path, quantized_path)
+    return {
+        "optimized": optimized_path,
+        "int8": quantized_path,
+    }
+
+
+def optimize_onnx_model(
+    source_path: Path,
+    output_path: Path,
+    optimization_level: str = OFFLINE_OPTIMIZATION_LEVEL,
+) -> None:
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = graph_optimization_level(optimization_level)
+    options.optimized_model_filepath = str(output_path)
+    ort.InferenceSession(str(source_path), sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def quantize_onnx_model(source_path: Path, output_path: Path) -> None:
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    linear_path = output_path.with_name(f"{output_path.stem}.linear.onnx")
+    model = onnx.load(str(source_path))
+    if any(node.op_type == "LinearClassifier" for node in model.graph.node):
+        model = linearize_classifier(model)
+    onnx.save(model, str(linear_path))
+    try:
+        quantize_dynamic(
+            str(linear_path),
+            str(output_path),
+            op_types_to_quantize=["MatMul"],
+            weight_type=QuantType.QInt8,
+            extra_options={"DefaultTensorType": onnx.TensorProto.FLOAT},
+        )
+    finally:
+        linear_path.unlink(missing_ok=True)
+
+
+def linearize_classifier(model: object) -> object:
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    graph = model.graph
+    matches = [
+        (index, node)
+        for index, node in enumerate(graph.node)
+        if node.op_type == "LinearClassifier" and node.domain == "ai.onnx.ml"
+    ]
+    if len(matches) != 1:
+        raise ValueError("ONNX model must contain exactly one ai.onnx.ml LinearClassifier node")
+    index, node = matches[0]
+    attributes = {attribute.name: helper.get_attribute_value(attribute) for attribute in node.attribute}
+    class_labels = [
+        label.decode("utf-8") if isinstance(label, bytes) else str(label)
+        for label in attributes.get("classlabels_strings", [])
+    ]
+    intercepts = np.asarray(attributes.get("intercepts", []), dtype=np.float32)
+    coefficients = np.asarray(attributes["coefficients"], dtype=np.float32)
+    if not class_labels or intercepts.size != len(class_labels):
+        raise ValueError("Only multi-class LinearClassifier nodes with string labels can be linearized")
+    post_transform = attributes.get("post_transform", b"NONE")
+    post_transform = post_transform.decode("utf-8") if isinstance(post_transform, bytes) else str(post_transform)
+    if post_transform not in POST_TRANSFORM_OPS:
+        raise ValueError(f"Unsupported LinearClassifier post_transform: {post_transform}")
+
+    weights = coefficients.reshape((len(class_labels), -1)).T.copy()
+    features_name = node.input[0]
+    label_name, probability_name = node.output[0], node.output[1]
+    prefix = f"{node.name or 'linear_classifier'}_linearized"
+    names = {
+        "weights": f"{prefix}_weights",
+        "intercepts": f"{prefix}_intercepts",
+        "labels": f"{prefix}_labels",
+        "matmul": f"{prefix}_matmul",
+        "scores": f"{prefix}_scores",
+        "argmax": f"{prefix}_argmax",
+    }
+    graph.initializer.extend(
+        [
+            numpy_helper.from_array(weights, names["weights"]),
+            numpy_helper.from_array(intercepts, names["intercepts"]),
+            helper.make_tensor(
+                names["labels"],
+                TensorProto.STRING,
+                [len(class_labels)],
+                [label.encode("utf-8") for label in class_labels],
+            ),
+        ]
+    )
+    post_transform_attributes = {"axis": 1} if post_transform == "SOFTMAX" else {}
+    replacement = [
+        helper.make_node("MatMul", [features_name, names["weights"]], [names["matmul"]], name=names["matmul"]),
+        helper.make_node("Add", [names["matmul"], names["intercepts"]], [names["scores"]], name=names["scores"]),
+        helper.make_node(
+            POST_TRANSFORM_OPS[post_transform],
+            [names["scores"]],
+            [probability_name],
+            name=f"{prefix}_post_transform",
+            **post_transform_attributes,
+        ),
+        helper.make_node("ArgMax", [names["scores"]], [names["argmax"]], name=names["argmax"], axis=1, keepdims=0),
+        helper.make_node("Gather", [names["labels"], names["argmax"]], [label_name], name=f"{prefix}_label", axis=0),
+    ]
+    del graph.node[index]
+    for offset, replacement_node in enumerate(replacement):
+        graph.node.insert(index + offset, replacement_node)
+    onnx.checker.check_model(model)
+    return model
+
+
+def onnx_variant_paths(artifact_dir: Path) -> Dict[str, Path]:
+    return {
+        name: artifact_dir / filename
+        for name, filename in ONNX_VARIANT_FILENAMES.items()
+        if (artifact_dir / filename).exists()
+    }
+
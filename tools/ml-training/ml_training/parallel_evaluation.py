@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .dataset import load_export_metadata, split_path
+from .evaluation import CONFIDENCE_THRESHOLDS
+from .feature_cache import FeatureCacheConfig
+from .model import (
+    ONNX_MODEL_FILENAME,
+    SKLEARN_MODEL_FILENAME,
+    EvaluationConfig,
+    ParityConfig,
+    evaluate_artifacts,
+    safe_artifact_suffix,
+    write_json,
+)
+from .onnx_optimization import onnx_variant_paths
+from .sessions import SessionConfig, get_pipeline, get_session
+
+EVALUATION_SUMMARY_FILENAME = "evaluation-summary.json"
+EVALUATION_SPLITS = ("train", "validation", "test")
+WORKER_SESSION_CONFIG = SessionConfig(intra_op_num_threads=1, inter_op_num_threads=1)
+
+
+@dataclass(frozen=True)
+class ParallelEvaluationConfig:
+    artifact_dir: Path
+    data_dirs: Tuple[Path, ...]
+    splits: Tuple[str, ...] = EVALUATION_SPLITS
+    workers: int = 0
+    session_config: SessionConfig = WORKER_SESSION_CONFIG
+    chunk_size: int = 50000
+    confidence_thresholds: Tuple[float, ...] = CONFIDENCE_THRESHOLDS
+    parity: ParityConfig | None = None
+    save_probabilities: bool = False
+    feature_cache: FeatureCacheConfig | None = None
+
+
+def evaluate_in_parallel(config: ParallelEvaluationConfig) -> Dict[str, object]:
+    validate_parallel_evaluation_config(config)
+    tasks, skipped = evaluation_tasks(config)
+    workers = min(config.workers or os.cpu_count() or 1, max(len(tasks), 1))
+
+    started = time.perf_counter()
+    if workers == 1:
+        load_worker_models(config.artifact_dir, config.session_config)
+        results = [evaluate_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=load_worker_models,
+            initargs=(config.artifact_dir, config.session_config),
+        ) as executor:
+            results = list(executor.map(evaluate_task, tasks))
+    elapsed_seconds = time.perf_counter() - started
+
+    summary = {
+        "artifact_dir": str(config.artifact_dir),
+        "workers": workers,
+        "elapsed_seconds": elapsed_seconds,
+        "evaluations": [
+            evaluation_summary(task, result)
+            for task, result in zip(tasks, results)
+        ],
+        "skipped": skipped,
+    }
+    summary_path = config.artifact_dir / EVALUATION_SUMMARY_FILENAME
+    write_json(summary_path, summary)
+    summary["summary_path"] = str(summary_path)
+    return summary
+
+
+def evaluation_tasks(config: ParallelEvaluationConfig) -> Tuple[List[EvaluationConfig], List[Dict[str, str]]]:
+    tasks = []
+    skipped = []
+    reports: Dict[Tuple[str, str], Path] = {}
+    for data_dir in config.data_dirs:
+        metadata = load_export_metadata(data_dir)
+        suffix = safe_artifact_suffix(metadata.get("dataset_id") or data_dir.name)
+        for split in config.splits:
+            if not split_path(data_dir, split).exists():
+                skipped.append({"data_dir": str(data_dir), "split": split, "reason": "split file not found"})
+                continue
+            if (suffix, split) in reports:
+                raise ValueError(
+                    f"{data_dir} and {reports[(suffix, split)]} would both write the {split} report for '{suffix}'"
+                )
+            reports[(suffix, split)] = data_dir
+            tasks.append(
+                EvaluationConfig(
+                    data_dir=data_dir,
+                    artifact_dir=config.artifact_dir,
+                    split=split,
+                    session_config=config.session_config,
+                    feature_cache=config.feature_cache,
+                    chunk_size=config.chunk_size,
+                    save_probabilities=config.save_probabilities,
+                    confidence_thresholds=config.confidence_thresholds,
+                    parity=config.parity,
+                )
+            )
+    return tasks, skipped
+
+
+def load_worker_models(artifact_dir: Path, session_config: SessionConfig) -> None:
+    get_pipeline(artifact_dir / SKLEARN_MODEL_FILENAME)
+    for model_path in (artifact_dir / ONNX_MODEL_FILENAME, *onnx_variant_paths(artifact_dir).values()):
+        get_session(model_path, session_config)
+
+
+def evaluate_task(config: EvaluationConfig) -> Dict[str, object]:
+    started = time.perf_counter()
+    result = evaluate_artifacts(config)
+    result["elapsed_seconds"] = time.perf_counter() - started
+    return result
+
+
+def evaluation_summary(config: EvaluationConfig, result: Dict[str, object]) -> Dict[str, object]:
+    summary = {
+        "data_dir": str(config.data_dir),
+        "dataset_id": result["dataset"].get("dataset_id"),
+        "split": config.split,
+        "report_path": result["metrics_path"],
+        "elapsed_seconds": result["elapsed_seconds"],
+        "rows": result["onnx"]["confidence"]["count"],
+    }
+    runtimes = {"sklearn": result["sklearn"], "onnx": result["onnx"], **result.get("onnx_variants", {})}
+    for runtime, metrics in runtimes.items():
+        summary[runtime] = {
+            "accuracy": metrics["accuracy"],
+            "macro_f1": metrics["macro_f1"],
+            "expected_calibration_error": metrics["expected_calibration_error"],
+            "confidence_mean": metrics["confidence"]["mean"],
+        }
+    if "parity" in result:
+        summary["parity"] = result["parity"]
+    if "probability_files" in result:
+        summary["probability_files"] = result["probability_files"]
+    return summary
+
+
+def validate_parallel_evaluation_config(config: ParallelEvaluationConfig) -> None:
+    if not config.data_dirs:
+        raise ValueError("data_dirs must not be empty")
+    if config.workers < 0:
+        raise ValueError("workers must be greater than or equal to 0")
+    unknown = sorted(set(config.splits) - set(EVALUATION_SPLITS))
+    if unknown:
+        raise ValueError(f"Unknown splits: {', '.join(unknown)}")
+    if config.chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
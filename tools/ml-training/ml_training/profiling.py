@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .benchmark import percentiles
+from .dataset import load_export_metadata, split_path
+from .model import (
+    LABELS_FILENAME,
+    ONNX_MODEL_FILENAME,
+    SKLEARN_MODEL_FILENAME,
+    feature_frame,
+    iter_dataset_chunks,
+    load_labels,
+    predict_onnx_probabilities,
+    safe_artifact_suffix,
+    write_json,
+)
+from .sessions import SessionConfig, get_pipeline, get_session, release_session
+
+PROFILE_SESSION_CONFIG = SessionConfig(intra_op_num_threads=1, inter_op_num_threads=1)
+TEXT_LENGTH_BUCKETS = (0, 16, 32, 64, 128, 256)
+TOKEN_COUNT_BUCKETS = (0, 2, 4, 8, 16, 32)
+OPERATOR_STAGES = {
+    "StringNormalizer": "tokenizer",
+    "Tokenizer": "tokenizer",
+    "TfIdfVectorizer": "tfidf",
+    "LinearClassifier": "classifier",
+}
+PROFILE_STAGES = ("tokenizer", "tfidf", "classifier", "other")
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    data_dir: Path
+    artifact_dir: Path
+    split: str = "test"
+    max_rows: int = 2000
+    warmup_rows: int = 20
+    slowest_rows: int = 20
+    session_config: SessionConfig = PROFILE_SESSION_CONFIG
+    keep_trace: bool = True
+
+
+def profile_onnx(config: ProfileConfig) -> Dict[str, object]:
+    validate_profile_config(config)
+    df = next(iter_dataset_chunks(split_path(config.data_dir, config.split), config.max_rows), None)
+    if df is None or df.empty:
+        raise ValueError(f"Profile split is empty: {config.split}")
+    df = df.reset_index(drop=True)
+    features = feature_frame(df)
+    labels = load_labels(config.artifact_dir / LABELS_FILENAME)
+    model_path = config.artifact_dir / ONNX_MODEL_FILENAME
+    dataset_metadata = load_export_metadata(config.data_dir)
+    dataset_suffix = safe_artifact_suffix(dataset_metadata.get("dataset_id") or config.data_dir.name)
+    session_config = replace(
+        config.session_config,
+        profile_file_prefix=str(config.artifact_dir / f"{config.split}-onnx-trace-{dataset_suffix}"),
+    )
+
+    release_session(model_path, session_config)
+    try:
+        for row in range(config.warmup_rows):
+            predict_onnx_probabilities(model_path, features.iloc[[row % len(features)]], labels, session_config)
+        wall_us = np.empty(len(features), dtype=np.float64)
+        for row in range(len(features)):
+            started = time.perf_counter()
+            predict_onnx_probabilities(model_path, features.iloc[[row]], labels, session_config)
+            wall_us[row] = (time.perf_counter() - started) * 1e6
+        trace_path = Path(get_session(model_path, session_config).end_profiling())
+    finally:
+        release_session(model_path, session_config)
+
+    events = json.loads(trace_path.read_text(encoding="utf-8"))
+    if not config.keep_trace:
+        trace_path.unlink()
+    run_us, stage_us, operators = trace_timings(events, config.warmup_rows, len(features))
+
+    rows = pd.DataFrame(
+        {
+            "text": features["text"].astype(str),
+            "text_length": features["text"].astype(str).str.len(),
+            "token_count": token_counts(config.artifact_dir / SKLEARN_MODEL_FILENAME, features["text"]),
+            "latency_us": wall_us,
+            "run_us": run_us,
+            **{f"{stage}_us": stage_us[:, index] for index, stage in enumerate(PROFILE_STAGES)},
+        }
+    )
+    node_total = float(stage_us.sum())
+    report = {
+        "dataset": dataset_metadata,
+        "split": config.split,
+        "rows": int(len(rows)),
+        "warmup_rows": config.warmup_rows,
+        "session": {
+            "intra_op_num_threads": config.session_config.intra_op_num_threads,
+            "inter_op_num_threads": config.session_config.inter_op_num_threads,
+            "graph_optimization_level": config.session_config.graph_optimization_level,
+        },
+        "latency_us": percentiles(wall_us),
+        "run_us": percentiles(run_us),
+        "operators": operators,
+        "stages": {
+            stage: {
+                "total_us": float(stage_us[:, index].sum()),
+                "share": float(stage_us[:, index].sum() / node_total) if node_total else 0.0,
+                "per_row_us": percentiles(stage_us[:, index]),
+            }
+            for index, stage in enumerate(PROFILE_STAGES)
+        },
+        "correlation": {
+            column: {
+                "latency_us": spearman(rows[column], rows["latency_us"]),
+                "tokenizer_us": spearman(rows[column], rows["tokenizer_us"]),
+            }
+            for column in ("text_length", "token_count")
+        },
+        "by_text_length": bucket_latency(rows, "text_length", TEXT_LENGTH_BUCKETS),
+        "by_token_count": bucket_latency(rows, "token_count", TOKEN_COUNT_BUCKETS),
+        "slowest_rows": [
+            {
+                "row": int(index),
+                "text": row["text"],
+                "text_length": int(row["text_length"]),
+                "token_count": int(row["token_count"]),
+                "latency_us": float(row["latency_us"]),
+                **{f"{stage}_us": float(row[f"{stage}_us"]) for stage in PROFILE_STAGES},
+            }
+            for index, row in rows.nlargest(config.slowest_rows, "latency_us").iterrows()
+        ],
+        "trace_path": str(trace_path) if config.keep_trace else None,
+    }
+    report_path = config.artifact_dir / f"{config.split}-onnx-profile-{dataset_suffix}.json"
+    write_json(report_path, report)
+    report["report_path"] = str(report_path)
+    return report
+
+
+def trace_timings(
+    events: List[Dict[str, object]],
+    warmup_runs: int,
+    runs: int,
+) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, object]]]:
+    model_runs = sorted(
+        (event for event in events if event.get("cat") == "Session" and event.get("name") == "model_run"),
+        key=lambda event: event["ts"],
+    )[warmup_runs:]
+    if len(model_runs) != runs:
+        raise ValueError(f"Profile trace has {len(model_runs)} measured runs, expected {runs}")
+    starts = np.asarray([event["ts"] for event in model_runs], dtype=np.int64)
+    run_us = np.asarray([event["dur"] for event in model_runs], dtype=np.float64)
+
+    stage_us = np.zeros((runs, len(PROFILE_STAGES)), dtype=np.float64)
+    operator_calls: Dict[str, int] = {}
+    operator_us: Dict[str, float] = {}
+    for event in events:
+        if event.get("cat") != "Node" or event["ts"] < starts[0]:
+            continue
+        run = int(np.searchsorted(starts, event["ts"], side="right")) - 1
+        op_type = str(event.get("args", {}).get("op_name", "unknown"))
+        stage = OPERATOR_STAGES.get(op_type, "other")
+        stage_us[run, PROFILE_STAGES.index(stage)] += event["dur"]
+        operator_calls[op_type] = operator_calls.get(op_type, 0) + 1
+        operator_us[op_type] = operator_us.get(op_type, 0.0) + float(event["dur"])
+
+    node_total = sum(operator_us.values())
+    operators = [
+        {
+            "op_type": op_type,
+            "stage": OPERATOR_STAGES.get(op_type, "other"),
+            "calls": operator_calls[op_type],
+            "total_us": total_us,
+            "mean_us": total_us / operator_calls[op_type],
+            "share": total_us / node_total if node_total else 0.0,
+        }
+        for op_type, total_us in sorted(operator_us.items(), key=lambda item: item[1], reverse=True)
+    ]
+    return run_us, stage_us, operators
+
+
+def token_counts(sklearn_model_path: Path, texts: pd.Series) -> np.ndarray:
+    vectorizer = get_pipeline(sklearn_model_path).named_steps["features"].named_transformers_["text"]
+    preprocess = vectorizer.build_preprocessor()
+    tokenize = vectorizer.build_tokenizer()
+    return np.fromiter((len(tokenize(preprocess(text))) for text in texts.astype(str)), dtype=np.int64, count=len(texts))
+
+
+def bucket_latency(rows: pd.DataFrame, column: str, edges: Sequence[int]) -> List[Dict[str, object]]:
+    buckets = []
+    bounds = list(edges) + [None]
+    for lower, upper in zip(bounds[:-1], bounds[1:]):
+        mask = rows[column] >= lower
+        if upper is not None:
+            mask &= rows[column] < upper
+        bucket = rows[mask]
+        if bucket.empty:
+            continue
+        buckets.append(
+            {
+                "min": lower,
+                "max": upper,
+                "rows": int(len(bucket)),
+                "latency_us": percentiles(bucket["latency_us"].to_numpy()),
+                "tokenizer_us": percentiles(bucket["tokenizer_us"].to_numpy()),
+                "tfidf_us": percentiles(bucket["tfidf_us"].to_numpy()),
+            }
+        )
+    return buckets
+
+
+def spearman(left: pd.Series, right: pd.Series) -> float | None:
+    if left.nunique() < 2 or right.nunique() < 2:
+        return None
+    return float(left.rank().corr(right.rank()))
+
+
+def validate_profile_config(config: ProfileConfig) -> None:
+    if config.max_rows <= 0:
+        raise ValueError("max_rows must be greater than 0")
+    if config.warmup_rows < 0:
+        raise ValueError("warmup_rows must be greater than or equal to 0")
+    if config.slowest_rows < 0:
+        raise ValueError("slowest_rows must be greater than or equal to 0")
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from .dataset import split_path
+from .model import evaluate_predictions, feature_frame, label_array, load_dataset
+
+PRUNING_MAX_ROUNDS = 5
+
+
+def prune_pipeline(
+    pipeline: Pipeline,
+    data_dir: Path,
+    validation_metrics: Dict[str, object],
+) -> Tuple[Pipeline, Dict[str, object], Dict[str, object]]:
+    if not isinstance(pipeline.named_steps["classifier"], LogisticRegression):
+        raise ValueError("Vocabulary pruning requires a LogisticRegression classifier")
+    train_df = load_dataset(split_path(data_dir, "train"))
+    validation_df = load_dataset(split_path(data_dir, "validation"))
+    train_frame = feature_frame(train_df)
+    y_train = label_array(train_df)
+    vocabulary_before = len(text_vocabulary(pipeline))
+
+    rounds = 0
+    while rounds < PRUNING_MAX_ROUNDS:
+        kept = nonzero_text_terms(pipeline)
+        if kept.size == len(text_vocabulary(pipeline)):
+            break
+        if kept.size == 0:
+            raise ValueError("Regularization removed every text term; increase c or lower l1_ratio")
+        pipeline = refit_pruned_pipeline(pipeline, kept, train_frame, y_train)
+        rounds += 1
+    if rounds == 0:
+        return pipeline, validation_metrics, pruning_document(0, vocabulary_before, pipeline, validation_metrics)
+
+    features = pipeline.named_steps["features"]
+    classifier = pipeline.named_steps["classifier"]
+    x_validation = features.transform(feature_frame(validation_df))
+    pruned_metrics = evaluate_predictions(
+        labels=[str(label) for label in classifier.classes_],
+        y_true=label_array(validation_df).tolist(),
+        y_pred=classifier.predict(x_validation).tolist(),
+        confidences=classifier.predict_proba(x_validation).max(axis=1).tolist(),
+    )
+    pruning = pruning_document(rounds, vocabulary_before, pipeline, validation_metrics, pruned_metrics)
+    return pipeline, pruned_metrics, pruning
+
+
+def refit_pruned_pipeline(
+    pipeline: Pipeline,
+    kept: np.ndarray,
+    train_frame: object,
+    y_train: np.ndarray,
+) -> Pipeline:
+    features = pipeline.named_steps["features"]
+    classifier = pipeline.named_steps["classifier"]
+    vocabulary = text_vocabulary(pipeline)
+    text_columns = features.output_indices_["text"]
+    dropped = np.setdiff1d(np.arange(len(vocabulary)), kept)
+
+    # Dropped terms still contribute to the L2 row norm, so the classifier is refit instead of sliced.
+    pruned_features = clone(features)
+    pruned_features.set_params(text__vocabulary={vocabulary[index]: position for position, index in enumerate(kept)})
+    x_train = pruned_features.fit_transform(train_frame)
+    pruned_features.named_transformers_["text"].stop_words_ = set()
+
+    pruned_classifier = clone(classifier)
+    pruned_classifier.set_params(warm_start=True)
+    pruned_classifier.coef_ = np.delete(classifier.coef_, text_columns.start + dropped, axis=1)
+    pruned_classifier.intercept_ = classifier.intercept_.copy()
+    pruned_classifier.fit(x_train, y_train)
+    pruned_classifier.set_params(warm_start=False)
+    return Pipeline(steps=[("features", pruned_features), ("classifier", pruned_classifier)])
+
+
+def nonzero_text_terms(pipeline: Pipeline) -> np.ndarray:
+    features = pipeline.named_steps["features"]
+    coefficients = np.asarray(pipeline.named_steps["classifier"].coef_)[:, features.output_indices_["text"]]
+    kept = np.any(coefficients != 0.0, axis=0)
+    # The ONNX TfIdfVectorizer only matches n-grams built from tokens in its unigram pool, so the tokens of every
+    # surviving n-gram stay in the vocabulary even when their own coefficients are zero.
+    vocabulary = text_vocabulary(pipeline)
+    positions = {term: index for index, term in enumerate(vocabulary)}
+    for index in np.flatnonzero(kept):
+        for token in vocabulary[index].split(" "):
+            if token in positions:
+                kept[positions[token]] = True
+    return np.flatnonzero(kept)
+
+
+def text_vocabulary(pipeline: Pipeline) -> List[str]:
+    vocabulary = pipeline.named_steps["features"].named_transformers_["text"].vocabulary_
+    return sorted(vocabulary, key=vocabulary.__getitem__)
+
+
+def pruning_document(
+    rounds: int,
+    vocabulary_before: int,
+    pipeline: Pipeline,
+    metrics_before: Dict[str, object],
+    metrics_after: Dict[str, object] | None = None,
+) -> Dict[str, object]:
+    metrics_after = metrics_after or metrics_before
+    vocabulary_after = len(text_vocabulary(pipeline))
+    return {
+        "rounds": rounds,
+        "text_vocabulary_before": vocabulary_before,
+        "text_vocabulary_after": vocabulary_after,
+        "pruned_terms": vocabulary_before - vocabulary_after,
+        "validation_accuracy_before": metrics_before["accuracy"],
+        "validation_accuracy_after": metrics_after["accuracy"],
+        "validation_macro_f1_before": metrics_before["macro_f1"],
+        "validation_macro_f1_after": metrics_after["macro_f1"],
+        "validation_macro_f1_delta": metrics_after["macro_f1"] - metrics_before["macro_f1"],
+    }
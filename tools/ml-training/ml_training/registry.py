@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from .dataset import load_export_metadata, split_path
+from .feature_cache import cache_key, file_digest
+from .model import (
+    CALIBRATION_FILENAME,
+    LABELS_FILENAME,
+    METADATA_FILENAME,
+    METRICS_FILENAME,
+    ONNX_MODEL_FILENAME,
+    SKLEARN_MODEL_FILENAME,
+    TrainingConfig,
+    pipeline_config_document,
+    train_model,
+)
+from .numeric_onnx import NUMERIC_FEATURES_FILENAME
+from .onnx_optimization import ONNX_VARIANT_FILENAMES
+
+REGISTRY_VERSION = 1
+BLOBS_DIRNAME = "blobs"
+MODELS_DIRNAME = "models"
+STATE_FILENAME = "registry.json"
+ARTIFACT_FILENAMES = (
+    SKLEARN_MODEL_FILENAME,
+    ONNX_MODEL_FILENAME,
+    LABELS_FILENAME,
+    METRICS_FILENAME,
+    METADATA_FILENAME,
+    CALIBRATION_FILENAME,
+    NUMERIC_FEATURES_FILENAME,
+    *ONNX_VARIANT_FILENAMES.values(),
+)
+
+
+@dataclass(frozen=True)
+class RegistryConfig:
+    registry_dir: Path
+    retrain: bool = False
+
+
+def train_registered_model(config: TrainingConfig, registry: RegistryConfig) -> Dict[str, object]:
+    identity = training_identity(config)
+    key = cache_key("registry", REGISTRY_VERSION, identity)
+    manifest = load_manifest(registry.registry_dir, key)
+    if manifest is not None and not registry.retrain:
+        result = materialize_model(registry.registry_dir, manifest, config.artifact_dir)
+        return {**result, "registry_key": key, "reused": True}
+
+    result = train_model(config)
+    if config.numeric_onnx:
+        result["numeric_features_path"] = str(config.artifact_dir / NUMERIC_FEATURES_FILENAME)
+    outputs = {name: Path(path).name for name, path in result.items()}
+    register_model(registry.registry_dir, key, identity, config.artifact_dir, outputs)
+    return {**result, "registry_key": key, "reused": False}
+
+
+def training_identity(config: TrainingConfig) -> Dict[str, object]:
+    return {
+        "dataset": load_export_metadata(config.data_dir),
+        "splits": {split: file_digest(split_path(config.data_dir, split)) for split in ("train", "validation")},
+        "pipeline": pipeline_config_document(config.pipeline, streaming=config.streaming is not None),
+        "streaming": asdict(config.streaming) if config.streaming is not None else None,
+        "warm_start_from": (
+            file_digest(config.warm_start_from / SKLEARN_MODEL_FILENAME) if config.warm_start_from is not None else None
+        ),
+        "calibration": config.calibration,
+        "target_opset": config.target_opset,
+        "optimize_onnx": config.optimize_onnx,
+        "numeric_onnx": config.numeric_onnx,
+    }
+
+
+def register_model(
+    registry_dir: Path,
+    key: str,
+    identity: Dict[str, object],
+    artifact_dir: Path,
+    outputs: Dict[str, str],
+) -> Dict[str, object]:
+    files = {}
+    for filename in sorted(set(outputs.values())):
+        path = artifact_dir / filename
+        files[filename] = {"sha256": store_blob(registry_dir, path), "bytes": path.stat().st_size}
+    metrics_path = artifact_dir / METRICS_FILENAME
+    validation = json.loads(metrics_path.read_text(encoding="utf-8"))["validation"] if metrics_path.exists() else {}
+    manifest = {
+        "key": key,
+        "registered_at": datetime.now(timezone.utc).isoformat(),
+        "identity": identity,
+        "files": files,
+        "outputs": outputs,
+        "validation": {name: validation.get(name) for name in ("accuracy", "macro_f1")},
+    }
+    write_document(manifest_path(registry_dir, key), manifest)
+    return manifest
+
+
+def store_blob(registry_dir: Path, path: Path) -> str:
+    digest = file_digest(path)
+    blob = blob_path(registry_dir, digest)
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        staging = blob.parent / f".{digest}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(path, staging)
+        os.replace(staging, blob)
+    return digest
+
+
+def materialize_model(registry_dir: Path, manifest: Dict[str, object], target_dir: Path) -> Dict[str, str]:
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for filename, entry in manifest["files"].items():
+        staging = target_dir / f".{filename}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(blob_path(registry_dir, entry["sha256"]), staging)
+        os.replace(staging, target_dir / filename)
+    for filename in ARTIFACT_FILENAMES:
+        if filename not in manifest["files"]:
+            (target_dir / filename).unlink(missing_ok=True)
+    return {name: str(target_dir / filename) for name, filename in manifest["outputs"].items()}
+
+
+def list_models(registry_dir: Path) -> List[Dict[str, object]]:
+    promoted = load_state(registry_dir)["promoted"]
+    manifests = [
+        json.loads(path.read_text(encoding="utf-8")) for path in (registry_dir / MODELS_DIRNAME).glob("*.json")
+    ]
+    return [
+        {
+            "key": manifest["key"],
+            "registered_at": manifest["registered_at"],
+            "promoted": manifest["key"] == promoted,
+            "bytes": sum(entry["bytes"] for entry in manifest["files"].values()),
+            "validation": manifest["validation"],
+        }
+        for manifest in sorted(manifests, key=lambda manifest: manifest["registered_at"])
+    ]
+
+
+def registry_summary(registry_dir: Path) -> Dict[str, int]:
+    models = list_models(registry_dir)
+    blobs = [path for path in (registry_dir / BLOBS_DIRNAME).glob("*/*") if not path.name.startswith(".")]
+    return {
+        "models": len(models),
+        "artifact_bytes": sum(model["bytes"] for model in models),
+        "blobs": len(blobs),
+        "blob_bytes": sum(path.stat().st_size for path in blobs),
+    }
+
+
+def promote_model(registry_dir: Path, key: str, target_dir: Path | None = None) -> Dict[str, object]:
+    manifest = required_manifest(registry_dir, resolve_key(registry_dir, key))
+    state = load_state(registry_dir)
+    if state["promoted"] != manifest["key"]:
+        state["history"].append(manifest["key"])
+    state["promoted"] = manifest["key"]
+    if target_dir is not None:
+        materialize_model(registry_dir, manifest, target_dir)
+    write_document(registry_dir / STATE_FILENAME, state)
+    return manifest
+
+
+def rollback_model(registry_dir: Path, target_dir: Path | None = None) -> Dict[str, object]:
+    state = load_state(registry_dir)
+    if len(state["history"]) < 2:
+        raise ValueError("No earlier promoted model to roll back to")
+    state["history"].pop()
+    state["promoted"] = state["history"][-1]
+    manifest = required_manifest(registry_dir, state["promoted"])
+    if target_dir is not None:
+        materialize_model(registry_dir, manifest, target_dir)
+    write_document(registry_dir / STATE_FILENAME, state)
+    return manifest
+
+
+def resolve_key(registry_dir: Path, key: str) -> str:
+    matches = [model["key"] for model in list_models(registry_dir) if model["key"].startswith(key)]
+    if len(matches) != 1:
+        raise ValueError(f"Registry key {key!r} matches {len(matches)} models")
+    return matches[0]
+
+
+def load_manifest(registry_dir: Path, key: str) -> Dict[str, object] | None:
+    path = manifest_path(registry_dir, key)
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if not all(blob_path(registry_dir, entry["sha256"]).exists() for entry in manifest["files"].values()):
+        return None
+    return manifest
+
+
+def required_manifest(registry_dir: Path, key: str) -> Dict[str, object]:
+    manifest = load_manifest(registry_dir, key)
+    if manifest is None:
+        raise ValueError(f"Registry model {key} is missing its manifest or blobs")
+    return manifest
+
+
+def load_state(registry_dir: Path) -> Dict[str, object]:
+    path = registry_dir / STATE_FILENAME
+    if not path.exists():
+        return {"promoted": None, "history": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def manifest_path(registry_dir: Path, key: str) -> Path:
+    return registry_dir / MODELS_DIRNAME / f"{key}.json"
+
+
+def blob_path(registry_dir: Path, digest: str) -> Path:
+    return registry_dir / BLOBS_DIRNAME / digest[:2] / digest
+
+
+def write_document(path: Path, document: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    staging.write_text(json.dumps(document, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(staging, path)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from .model import text_value
+from .paths import RULES_PATH
+
+RULE_SOURCE = "RULE"
+UNDEFINED_CATEGORY = "UNDEFINED"
+TRANSACTION_CATEGORIES = (
+    "FOOD_AND_DRINKS",
+    "TRANSPORT",
+    "GROCERIES",
+    "RETAIL_SHOPPING",
+    "ENTERTAINMENT",
+    "HEALTH",
+    "BANKING_AND_FEES",
+    "BILLS_AND_GOVERNMENT",
+    UNDEFINED_CATEGORY,
+)
+NON_TEXT_PATTERN = re.compile(r"[\W_]+")
+
+
+@dataclass(frozen=True)
+class RuleConfidence:
+    mcc_base_confirmed: float
+    mcc_base_unconfirmed: float
+    keyword_base: float
+    boost_per_match: float
+    contradiction_penalty: float
+    mcc_min: float
+    max: float
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    mcc_rules: Dict[str, str]
+    keyword_rules: Dict[str, Tuple[str, ...]]
+    keyword_priority: Tuple[str, ...]
+    confidence: RuleConfidence
+
+    @property
+    def categories(self) -> List[str]:
+        return sorted({*self.mcc_rules.values(), *self.keyword_priority, UNDEFINED_CATEGORY})
+
+
+def load_rule_set(path: Path = RULES_PATH) -> RuleSet:
+    with path.open("r", encoding="utf-8") as file:
+        document = yaml.load(file, Loader=yaml.BaseLoader)
+    if not document:
+        raise ValueError(f"Rules file is empty: {path}")
+    confidence = rule_confidence(document.get("confidence"))
+
+    mcc_rules = {}
+    for code, category in (document.get("mcc") or {}).items():
+        code = str(code).strip()
+        if not code:
+            raise ValueError("mcc code cannot be blank")
+        mcc_rules[code] = parse_category(category, f"mcc.{code}")
+
+    keyword_rules: Dict[str, List[str]] = {}
+    for rule in document.get("keywords") or []:
+        category = parse_category(rule.get("category"), "keywords.category")
+        words = keyword_rules.setdefault(category, [])
+        for raw_word in rule.get("words") or []:
+            word = normalize_text(raw_word)
+            if word and word not in words:
+                words.append(word)
+
+    return RuleSet(
+        mcc_rules=mcc_rules,
+        keyword_rules={category: tuple(words) for category, words in keyword_rules.items()},
+        keyword_priority=tuple(keyword_rules),
+        confidence=confidence,
+    )
+
+
+def rule_confidence(section: Dict[str, str] | None) -> RuleConfidence:
+    if section is None:
+        raise ValueError("confidence section is required")
+    confidence = RuleConfidence(
+        **{name: float(section.get(name, 0.0)) for name in RuleConfidence.__dataclass_fields__}
+    )
+    if not 0.0 <= confidence.max <= 1.0:
+        raise ValueError("confidence.max must be in range [0.0, 1.0]")
+    for name in ("mcc_base_confirmed", "mcc_base_unconfirmed", "mcc_min", "keyword_base"):
+        if not 0.0 <= getattr(confidence, name) <= confidence.max:
+            raise ValueError(f"confidence.{name} must be in range [0.0, max]")
+    if confidence.mcc_base_unconfirmed > confidence.mcc_base_confirmed:
+        raise ValueError("confidence.mcc_base_unconfirmed must be <= confidence.mcc_base_confirmed")
+    if confidence.mcc_min > confidence.mcc_base_unconfirmed:
+        raise ValueError("confidence.mcc_min must be <= confidence.mcc_base_unconfirmed")
+    if confidence.boost_per_match < 0.0:
+        raise ValueError("confidence.boost_per_match must be >= 0.0")
+    if confidence.contradiction_penalty < 0.0:
+        raise ValueError("confidence.contradiction_penalty must be >= 0.0")
+    return confidence
+
+
+def parse_category(value: object, field_name: str) -> str:
+    category = "" if value is None else str(value).strip().upper()
+    if not category:
+        raise ValueError(f"Category is empty for: {field_name}")
+    if category not in TRANSACTION_CATEGORIES:
+        raise ValueError(f"Unsupported category {str(value)!r} for: {field_name}")
+    return category
+
+
+def normalize_text(text: object) -> str:
+    value = text_value(text)
+    if not value.strip():
+        return ""
+    lowered = value.lower()
+    if not lowered.isascii():
+        lowered = "".join(char if char.isalpha() or char.isdecimal() else " " for char in lowered)
+    return " ".join(NON_TEXT_PATTERN.sub(" ", lowered).split())
+
+
+def normalized_texts(descriptions: Sequence[object], merchant_names: Sequence[object]) -> np.ndarray:
+    descriptions = normalize_values(descriptions)
+    merchant_names = normalize_values(merchant_names)
+    text = np.empty(len(descriptions), dtype=object)
+    text[:] = [
+        f"{description} {merchant_name}" if description and merchant_name else description or merchant_name
+        for description, merchant_name in zip(descriptions, merchant_names)
+    ]
+    return text
+
+
+def normalize_values(values: Sequence[object]) -> List[str]:
+    series = pd.Series(values, dtype=object)
+    normalized = {value: normalize_text(value) for value in pd.unique(series.dropna())}
+    return [normalized.get(value, "") if not pd.isna(value) else "" for value in series]
+
+
+def keyword_hits(rule_set: RuleSet, texts: np.ndarray) -> np.ndarray:
+    series = pd.Series(texts, dtype=object)
+    hits = np.zeros((len(series), len(rule_set.keyword_priority)), dtype=np.int64)
+    for column, category in enumerate(rule_set.keyword_priority):
+        for keyword in rule_set.keyword_rules.get(category, ()):
+            hits[:, column] += series.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+    return hits
+
+
+def classify_rules(
+    rule_set: RuleSet,
+    descriptions: Sequence[object],
+    merchant_names: Sequence[object],
+    mcc_codes: Sequence[object],
+) -> Tuple[np.ndarray, np.ndarray]:
+    confidence = rule_set.confidence
+    hits = keyword_hits(rule_set, normalized_texts(descriptions, merchant_names))
+    rows = np.arange(hits.shape[0])
+    hits = np.hstack([hits, np.zeros((rows.size, 1), dtype=np.int64)])
+    priority = np.asarray(rule_set.keyword_priority + (UNDEFINED_CATEGORY,), dtype=object)
+
+    mcc_categories = np.empty(rows.size, dtype=object)
+    mcc_categories[:] = [rule_set.mcc_rules.get(text_value(code).strip()) for code in mcc_codes]
+    has_mcc = np.fromiter((category is not None for category in mcc_categories), dtype=bool, count=rows.size)
+    priority_index = {category: index for index, category in enumerate(rule_set.keyword_priority)}
+    mcc_columns = np.fromiter(
+        (priority_index.get(category, -1) for category in mcc_categories),
+        dtype=np.int64,
+        count=rows.size,
+    )
+    same_hits = hits[rows, mcc_columns]
+    other_hits = hits.copy()
+    other_hits[rows, mcc_columns] = 0
+    max_other_hits = other_hits.max(axis=1)
+    mcc_base = np.where(same_hits > 0, confidence.mcc_base_confirmed, confidence.mcc_base_unconfirmed)
+    mcc_confidence = np.maximum(
+        confidence.mcc_min,
+        np.minimum(
+            mcc_base + confidence.boost_per_match * same_hits - confidence.contradiction_penalty * max_other_hits,
+            confidence.max,
+        ),
+    )
+
+    keyword_confidence = np.where(
+        hits > 0,
+        np.minimum(confidence.keyword_base + confidence.boost_per_match * hits, confidence.max),
+        -np.inf,
+    )
+    best_confidence = keyword_confidence.max(axis=1)
+    best_column = np.where(keyword_confidence == best_confidence[:, None], hits, -1).argmax(axis=1)
+    matched = np.isfinite(best_confidence)
+    keyword_categories = np.where(matched, priority[best_column], UNDEFINED_CATEGORY)
+
+    categories = np.where(has_mcc, mcc_categories, keyword_categories).astype(object)
+    confidences = np.where(has_mcc, mcc_confidence, np.where(matched, best_confidence, 0.0))
+    return categories, confidences
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, Generic, List, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from .model import predict_onnx_probabilities, records_feature_arrays
+from .sessions import SessionConfig
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    max_batch_size: int = 64
+    max_wait_ms: float = 5.0
+    latency_slo_ms: float | None = None
+    latency_window: int = 10000
+
+
+class BatchScheduler(Generic[T, R]):
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], Sequence[R]],
+        config: SchedulerConfig | None = None,
+    ) -> None:
+        self.config = config or SchedulerConfig()
+        validate_scheduler_config(self.config)
+        self._run_batch = run_batch
+        self._pending: Deque[Tuple[T, asyncio.Future, float]] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._stopping = False
+        self._requests = 0
+        self._batches = 0
+        self._slo_violations = 0
+        self._batch_sizes: Counter[int] = Counter()
+        self._latencies_ms: Deque[float] = deque(maxlen=self.config.latency_window)
+
+    async def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._worker
+        self._worker = None
+
+    async def __aenter__(self) -> "BatchScheduler[T, R]":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    def enqueue(self, item: T) -> asyncio.Future:
+        if self._worker is None or self._stopping:
+            raise RuntimeError("BatchScheduler is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        self._wakeup.set()
+        return future
+
+    async def submit(self, item: T) -> R:
+        return await self.enqueue(item)
+
+    def metrics(self) -> Dict[str, object]:
+        latencies = np.asarray(self._latencies_ms, dtype=np.float64)
+        return {
+            "queue_depth": len(self._pending),
+            "requests": self._requests,
+            "batches": self._batches,
+            "mean_batch_size": float(self._requests / self._batches) if self._batches else 0.0,
+            "batch_size_histogram": {
+                str(size): count
+                for size, count in sorted(self._batch_sizes.items())
+            },
+            "latency_ms": {
+                "samples": int(latencies.size),
+                "p50": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+                "p99": float(np.percentile(latencies, 99)) if latencies.size else 0.0,
+                "max": float(latencies.max()) if latencies.size else 0.0,
+            },
+            "latency_slo_ms": self.config.latency_slo_ms,
+            "slo_violations": self._slo_violations,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        max_wait_seconds = self.config.max_wait_ms / 1000.0
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            deadline = loop.time() + max_wait_seconds
+            while len(self._pending) < self.config.max_batch_size and not self._stopping:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch_size = min(self.config.max_batch_size, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(batch_size)]
+            await self._dispatch(loop, batch)
+
+    async def _dispatch(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        batch: List[Tuple[T, asyncio.Future, float]],
+    ) -> None:
+        items = [item for item, _, _ in batch]
+        try:
+            results = await loop.run_in_executor(None, self._run_batch, items)
+            error = None
+        except Exception as exception:
+            results = [None] * len(batch)
+            error = exception
+        if error is None and len(results) != len(batch):
+            error = RuntimeError(f"run_batch returned {len(results)} results for {len(batch)} requests")
+            results = [None] * len(batch)
+
+        finished = time.perf_counter()
+        self._batches += 1
+        self._requests += len(batch)
+        self._batch_sizes[len(batch)] += 1
+        for (_, future, enqueued), result in zip(batch, results):
+            latency_ms = (finished - enqueued) * 1000.0
+            self._latencies_ms.append(latency_ms)
+            if self.config.latency_slo_ms is not None and latency_ms > self.config.latency_slo_ms:
+                self._slo_violations += 1
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+class ThreadedBatchScheduler(Generic[T, R]):
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], Sequence[R]],
+        config: SchedulerConfig | None = None,
+    ) -> None:
+        self.scheduler: BatchScheduler[T, R] = BatchScheduler(run_batch, config)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="batch-scheduler", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.scheduler.start(), self._loop).result()
+
+    def submit(self, items: List[T]) -> List[Future]:
+        return [
+            asyncio.run_coroutine_threadsafe(self.scheduler.submit(item), self._loop)
+            for item in items
+        ]
+
+    def metrics(self) -> Dict[str, object]:
+        return asyncio.run_coroutine_threadsafe(self._metrics(), self._loop).result()
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.scheduler.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _metrics(self) -> Dict[str, object]:
+        return self.scheduler.metrics()
+
+
+def onnx_probability_runner(
+    model_path: Path,
+    labels: List[str],
+    session_config: SessionConfig | None = None,
+) -> Callable[[List[Dict[str, object]]], List[np.ndarray]]:
+    def run(transactions: List[Dict[str, object]]) -> List[np.ndarray]:
+        features = records_feature_arrays(transactions)
+        probabilities = predict_onnx_probabilities(
+            model_path=model_path,
+            features=features,
+            labels=labels,
+            session_config=session_config,
+        )
+        return list(probabilities)
+
+    return run
+
+
+def validate_scheduler_config(config: SchedulerConfig) -> None:
+    if config.max_batch_size <= 0:
+        raise ValueError("max_batch_size must be greater than 0")
+    if config.max_wait_ms < 0:
+        raise ValueError("max_wait_ms must be greater than or equal to 0")
+    if config.latency_slo_ms is not None and config.latency_slo_ms <= 0:
+        raise ValueError("latency_slo_ms must be greater than 0")
+    if config.latency_window <= 0:
+        raise ValueError("latency_window must be greater than 0")
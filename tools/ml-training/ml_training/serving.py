@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from .model import LABELS_FILENAME, ONNX_MODEL_FILENAME, load_labels
+from .scheduler import SchedulerConfig, ThreadedBatchScheduler, onnx_probability_runner
+from .sessions import SessionConfig, get_session
+
+CLASSIFY_PATHS = ("/classify", "/api/classify")
+HEALTH_PATH = "/health"
+METRICS_PATH = "/metrics"
+ML_SOURCE = "ML"
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    artifact_dir: Path
+    host: str = "127.0.0.1"
+    port: int = 8081
+    max_batch_size: int = 64
+    batch_window_ms: float = 5.0
+    latency_slo_ms: float | None = None
+    session_config: SessionConfig | None = None
+
+
+class OnnxClassifier:
+    def __init__(self, artifact_dir: Path, session_config: SessionConfig | None = None) -> None:
+        self.model_path = artifact_dir / ONNX_MODEL_FILENAME
+        self.labels = load_labels(artifact_dir / LABELS_FILENAME)
+        get_session(self.model_path, session_config)
+        self._probabilities = onnx_probability_runner(self.model_path, self.labels, session_config)
+
+    def classify(self, requests: List[Dict[str, object]]) -> List[Dict[str, object]]:
+        if not requests:
+            return []
+        probabilities = np.asarray(self._probabilities(requests))
+        best_indices = probabilities.argmax(axis=1)
+        return [
+            {
+                "transactionId": request.get("transactionId"),
+                "category": self.labels[int(best_index)],
+                "confidence": float(probabilities[row_index, best_index]),
+                "source": ML_SOURCE,
+            }
+            for row_index, (request, best_index) in enumerate(zip(requests, best_indices))
+        ]
+
+
+class ClassifyRequestHandler(BaseHTTPRequestHandler):
+    server: "ScoringServer"
+
+    def do_GET(self) -> None:
+        if self.path == HEALTH_PATH:
+            self._send_json(HTTPStatus.OK, {"status": "UP", "labels": self.server.classifier.labels})
+        elif self.path == METRICS_PATH:
+            self._send_json(HTTPStatus.OK, self.server.scheduler.metrics())
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self) -> None:
+        if self.path not in CLASSIFY_PATHS:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            document = json.loads(self.rfile.read(length) or b"null")
+        except (ValueError, UnicodeDecodeError):
+            self._send_error(HTTPStatus.BAD_REQUEST, "Malformed request body")
+            return
+
+        is_batch = isinstance(document, list)
+        requests = document if is_batch else [document]
+        message = validate_classify_requests(requests)
+        if message is not None:
+            self._send_error(HTTPStatus.BAD_REQUEST, message)
+            return
+
+        try:
+            futures = self.server.scheduler.submit(requests)
+            results = [future.result() for future in futures]
+        except Exception:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+            return
+        self._send_json(HTTPStatus.OK, results if is_batch else results[0])
+
+    def log_message(self, format: str, *args: object) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(
+            status,
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "status": status.value,
+                "error": status.phrase,
+                "message": message,
+                "path": self.path,
+            },
+        )
+
+    def _send_json(self, status: HTTPStatus, document: object) -> None:
+        body = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        self.send_response(status.value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: ServingConfig, verbose: bool = False) -> None:
+        self.classifier = OnnxClassifier(config.artifact_dir, config.session_config)
+        self.verbose = verbose
+        super().__init__((config.host, config.port), ClassifyRequestHandler)
+        self.scheduler = ThreadedBatchScheduler(
+            self.classifier.classify,
+            SchedulerConfig(
+                max_batch_size=config.max_batch_size,
+                max_wait_ms=config.batch_window_ms,
+                latency_slo_ms=config.latency_slo_ms,
+            ),
+        )
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.scheduler.close()
+
+
+def validate_classify_requests(requests: List[object]) -> str | None:
+    if not requests:
+        return "Request body must contain at least one transaction"
+    for request in requests:
+        if not isinstance(request, dict):
+            return "Malformed request body"
+        if request.get("transactionId") is None:
+            return "transactionId must not be null"
+        if request.get("amount") is None:
+            return "amount must not be null"
+        try:
+            float(request["amount"])
+        except (TypeError, ValueError):
+            return "amount must be a number"
+    return None
+
+
+def serve(config: ServingConfig, verbose: bool = False) -> None:
+    server = ScoringServer(config, verbose=verbose)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+GRAPH_OPTIMIZATION_LEVELS = ("disabled", "basic", "extended", "all")
+
+
+@dataclass(frozen=True)
+class SessionConfig:
+    intra_op_num_threads: int = 0
+    inter_op_num_threads: int = 0
+    graph_optimization_level: str = "all"
+    profile_file_prefix: str | None = None
+
+
+SessionKey = Tuple[str, int, int, SessionConfig]
+PipelineKey = Tuple[str, int, int]
+
+_SESSIONS: Dict[SessionKey, object] = {}
+_PIPELINES: Dict[PipelineKey, object] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(model_path: Path, config: SessionConfig | None = None) -> object:
+    session_config = config or SessionConfig()
+    validate_session_config(session_config)
+    resolved_path = Path(model_path).resolve()
+    stat = resolved_path.stat()
+    key = (str(resolved_path), stat.st_mtime_ns, stat.st_size, session_config)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            for stale_key in [cached for cached in _SESSIONS if cached[0] == key[0] and cached[1:3] != key[1:3]]:
+                del _SESSIONS[stale_key]
+            session = create_session(resolved_path, session_config)
+            _SESSIONS[key] = session
+    return session
+
+
+def release_session(model_path: Path, config: SessionConfig | None = None) -> None:
+    session_config = config or SessionConfig()
+    resolved_path = str(Path(model_path).resolve())
+    with _SESSIONS_LOCK:
+        for key in [cached for cached in _SESSIONS if cached[0] == resolved_path and cached[3] == session_config]:
+            del _SESSIONS[key]
+
+
+def get_pipeline(model_path: Path) -> object:
+    import joblib
+
+    resolved_path = Path(model_path).resolve()
+    stat = resolved_path.stat()
+    key = (str(resolved_path), stat.st_mtime_ns, stat.st_size)
+    with _SESSIONS_LOCK:
+        pipeline = _PIPELINES.get(key)
+        if pipeline is None:
+            for stale_key in [cached for cached in _PIPELINES if cached[0] == key[0]]:
+                del _PIPELINES[stale_key]
+            pipeline = joblib.load(resolved_path)
+            _PIPELINES[key] = pipeline
+    return pipeline
+
+
+def create_session(model_path: Path, config: SessionConfig | None = None) -> object:
+    import onnxruntime as ort
+
+    session_config = config or SessionConfig()
+    validate_session_config(session_config)
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = session_config.intra_op_num_threads
+    options.inter_op_num_threads = session_config.inter_op_num_threads
+    options.graph_optimization_level = graph_optimization_level(session_config.graph_optimization_level)
+    if session_config.profile_file_prefix is not None:
+        options.enable_profiling = True
+        options.profile_file_prefix = session_config.profile_file_prefix
+    return ort.InferenceSession(str(model_path), sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def graph_optimization_level(name: str) -> object:
+    import onnxruntime as ort
+
+    return {
+        "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }[name]
+
+
+def validate_session_config(config: SessionConfig) -> None:
+    if config.intra_op_num_threads < 0:
+        raise ValueError("intra_op_num_threads must be greater than or equal to 0")
+    if config.inter_op_num_threads < 0:
+        raise ValueError("inter_op_num_threads must be greater than or equal to 0")
+    if config.graph_optimization_level not in GRAPH_OPTIMIZATION_LEVELS:
+        raise ValueError(
+            f"graph_optimization_level must be one of: {', '.join(GRAPH_OPTIMIZATION_LEVELS)}"
+        )
+
+
+def cached_session_count() -> int:
+    with _SESSIONS_LOCK:
+        return len(_SESSIONS)
+
+
+def clear_session_cache() -> None:
+    with _SESSIONS_LOCK:
+        _SESSIONS.clear()
+        _PIPELINES.clear()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from .dataset import split_path
+from .evaluation import MetricsAccumulator
+from .model import (
+    PipelineConfig,
+    StreamingConfig,
+    build_features,
+    feature_frame,
+    iter_dataset_chunks,
+    label_array,
+)
+
+
+def fit_streaming_pipeline(
+    data_dir: Path,
+    pipeline_config: PipelineConfig,
+    config: StreamingConfig,
+) -> Tuple[Pipeline, Dict[str, object]]:
+    validate_streaming_config(config)
+    train_path = split_path(data_dir, "train")
+    statistics = collect_training_statistics(train_path, pipeline_config, config.chunk_size)
+    features = build_streaming_features(train_path, pipeline_config, config.chunk_size, statistics)
+    labels = sorted(statistics["label_counts"])
+    class_weights = (
+        balanced_class_weights(statistics["label_counts"])
+        if pipeline_config.class_weight == "balanced"
+        else None
+    )
+
+    classifier = SGDClassifier(loss="log_loss", alpha=config.alpha, random_state=config.seed)
+    rng = np.random.default_rng(config.seed)
+    for _ in range(config.epochs):
+        for chunk in iter_dataset_chunks(train_path, config.chunk_size):
+            chunk = chunk.iloc[rng.permutation(len(chunk))]
+            y = label_array(chunk)
+            sample_weight = (
+                np.asarray([class_weights[label] for label in y], dtype=np.float64)
+                if class_weights is not None
+                else None
+            )
+            classifier.partial_fit(
+                features.transform(feature_frame(chunk)),
+                y,
+                classes=labels,
+                sample_weight=sample_weight,
+            )
+
+    pipeline = Pipeline(steps=[("features", features), ("classifier", classifier)])
+    validation_metrics = streaming_validation_metrics(pipeline, split_path(data_dir, "validation"), config.chunk_size)
+    return pipeline, validation_metrics
+
+
+def collect_training_statistics(
+    path: Path,
+    pipeline_config: PipelineConfig,
+    chunk_size: int,
+) -> Dict[str, object]:
+    counter = CountVectorizer(ngram_range=tuple(pipeline_config.ngram_range), dtype=np.int64)
+    term_counts: Counter = Counter()
+    document_counts: Counter = Counter()
+    label_counts: Counter = Counter()
+    mcc_codes = set()
+    rows = 0
+    amount_sum = 0.0
+    amount_square_sum = 0.0
+    for chunk in iter_dataset_chunks(path, chunk_size):
+        frame = feature_frame(chunk)
+        rows += len(frame)
+        label_counts.update(label_array(chunk).tolist())
+        mcc_codes.update(frame["mccCode"].tolist())
+        amounts = frame["amount"].to_numpy(dtype=np.float64)
+        amount_sum += float(amounts.sum())
+        amount_square_sum += float(np.square(amounts).sum())
+        try:
+            counts = counter.fit_transform(frame["text"])
+        except ValueError:
+            continue
+        terms = counter.get_feature_names_out().tolist()
+        term_counts.update(dict(zip(terms, np.asarray(counts.sum(axis=0)).ravel().tolist())))
+        document_counts.update(dict(zip(terms, counts.getnnz(axis=0).tolist())))
+
+    if rows == 0:
+        raise ValueError(f"Training split is empty: {path}")
+    mean = amount_sum / rows
+    return {
+        "rows": rows,
+        "term_counts": term_counts,
+        "document_counts": document_counts,
+        "label_counts": label_counts,
+        "mcc_codes": sorted(mcc_codes),
+        "amount_mean": mean,
+        "amount_var": max(amount_square_sum / rows - mean * mean, 0.0),
+    }
+
+
+def select_vocabulary(statistics: Dict[str, object], pipeline_config: PipelineConfig) -> List[str]:
+    rows = statistics["rows"]
+    min_df = pipeline_config.min_df if isinstance(pipeline_config.min_df, int) else math.ceil(pipeline_config.min_df * rows)
+    limit = min(pipeline_config.max_features or pipeline_config.vocabulary_size, pipeline_config.vocabulary_size)
+    document_counts = statistics["document_counts"]
+    candidates = [term for term, count in document_counts.items() if count >= min_df]
+    term_counts = statistics["term_counts"]
+    candidates.sort(key=lambda term: (-term_counts[term], term))
+    vocabulary = sorted(candidates[:limit])
+    if not vocabulary:
+        raise ValueError("Training split has no text terms after min_df filtering")
+    return vocabulary
+
+
+def build_streaming_features(
+    path: Path,
+    pipeline_config: PipelineConfig,
+    chunk_size: int,
+    statistics: Dict[str, object],
+) -> ColumnTransformer:
+    vocabulary = select_vocabulary(statistics, pipeline_config)
+    features = build_features(pipeline_config)
+    features.set_params(
+        text__vocabulary={term: index for index, term in enumerate(vocabulary)},
+        mcc__categories=[statistics["mcc_codes"]],
+    )
+    features.fit(feature_frame(next(iter_dataset_chunks(path, chunk_size))))
+
+    document_counts = np.asarray([statistics["document_counts"][term] for term in vocabulary], dtype=np.float64)
+    text = features.named_transformers_["text"]
+    text.idf_ = np.log((1.0 + statistics["rows"]) / (1.0 + document_counts)) + 1.0
+    text.stop_words_ = set()
+
+    scaler = features.named_transformers_["amount"]
+    scaler.mean_ = np.asarray([statistics["amount_mean"]], dtype=np.float64)
+    scaler.var_ = np.asarray([statistics["amount_var"]], dtype=np.float64)
+    scaler.scale_ = np.asarray([math.sqrt(statistics["amount_var"]) or 1.0], dtype=np.float64)
+    scaler.n_samples_seen_ = statistics["rows"]
+    return features
+
+
+def balanced_class_weights(label_counts: Counter) -> Dict[str, float]:
+    total = sum(label_counts.values())
+    return {label: total / (len(label_counts) * count) for label, count in label_counts.items()}
+
+
+def streaming_validation_metrics(pipeline: Pipeline, path: Path, chunk_size: int) -> Dict[str, object]:
+    accumulator = MetricsAccumulator([str(label) for label in pipeline.named_steps["classifier"].classes_])
+    for chunk in iter_dataset_chunks(path, chunk_size):
+        probabilities = pipeline.predict_proba(feature_frame(chunk))
+        accumulator.update(
+            accumulator.label_indices(label_array(chunk)),
+            probabilities.argmax(axis=1),
+            probabilities.max(axis=1),
+        )
+    return accumulator.metrics()
+
+
+def validate_streaming_config(config: StreamingConfig) -> None:
+    if config.chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    if config.epochs <= 0:
+        raise ValueError("epochs must be greater than 0")
+    if config.alpha <= 0:
+        raise ValueError("alpha must be greater than 0")
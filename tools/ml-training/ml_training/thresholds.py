@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+from .dataset import load_export_metadata, split_path
+from .model import (
+    LABELS_FILENAME,
+    ONNX_MODEL_FILENAME,
+    SKLEARN_MODEL_FILENAME,
+    feature_frame,
+    iter_dataset_chunks,
+    label_array,
+    load_labels,
+    predict_onnx_probabilities,
+    safe_artifact_suffix,
+    write_json,
+)
+from .onnx_optimization import onnx_variant_paths
+from .sessions import SessionConfig
+
+LLM_ROUTING_THRESHOLD = 0.90
+DEFAULT_THRESHOLD_STEP = 0.005
+DEFAULT_ACCURACY_TARGETS = (0.95, 0.97, 0.99)
+ALL_CATEGORIES = "__all__"
+THRESHOLD_CSV_FIELDS = (
+    "category",
+    "threshold",
+    "rows",
+    "accepted",
+    "llm_calls",
+    "fallback_fraction",
+    "accepted_accuracy",
+    "accepted_precision",
+    "llm_calls_per_million",
+)
+
+
+@dataclass(frozen=True)
+class ThresholdReportConfig:
+    data_dir: Path
+    artifact_dir: Path
+    split: str = "test"
+    runtime: str = "onnx"
+    probabilities_path: Path | None = None
+    y_true_path: Path | None = None
+    threshold_step: float = DEFAULT_THRESHOLD_STEP
+    accuracy_targets: Tuple[float, ...] = DEFAULT_ACCURACY_TARGETS
+    chunk_size: int = 50000
+    session_config: SessionConfig | None = None
+
+
+class ThresholdSweep:
+    def __init__(self, labels: Sequence[str], thresholds: Sequence[float]) -> None:
+        self.labels = [str(label) for label in labels]
+        self.thresholds = np.unique(np.asarray(thresholds, dtype=np.float64))
+        width = self.thresholds.size + 1
+        self.true_counts = np.zeros((len(self.labels) + 1, width), dtype=np.int64)
+        self.correct_counts = np.zeros((len(self.labels) + 1, width), dtype=np.int64)
+        self.predicted_counts = np.zeros((len(self.labels), width), dtype=np.int64)
+
+    def update(self, probabilities: np.ndarray, true_indices: np.ndarray) -> "ThresholdSweep":
+        probabilities = np.asarray(probabilities)
+        true_indices = np.asarray(true_indices, dtype=np.int64)
+        predicted = probabilities.argmax(axis=1)
+        confidences = probabilities.max(axis=1).astype(np.float64)
+        bins = np.searchsorted(self.thresholds, confidences, side="right")
+        true_rows = np.where(true_indices >= 0, true_indices, len(self.labels))
+        width = self.thresholds.size + 1
+        true_cells = true_rows * width + bins
+        correct = true_indices == predicted
+        self.true_counts += np.bincount(true_cells, minlength=self.true_counts.size).reshape(self.true_counts.shape)
+        self.correct_counts += np.bincount(
+            true_cells[correct],
+            minlength=self.correct_counts.size,
+        ).reshape(self.correct_counts.shape)
+        self.predicted_counts += np.bincount(
+            predicted * width + bins,
+            minlength=self.predicted_counts.size,
+        ).reshape(self.predicted_counts.shape)
+        return self
+
+    def merge(self, other: "ThresholdSweep") -> "ThresholdSweep":
+        if other.labels != self.labels or not np.array_equal(other.thresholds, self.thresholds):
+            raise ValueError("Only sweeps with identical labels and thresholds can be merged")
+        self.true_counts += other.true_counts
+        self.correct_counts += other.correct_counts
+        self.predicted_counts += other.predicted_counts
+        return self
+
+    def curves(self) -> Dict[str, List[Dict[str, object]]]:
+        rows = self.true_counts.sum(axis=1)
+        accepted = accepted_counts(self.true_counts)
+        correct = accepted_counts(self.correct_counts)
+        predicted = accepted_counts(self.predicted_counts)
+        curves = {
+            ALL_CATEGORIES: threshold_rows(
+                self.thresholds,
+                int(rows.sum()),
+                accepted.sum(axis=0),
+                correct.sum(axis=0),
+                accepted.sum(axis=0),
+            )
+        }
+        for index, label in enumerate(self.labels):
+            curves[label] = threshold_rows(
+                self.thresholds,
+                int(rows[index]),
+                accepted[index],
+                correct[index],
+                predicted[index],
+            )
+        return curves
+
+
+def build_threshold_report(config: ThresholdReportConfig) -> Dict[str, object]:
+    validate_threshold_report_config(config)
+    labels = load_labels(config.artifact_dir / LABELS_FILENAME)
+    dataset_metadata = load_export_metadata(config.data_dir)
+    dataset_suffix = safe_artifact_suffix(dataset_metadata.get("dataset_id") or config.data_dir.name)
+    report_prefix = f"{config.split}-thresholds-{dataset_suffix}-{safe_artifact_suffix(config.runtime)}"
+
+    probabilities_path = config.probabilities_path
+    y_true_path = config.y_true_path
+    evaluation_prefix = config.artifact_dir / f"{config.split}-evaluation-{dataset_suffix}"
+    if probabilities_path is None:
+        spilled = evaluation_prefix.with_name(f"{evaluation_prefix.name}-{config.runtime}-probabilities.npy")
+        if spilled.exists():
+            probabilities_path = spilled
+    if probabilities_path is not None and y_true_path is None:
+        y_true_path = evaluation_prefix.with_name(f"{evaluation_prefix.name}-y-true.npy")
+
+    sweep = ThresholdSweep(labels, threshold_grid(config.threshold_step))
+    if probabilities_path is not None:
+        source = {"probabilities": str(probabilities_path), "y_true": str(y_true_path)}
+        chunks = saved_probability_chunks(probabilities_path, y_true_path, len(labels), config.chunk_size)
+    else:
+        source = {"dataset": str(split_path(config.data_dir, config.split)), "model": config.runtime}
+        chunks = scored_probability_chunks(config, labels)
+    for probabilities, true_indices in chunks:
+        sweep.update(probabilities, true_indices)
+
+    curves = sweep.curves()
+    overall = curves.pop(ALL_CATEGORIES)
+    report = {
+        "dataset": dataset_metadata,
+        "split": config.split,
+        "runtime": config.runtime,
+        "source": source,
+        "rows": overall[0]["rows"],
+        "routing_threshold": LLM_ROUTING_THRESHOLD,
+        "current": threshold_row_at(overall, LLM_ROUTING_THRESHOLD),
+        "recommendations": [
+            recommend_threshold(overall, target)
+            for target in sorted(config.accuracy_targets)
+        ],
+        "overall": overall,
+        "per_category": curves,
+    }
+    json_path = config.artifact_dir / f"{report_prefix}.json"
+    csv_path = config.artifact_dir / f"{report_prefix}.csv"
+    write_json(json_path, report)
+    write_threshold_csv(csv_path, overall, curves)
+    report["report_path"] = str(json_path)
+    report["csv_path"] = str(csv_path)
+    return report
+
+
+def threshold_grid(step: float) -> np.ndarray:
+    grid = np.round(np.arange(0.0, 1.0 + step / 2.0, step), 6)
+    return np.unique(np.append(grid[grid <= 1.0], LLM_ROUTING_THRESHOLD))
+
+
+def accepted_counts(counts: np.ndarray) -> np.ndarray:
+    return np.cumsum(counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+
+def threshold_rows(
+    thresholds: np.ndarray,
+    rows: int,
+    accepted: np.ndarray,
+    correct: np.ndarray,
+    predicted: np.ndarray,
+) -> List[Dict[str, object]]:
+    result = []
+    for threshold, accepted_rows, correct_rows, predicted_rows in zip(thresholds, accepted, correct, predicted):
+        llm_calls = rows - int(accepted_rows)
+        fallback_fraction = llm_calls / rows if rows else 0.0
+        result.append(
+            {
+                "threshold": float(threshold),
+                "rows": rows,
+                "accepted": int(accepted_rows),
+                "llm_calls": llm_calls,
+                "fallback_fraction": fallback_fraction,
+                "accepted_accuracy": float(correct_rows / accepted_rows) if accepted_rows else None,
+                "accepted_precision": float(correct_rows / predicted_rows) if predicted_rows else None,
+                "llm_calls_per_million": fallback_fraction * 1_000_000,
+            }
+        )
+    return result
+
+
+def threshold_row_at(rows: List[Dict[str, object]], threshold: float) -> Dict[str, object]:
+    return min(rows, key=lambda row: abs(row["threshold"] - threshold))
+
+
+def recommend_threshold(rows: List[Dict[str, object]], target_accuracy: float) -> Dict[str, object]:
+    for row in rows:
+        if row["accepted_accuracy"] is not None and row["accepted_accuracy"] >= target_accuracy:
+            return {"target_accuracy": target_accuracy, **row}
+    return {"target_accuracy": target_accuracy, "threshold": None}
+
+
+def saved_probability_chunks(
+    probabilities_path: Path,
+    y_true_path: Path,
+    label_count: int,
+    chunk_size: int,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    probabilities = np.load(probabilities_path, mmap_mode="r")
+    y_true = np.load(y_true_path, mmap_mode="r")
+    if probabilities.ndim != 2 or probabilities.shape[1] != label_count:
+        raise ValueError(f"Expected a probability matrix with {label_count} columns: {probabilities_path}")
+    if y_true.shape[0] != probabilities.shape[0]:
+        raise ValueError(f"{y_true_path} has {y_true.shape[0]} rows, {probabilities_path} has {probabilities.shape[0]}")
+    for start in range(0, probabilities.shape[0], chunk_size):
+        stop = start + chunk_size
+        yield np.asarray(probabilities[start:stop]), np.asarray(y_true[start:stop], dtype=np.int64)
+
+
+def scored_probability_chunks(
+    config: ThresholdReportConfig,
+    labels: List[str],
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    label_index = {label: index for index, label in enumerate(labels)}
+    pipeline = None
+    model_path = config.artifact_dir / ONNX_MODEL_FILENAME
+    if config.runtime == "sklearn":
+        pipeline = joblib.load(config.artifact_dir / SKLEARN_MODEL_FILENAME)
+        label_positions = [label_index[str(label)] for label in pipeline.named_steps["classifier"].classes_]
+    elif config.runtime != "onnx":
+        variant_paths = onnx_variant_paths(config.artifact_dir)
+        if config.runtime not in variant_paths:
+            raise ValueError(f"Unknown runtime '{config.runtime}'; available ONNX variants: {sorted(variant_paths)}")
+        model_path = variant_paths[config.runtime]
+
+    for chunk in iter_dataset_chunks(split_path(config.data_dir, config.split), config.chunk_size):
+        features = feature_frame(chunk)
+        true_indices = np.fromiter(
+            (label_index.get(label, -1) for label in label_array(chunk)),
+            dtype=np.int64,
+            count=len(chunk),
+        )
+        if pipeline is not None:
+            probabilities = np.zeros((len(chunk), len(labels)), dtype=np.float32)
+            probabilities[:, label_positions] = pipeline.predict_proba(features)
+        else:
+            probabilities = predict_onnx_probabilities(
+                model_path=model_path,
+                features=features,
+                labels=labels,
+                session_config=config.session_config,
+            )
+        yield probabilities, true_indices
+
+
+def write_threshold_csv(
+    path: Path,
+    overall: List[Dict[str, object]],
+    per_category: Dict[str, List[Dict[str, object]]],
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=THRESHOLD_CSV_FIELDS)
+        writer.writeheader()
+        for category, rows in ((ALL_CATEGORIES, overall), *per_category.items()):
+            for row in rows:
+                writer.writerow({"category": category, **row})
+
+
+def validate_threshold_report_config(config: ThresholdReportConfig) -> None:
+    if not 0.0 < config.threshold_step <= 0.5:
+        raise ValueError("threshold_step must be in range (0.0, 0.5]")
+    if config.chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    if any(not 0.0 < target <= 1.0 for target in config.accuracy_targets):
+        raise ValueError("accuracy_targets must be in range (0.0, 1.0]")
+    if config.y_true_path is not None and config.probabilities_path is None:
+        raise ValueError("y_true_path requires probabilities_path")
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import f1_score
+from sklearn.pipeline import Pipeline
+
+from .dataset import load_export_metadata, split_path
+from .feature_cache import FeatureCacheConfig
+from .model import (
+    PipelineConfig,
+    build_classifier,
+    convert_pipeline_to_onnx,
+    feature_frame,
+    load_dataset,
+    pipeline_config_document,
+    training_features,
+    vectorizer_config_key,
+    write_json,
+)
+
+TUNING_REPORT_FILENAME = "tuning.json"
+SEARCH_STRATEGIES = ("grid", "random")
+DEFAULT_SEARCH_SPACE: Dict[str, Sequence[object]] = {
+    "ngram_range": [(1, 1), (1, 2)],
+    "min_df": [1, 2],
+    "sublinear_tf": [False, True],
+    "c": [0.5, 1.0, 4.0],
+    "class_weight": ["balanced", None],
+}
+
+
+@dataclass(frozen=True)
+class TuningConfig:
+    data_dir: Path
+    output_dir: Path
+    search: str = "grid"
+    n_trials: int = 20
+    n_jobs: int = -1
+    seed: int = 42
+    target_opset: int = 15
+    base_pipeline: PipelineConfig = PipelineConfig()
+    search_space: Mapping[str, Sequence[object]] | None = None
+    feature_cache: FeatureCacheConfig | None = None
+
+
+def tune_pipeline(config: TuningConfig) -> Dict[str, object]:
+    validate_tuning_config(config)
+    validation_features = feature_frame(load_dataset(split_path(config.data_dir, "validation")))
+
+    candidates = candidate_configs(config)
+    groups: Dict[Tuple[object, ...], List[PipelineConfig]] = {}
+    for candidate in candidates:
+        groups.setdefault(vectorizer_config_key(candidate), []).append(candidate)
+
+    parallel = Parallel(n_jobs=config.n_jobs)
+    fitted_groups = parallel(
+        delayed(training_features)(config.data_dir, group[0], config.feature_cache)
+        for group in groups.values()
+    )
+
+    tasks = []
+    vectorizers = []
+    for group, fitted in zip(groups.values(), fitted_groups):
+        vectorizers.append(
+            {
+                "vectorizer": pipeline_config_document(group[0]),
+                "fit_seconds": fitted["fit_seconds"],
+                "feature_count": int(fitted["x_train"].shape[1]),
+                "trials": len(group),
+            }
+        )
+        for candidate in group:
+            tasks.append(
+                delayed(run_trial)(
+                    candidate,
+                    fitted,
+                    validation_features,
+                    config.target_opset,
+                )
+            )
+    trials = sorted(parallel(tasks), key=lambda trial: trial["validation_macro_f1"], reverse=True)
+
+    report = {
+        "dataset": load_export_metadata(config.data_dir),
+        "search": config.search,
+        "trial_count": len(trials),
+        "best": trials[0] if trials else None,
+        "vectorizers": vectorizers,
+        "trials": trials,
+    }
+    report_path = config.output_dir / TUNING_REPORT_FILENAME
+    write_json(report_path, report)
+    report["report_path"] = str(report_path)
+    return report
+
+
+def candidate_configs(config: TuningConfig) -> List[PipelineConfig]:
+    space = dict(config.search_space or DEFAULT_SEARCH_SPACE)
+    names = list(space)
+    combinations = list(itertools.product(*(space[name] for name in names)))
+    if config.search == "random" and config.n_trials < len(combinations):
+        combinations = random.Random(config.seed).sample(combinations, config.n_trials)
+    return [
+        replace(
+            config.base_pipeline,
+            **{
+                name: (tuple(value) if name == "ngram_range" else value)
+                for name, value in zip(names, combination)
+            },
+        )
+        for combination in combinations
+    ]
+
+
+def run_trial(
+    config: PipelineConfig,
+    fitted: Mapping[str, object],
+    validation_features: object,
+    target_opset: int,
+) -> Dict[str, object]:
+    y_validation = fitted["y_validation"]
+    classifier = build_classifier(config)
+    started = time.perf_counter()
+    classifier.fit(fitted["x_train"], fitted["y_train"])
+    train_seconds = time.perf_counter() - started
+
+    predictions = classifier.predict(fitted["x_validation"])
+    pipeline = Pipeline(steps=[("features", fitted["features"]), ("classifier", classifier)])
+    started = time.perf_counter()
+    pipeline.predict_proba(validation_features)
+    inference_seconds = time.perf_counter() - started
+    onnx_bytes = len(convert_pipeline_to_onnx(pipeline, target_opset).SerializeToString())
+
+    labels = [str(label) for label in classifier.classes_]
+    return {
+        "pipeline": pipeline_config_document(config),
+        "validation_macro_f1": float(
+            f1_score(y_validation, predictions, labels=labels, average="macro", zero_division=0)
+        ),
+        "validation_accuracy": float(np.mean(predictions == y_validation)),
+        "train_seconds": train_seconds,
+        "vectorizer_fit_seconds": fitted["fit_seconds"],
+        "inference_us_per_row": inference_seconds / max(len(y_validation), 1) * 1e6,
+        "onnx_bytes": onnx_bytes,
+        "feature_count": int(fitted["x_train"].shape[1]),
+    }
+
+
+def validate_tuning_config(config: TuningConfig) -> None:
+    if config.search not in SEARCH_STRATEGIES:
+        raise ValueError("search must be 'grid' or 'random'")
+    if config.n_trials <= 0:
+        raise ValueError("n_trials must be greater than 0")
+    allowed = {field.name for field in fields(PipelineConfig)}
+    space = config.search_space or DEFAULT_SEARCH_SPACE
+    unknown = sorted(set(space) - allowed)
+    if unknown:
+        raise ValueError(f"Unknown search space parameters: {', '.join(unknown)}")
+    empty = sorted(name for name, values in space.items() if not values)
+    if empty:
+        raise ValueError(f"Search space parameters have no values: {', '.join(empty)}")
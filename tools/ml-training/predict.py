@@ -4,6 +4,7 @@ import argparse
 import json
 from pathlib import Path
 
+from ml_training.batch_scoring import BatchScoringConfig, score_file
 from ml_training.model import (
     LABELS_FILENAME,
     ONNX_MODEL_FILENAME,
@@ -11,23 +12,60 @@ from ml_training.model import (
     predict_onnx_scores,
     predict_sklearn_scores,
 )
+from ml_training.sessions import GRAPH_OPTIMIZATION_LEVELS, SessionConfig
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Predict one transaction category manually.")
+    parser = argparse.ArgumentParser(
+        description="Predict one transaction category manually or score a CSV/JSONL file in chunks."
+    )
     parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
     parser.add_argument("--runtime", choices=("onnx", "sklearn"), default="onnx")
-    parser.add_argument("--amount", type=float, required=True)
-    parser.add_argument("--description", required=True)
+    parser.add_argument("--amount", type=float)
+    parser.add_argument("--description")
     parser.add_argument("--merchant-name", default="")
     parser.add_argument("--mcc-code", default="")
     parser.add_argument("--top-k", type=int, default=5)
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
-    return parser.parse_args()
+    parser.add_argument("--intra-op-threads", type=int, default=0, help="0 lets ONNX Runtime decide.")
+    parser.add_argument("--inter-op-threads", type=int, default=0, help="0 lets ONNX Runtime decide.")
+    parser.add_argument("--graph-optimization-level", choices=GRAPH_OPTIMIZATION_LEVELS, default="all")
+    parser.add_argument("--input", type=Path, help="Batch mode: .csv or .jsonl file with transactions.")
+    parser.add_argument("--output", type=Path, help="Batch mode: .csv or .jsonl file for scored rows.")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+    if args.input is not None:
+        if args.output is None:
+            parser.error("--output is required with --input")
+    elif args.amount is None or args.description is None:
+        parser.error("--amount and --description are required unless --input is given")
+    return args
 
 
 def main() -> None:
     args = parse_args()
+    session_config = SessionConfig(
+        intra_op_num_threads=args.intra_op_threads,
+        inter_op_num_threads=args.inter_op_threads,
+        graph_optimization_level=args.graph_optimization_level,
+    )
+    if args.input is not None:
+        summary = score_file(
+            BatchScoringConfig(
+                input_path=args.input,
+                output_path=args.output,
+                artifact_dir=args.artifact_dir,
+                runtime=args.runtime,
+                chunk_size=args.chunk_size,
+                top_k=max(1, args.top_k),
+                session_config=session_config,
+            )
+        )
+        print(f"runtime: {summary['runtime']}")
+        print(f"rows: {summary['rows']} chunks: {summary['chunks']}")
+        print(f"output: {summary['output_path']}")
+        return
+
     if args.runtime == "onnx":
         scores = predict_onnx_scores(
             model_path=args.artifact_dir / ONNX_MODEL_FILENAME,
@@ -36,6 +74,7 @@ def main() -> None:
             description=args.description,
             merchant_name=args.merchant_name,
             mcc_code=args.mcc_code,
+            session_config=session_config,
         )
     else:
         scores = predict_sklearn_scores(
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ml_training.profiling import PROFILE_STAGES, ProfileConfig, profile_onnx
+from ml_training.sessions import GRAPH_OPTIMIZATION_LEVELS, SessionConfig
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Profile the ONNX classifier row by row and break latency down by operator."
+    )
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--split", choices=("train", "validation", "test"), default="test")
+    parser.add_argument("--max-rows", type=int, default=2000, help="Rows scored one at a time.")
+    parser.add_argument("--warmup-rows", type=int, default=20)
+    parser.add_argument("--slowest-rows", type=int, default=20, help="Slowest rows listed in the report.")
+    parser.add_argument("--threads", type=int, default=1, help="ONNX Runtime intra-op threads; 0 lets it decide.")
+    parser.add_argument("--optimization-level", choices=GRAPH_OPTIMIZATION_LEVELS, default="all")
+    parser.add_argument("--no-trace", action="store_true", help="Delete the raw ONNX Runtime trace after parsing.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = profile_onnx(
+        ProfileConfig(
+            data_dir=args.data_dir,
+            artifact_dir=args.artifact_dir,
+            split=args.split,
+            max_rows=args.max_rows,
+            warmup_rows=args.warmup_rows,
+            slowest_rows=args.slowest_rows,
+            session_config=SessionConfig(
+                intra_op_num_threads=args.threads,
+                inter_op_num_threads=1 if args.threads else 0,
+                graph_optimization_level=args.optimization_level,
+            ),
+            keep_trace=not args.no_trace,
+        )
+    )
+    latency = report["latency_us"]
+    print(f"rows: {report['rows']}")
+    print(f"latency us/row: p50 {latency['p50']:.1f}, p99 {latency['p99']:.1f}, max {latency['max']:.1f}")
+    for stage in PROFILE_STAGES:
+        print(f"{stage} share: {report['stages'][stage]['share']:.1%}")
+    for operator in report["operators"]:
+        print(f"  {operator['op_type']:<20} {operator['share']:>7.1%} {operator['mean_us']:>9.1f} us/call")
+    for column, correlation in report["correlation"].items():
+        value = correlation["latency_us"]
+        print(f"{column} vs latency (spearman): {'n/a' if value is None else format(value, '.3f')}")
+    print(f"report: {report['report_path']}")
+    if report["trace_path"]:
+        print(f"trace: {report['trace_path']}")
+
+
+if __name__ == "__main__":
+    main()
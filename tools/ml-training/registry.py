@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ml_training.registry import list_models, promote_model, registry_summary, rollback_model
+
+DEFAULT_REGISTRY_DIR = Path(".model-registry")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List, promote and roll back models in the local artifact registry.")
+    parser.add_argument("--registry-dir", type=Path, default=DEFAULT_REGISTRY_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show registered models, oldest first.")
+    promote = commands.add_parser("promote", help="Mark a model as promoted and copy its artifacts.")
+    promote.add_argument("key", help="Registry key or a unique prefix of it.")
+    rollback = commands.add_parser("rollback", help="Return to the previously promoted model.")
+    for command in (promote, rollback):
+        command.add_argument("--target-dir", type=Path, help="Directory that receives the promoted artifacts.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "list":
+        print(f"  {'key':<16} {'registered_at':<32} {'accuracy':>8} {'macro_f1':>8} {'KiB':>9}")
+        for model in list_models(args.registry_dir):
+            validation = model["validation"]
+            print(
+                f"{'*' if model['promoted'] else ' '} {model['key'][:16]:<16} {model['registered_at']:<32} "
+                f"{validation['accuracy'] or 0.0:>8.4f} {validation['macro_f1'] or 0.0:>8.4f} "
+                f"{model['bytes'] / 1024:>9.1f}"
+            )
+        summary = registry_summary(args.registry_dir)
+        print(
+            f"storage: {summary['blobs']} blobs, {summary['blob_bytes'] / 1024:.1f} KiB "
+            f"for {summary['artifact_bytes'] / 1024:.1f} KiB of artifacts in {summary['models']} models"
+        )
+        return
+    if args.command == "promote":
+        manifest = promote_model(args.registry_dir, args.key, args.target_dir)
+    else:
+        manifest = rollback_model(args.registry_dir, args.target_dir)
+    print(f"promoted: {manifest['key']}")
+    if args.target_dir is not None:
+        print(f"artifacts: {args.target_dir}")
+
+
+if __name__ == "__main__":
+    main()
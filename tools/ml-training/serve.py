@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ml_training.serving import ServingConfig, serve
+from ml_training.sessions import GRAPH_OPTIMIZATION_LEVELS, SessionConfig
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the exported ONNX classifier over HTTP.")
+    parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=5.0,
+        help="How long the first queued request waits for others to join its batch.",
+    )
+    parser.add_argument(
+        "--latency-slo-ms",
+        type=float,
+        default=None,
+        help="Count requests slower than this in /metrics slo_violations.",
+    )
+    parser.add_argument("--intra-op-threads", type=int, default=0, help="0 lets ONNX Runtime decide.")
+    parser.add_argument("--inter-op-threads", type=int, default=0, help="0 lets ONNX Runtime decide.")
+    parser.add_argument("--graph-optimization-level", choices=GRAPH_OPTIMIZATION_LEVELS, default="all")
+    parser.add_argument("--verbose", action="store_true", help="Log every HTTP request.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = ServingConfig(
+        artifact_dir=args.artifact_dir,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        batch_window_ms=args.batch_window_ms,
+        latency_slo_ms=args.latency_slo_ms,
+        session_config=SessionConfig(
+            intra_op_num_threads=args.intra_op_threads,
+            inter_op_num_threads=args.inter_op_threads,
+            graph_optimization_level=args.graph_optimization_level,
+        ),
+    )
+    print(f"serving {args.artifact_dir} on http://{args.host}:{args.port}/api/classify")
+    try:
+        serve(config, verbose=args.verbose)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
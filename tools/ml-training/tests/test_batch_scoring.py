@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import csv
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.batch_scoring import BatchScoringConfig, score_file  # noqa: E402
+from ml_training.dataset import DatasetExportConfig, export_datasets, read_rows  # noqa: E402
+from ml_training.model import TrainingConfig, predict_sklearn_scores, train_model  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def train_small_model(workspace: Path) -> Path:
+    data_dir = workspace / "data"
+    artifact_dir = workspace / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=30,
+            validation_per_category=6,
+            test_per_category=6,
+            users_per_split=12,
+            seed=51,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    return artifact_dir
+
+
+def test_score_file_streams_jsonl_chunks_to_csv_with_top_k(workspace_tmp: Path) -> None:
+    artifact_dir = train_small_model(workspace_tmp)
+    transactions = [
+        {"transactionId": "t-1", "amount": 350, "description": "taxi ride", "merchantName": "Yandex Go", "mccCode": 4121},
+        {"transactionId": "t-2", "amount": 990, "description": "grocery delivery", "merchantName": "Samokat", "mccCode": "5411"},
+        {"transactionId": "t-3", "amount": 120, "description": "coffee", "merchantName": None, "mccCode": None},
+        {"transactionId": "t-4", "amount": 2800, "description": "processing center operation"},
+        {"transactionId": "t-5", "amount": 699, "description": "NETFLIX.COM subscription", "mccCode": "5815"},
+    ]
+    input_path = workspace_tmp / "transactions.jsonl"
+    input_path.write_text(
+        "".join(json.dumps(row) + "\n" for row in transactions),
+        encoding="utf-8",
+    )
+    output_path = workspace_tmp / "scored.csv"
+
+    summary = score_file(
+        BatchScoringConfig(
+            input_path=input_path,
+            output_path=output_path,
+            artifact_dir=artifact_dir,
+            runtime="sklearn",
+            chunk_size=2,
+            top_k=3,
+        )
+    )
+
+    assert summary["rows"] == 5
+    assert summary["chunks"] == 3
+    with output_path.open("r", newline="", encoding="utf-8") as file:
+        scored = list(csv.DictReader(file))
+    assert [row["transactionId"] for row in scored] == ["t-1", "t-2", "t-3", "t-4", "t-5"]
+    assert "top_3_confidence" in scored[0]
+
+    expected = predict_sklearn_scores(
+        model_path=artifact_dir / "sklearn-pipeline.joblib",
+        amount=350,
+        description="taxi ride",
+        merchant_name="Yandex Go",
+        mcc_code="4121",
+    )
+    assert scored[0]["category"] == expected[0][0]
+    assert float(scored[0]["confidence"]) == pytest.approx(expected[0][1], abs=1e-6)
+    assert float(scored[0]["top_1_confidence"]) >= float(scored[0]["top_2_confidence"])
+
+
+def test_predict_cli_batch_mode_scores_csv_with_onnx(workspace_tmp: Path) -> None:
+    artifact_dir = train_small_model(workspace_tmp)
+    input_path = workspace_tmp / "data" / "test.csv"
+    output_path = workspace_tmp / "scored.jsonl"
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(ML_TRAINING_DIR / "predict.py"),
+            "--artifact-dir",
+            str(artifact_dir),
+            "--input",
+            str(input_path),
+            "--output",
+            str(output_path),
+            "--chunk-size",
+            "16",
+            "--top-k",
+            "2",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert "rows:" in result.stdout
+    scored = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    source_rows = read_rows(input_path)
+    assert len(scored) == len(source_rows)
+    assert scored[0]["transactionId"] == source_rows[0]["transactionId"]
+    assert len(scored[0]["top"]) == 2
+    assert scored[0]["category"] == scored[0]["top"][0]["category"]
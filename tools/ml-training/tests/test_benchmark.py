@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.benchmark import BenchmarkConfig, run_benchmark  # noqa: E402
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.model import TrainingConfig, train_model  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_benchmark_reports_runs_for_every_runtime_batch_and_session_option(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=20,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=71,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    report = run_benchmark(
+        BenchmarkConfig(
+            data_dir=data_dir,
+            artifact_dir=artifact_dir,
+            batch_sizes=(1, 64),
+            thread_counts=(1,),
+            optimization_levels=("disabled", "all"),
+            min_rows=64,
+            min_batches=2,
+            warmup_batches=1,
+        )
+    )
+
+    runs = [(run["runtime"], run["graph_optimization_level"], run["batch_size"]) for run in report["runs"]]
+    assert runs == [
+        ("sklearn", None, 1),
+        ("sklearn", None, 64),
+        ("onnx", "disabled", 1),
+        ("onnx", "disabled", 64),
+        ("onnx", "all", 1),
+        ("onnx", "all", 64),
+    ]
+    for run in report["runs"]:
+        assert run["rows_per_second"] > 0
+        assert run["per_row_latency_us"]["p99"] >= run["per_row_latency_us"]["p50"]
+    assert report["model_files"]["onnx_bytes"] > 0
+    saved = json.loads((artifact_dir / "benchmark.json").read_text(encoding="utf-8"))
+    assert len(saved["runs"]) == 6
@@ -179,3 +179,48 @@ def test_export_dataset_cli_smoke_writes_metadata(workspace_tmp: Path) -> None:
     assert "metadata:" in result.stdout
     assert (workspace_tmp / "train.csv").exists()
     assert (workspace_tmp / EXPORT_METADATA_FILENAME).exists()
+
+
+def test_parquet_export_has_typed_columns_and_loads_like_csv(workspace_tmp: Path) -> None:
+    pytest.importorskip("pandas")
+    pq = pytest.importorskip("pyarrow.parquet")
+    from ml_training.dataset import split_path
+    from ml_training.model import feature_frame, load_dataset
+
+    csv_dir = workspace_tmp / "csv"
+    parquet_dir = workspace_tmp / "parquet"
+    for output_dir, output_format in ((csv_dir, "csv"), (parquet_dir, "parquet")):
+        export_datasets(
+            DatasetExportConfig(
+                output_dir=output_dir,
+                dataset_profile="realistic",
+                train_size=120,
+                validation_size=40,
+                test_size=40,
+                users_per_split=10,
+                seed=13,
+                output_format=output_format,
+            )
+        )
+
+    train_path = split_path(parquet_dir, "train")
+    assert train_path.name == "train.parquet"
+    assert not (parquet_dir / "train.csv").exists()
+    schema = pq.read_schema(train_path)
+    assert schema.names == CSV_COLUMNS
+    assert str(schema.field("mccCode").type) == "string"
+    assert str(schema.field("amount").type) == "float"
+    assert schema.field("timestamp").type.tz == "UTC"
+
+    parquet_df = load_dataset(train_path)
+    csv_df = load_dataset(split_path(csv_dir, "train"))
+    assert list(parquet_df.columns) == ["amount", "description", "merchantName", "mccCode", "label"]
+    assert parquet_df["label"].tolist() == csv_df["label"].tolist()
+    parquet_features = feature_frame(parquet_df)
+    csv_features = feature_frame(csv_df)
+    assert parquet_features["text"].tolist() == csv_features["text"].tolist()
+    assert parquet_features["mccCode"].tolist() == csv_features["mccCode"].tolist()
+    assert parquet_features["amount"].to_numpy() == pytest.approx(csv_features["amount"].to_numpy(), abs=1e-5)
+
+    projected = load_dataset(train_path, columns=["amount", "label"])
+    assert list(projected.columns) == ["amount", "label"]
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training import model  # noqa: E402
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.evaluation import ConfidenceSketch, MetricsAccumulator, ParityTracker  # noqa: E402
+from ml_training.feature_cache import FeatureCacheConfig  # noqa: E402
+from ml_training.model import (  # noqa: E402
+    EvaluationConfig,
+    ParityConfig,
+    TrainingConfig,
+    evaluate_artifacts,
+    evaluate_predictions,
+    train_model,
+)
+from ml_training.parallel_evaluation import ParallelEvaluationConfig, evaluate_in_parallel  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_accumulated_metrics_match_full_list_metrics() -> None:
+    labels = ["A", "B", "C", "D"]
+    rng = np.random.default_rng(5)
+    y_true = rng.choice(labels + ["UNKNOWN"], size=997).tolist()
+    y_pred = rng.choice(labels[:3], size=997).tolist()
+    confidences = rng.random(997)
+
+    accumulator = MetricsAccumulator(labels)
+    for start in range(0, len(y_true), 100):
+        stop = start + 100
+        accumulator.update(
+            accumulator.label_indices(y_true[start:stop]),
+            accumulator.label_indices(y_pred[start:stop]),
+            confidences[start:stop],
+        )
+    accumulated = accumulator.metrics()
+    expected = evaluate_predictions(labels, y_true, y_pred, confidences.tolist())
+
+    for key in ("accuracy", "macro_f1", "weighted_f1", "expected_calibration_error"):
+        assert accumulated[key] == pytest.approx(expected[key])
+    assert accumulated["confusion_matrix"] == expected["confusion_matrix"]
+    for label in labels:
+        for key, value in expected["per_category"][label].items():
+            assert accumulated["per_category"][label][key] == pytest.approx(value)
+    for key in ("count", "below_0_70", "below_0_90"):
+        assert accumulated["confidence"][key] == expected["confidence"][key]
+    for key in ("mean", "min", "max"):
+        assert accumulated["confidence"][key] == pytest.approx(expected["confidence"][key])
+    for key, quantile in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        assert accumulated["confidence"][key] == pytest.approx(np.quantile(confidences, quantile), abs=2e-3)
+    assert sum(accumulated["confidence"]["histogram"]) == 997
+
+
+def test_confidence_sketch_merges_across_batches() -> None:
+    rng = np.random.default_rng(11)
+    confidences = rng.beta(5, 2, size=20000)
+    thresholds = (0.55, 0.7, 0.9, 0.97)
+
+    merged = ConfidenceSketch(thresholds)
+    for batch in np.array_split(confidences, 7):
+        merged.merge(ConfidenceSketch(thresholds).update(batch))
+    single = ConfidenceSketch(thresholds).update(confidences)
+
+    merged_summary = merged.summary()
+    single_summary = single.summary()
+    assert merged_summary["mean"] == pytest.approx(single_summary.pop("mean"))
+    assert {key: value for key, value in merged_summary.items() if key != "mean"} == single_summary
+    for threshold in thresholds:
+        assert merged.count_below(threshold) == int((confidences < threshold).sum())
+    for quantile in (0.01, 0.25, 0.5, 0.9, 0.999):
+        assert merged.quantile(quantile) == pytest.approx(np.quantile(confidences, quantile), abs=1e-3)
+    with pytest.raises(ValueError):
+        merged.merge(ConfidenceSketch((0.9,)))
+
+
+def test_chunked_evaluation_matches_single_chunk_and_spills_probabilities(workspace_tmp: Path, monkeypatch) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=16,
+            validation_per_category=4,
+            test_per_category=5,
+            users_per_split=8,
+            seed=67,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    single = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    chunked = evaluate_artifacts(
+        EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, chunk_size=7, save_probabilities=True)
+    )
+
+    for runtime in ("sklearn", "onnx"):
+        assert chunked[runtime]["confusion_matrix"] == single[runtime]["confusion_matrix"]
+        assert chunked[runtime]["macro_f1"] == pytest.approx(single[runtime]["macro_f1"])
+    probabilities = np.load(chunked["probability_files"]["onnx"], mmap_mode="r")
+    y_true = np.load(chunked["probability_files"]["y_true"], mmap_mode="r")
+    assert probabilities.shape == (45, len(chunked["onnx"]["labels"]))
+    assert probabilities.dtype == np.float32
+    assert y_true.shape == (45,)
+    accuracy = float((probabilities.argmax(axis=1) == y_true).mean())
+    assert accuracy == pytest.approx(chunked["onnx"]["accuracy"])
+    assert not list(artifact_dir.glob("*.part"))
+
+    calls = []
+    predict = model.predict_onnx_probabilities
+
+    def failing_predict(**kwargs):
+        calls.append(kwargs["model_path"])
+        if len(calls) > 2:
+            raise RuntimeError("session failed")
+        return predict(**kwargs)
+
+    monkeypatch.setattr(model, "predict_onnx_probabilities", failing_predict)
+    with pytest.raises(RuntimeError, match="session failed"):
+        evaluate_artifacts(
+            EvaluationConfig(
+                data_dir=data_dir, artifact_dir=artifact_dir, split="validation", chunk_size=7, save_probabilities=True
+            )
+        )
+    assert not list(artifact_dir.glob("*.part"))
+    assert not list(artifact_dir.glob("validation-*.npy"))
+    assert all(Path(path).exists() for path in chunked["probability_files"].values())
+
+
+def test_parallel_evaluation_covers_splits_and_extra_datasets(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    stress_dir = workspace_tmp / "stress"
+    artifact_dir = workspace_tmp / "artifacts"
+    for output_dir, seed in ((data_dir, 71), (stress_dir, 72)):
+        export_datasets(
+            DatasetExportConfig(
+                output_dir=output_dir,
+                dataset_profile="balanced",
+                split_strategy="mixed",
+                train_per_category=12,
+                validation_per_category=4,
+                test_per_category=4,
+                users_per_split=8,
+                seed=seed,
+            )
+        )
+    (stress_dir / "train.csv").unlink()
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    feature_cache = FeatureCacheConfig(cache_dir=workspace_tmp / "cache")
+    summary = evaluate_in_parallel(
+        ParallelEvaluationConfig(
+            artifact_dir=artifact_dir,
+            data_dirs=(data_dir, stress_dir),
+            workers=2,
+            save_probabilities=True,
+            feature_cache=feature_cache,
+        )
+    )
+    serial = evaluate_artifacts(EvaluationConfig(data_dir=stress_dir, artifact_dir=artifact_dir, split="test"))
+
+    assert summary["workers"] == 2
+    assert [(Path(item["data_dir"]).name, item["split"]) for item in summary["evaluations"]] == [
+        ("data", "train"),
+        ("data", "validation"),
+        ("data", "test"),
+        ("stress", "validation"),
+        ("stress", "test"),
+    ]
+    assert summary["skipped"] == [{"data_dir": str(stress_dir), "split": "train", "reason": "split file not found"}]
+    stress_test = summary["evaluations"][-1]
+    assert stress_test["onnx"]["accuracy"] == pytest.approx(serial["onnx"]["accuracy"])
+    assert stress_test["rows"] == 36
+    assert np.load(stress_test["probability_files"]["onnx"]).shape[0] == 36
+    assert any(feature_cache.cache_dir.iterdir())
+    assert Path(summary["summary_path"]).exists()
+
+
+
+def test_parallel_evaluation_survives_workers_evicting_each_others_cache_entries(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=12,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=73,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    feature_cache = FeatureCacheConfig(cache_dir=workspace_tmp / "cache", max_bytes=1)
+    runs = [
+        evaluate_in_parallel(
+            ParallelEvaluationConfig(
+                artifact_dir=artifact_dir,
+                data_dirs=(data_dir,),
+                workers=3,
+                chunk_size=12,
+                feature_cache=feature_cache,
+            )
+        )
+        for _ in range(2)
+    ]
+    serial = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, split="test"))
+
+    for summary in runs:
+        assert [item["split"] for item in summary["evaluations"]] == ["train", "validation", "test"]
+        assert summary["evaluations"][-1]["onnx"]["accuracy"] == pytest.approx(serial["onnx"]["accuracy"])
+    assert len([path for path in feature_cache.cache_dir.iterdir() if not path.name.startswith(".")]) <= 1
+
+def test_parity_tracker_keeps_worst_rows_across_chunks() -> None:
+    labels = ["A", "B", "C"]
+    rng = np.random.default_rng(13)
+    reference = rng.dirichlet(np.ones(3), size=500)
+    candidate = reference + rng.normal(scale=1e-6, size=reference.shape)
+    candidate[417] = reference[417][[1, 2, 0]]
+    candidate[42, 0] += 0.01
+
+    tracker = ParityTracker(labels, worst_rows=3)
+    for start in range(0, 500, 64):
+        rows = slice(start, start + 64)
+        tracker.update(reference[rows], candidate[rows], {"text": np.arange(500)[rows]})
+    report = tracker.report(max_probability_diff=1e-4, max_disagreement_rate=0.01)
+
+    assert report["rows"] == 500
+    assert report["argmax_disagreements"] == int((reference.argmax(axis=1) != candidate.argmax(axis=1)).sum())
+    assert report["max_abs_probability_diff"] == pytest.approx(np.abs(reference - candidate).max())
+    assert report["passed"] is False
+    assert [row["row"] for row in report["worst_rows"][:2]] == [417, 42]
+    assert report["worst_rows"][0]["argmax_disagrees"] is True
+    assert report["worst_rows"][0]["text"] == 417
+
+
+def test_evaluation_parity_mode_reports_sklearn_onnx_drift(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=12,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=73,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    result = evaluate_artifacts(
+        EvaluationConfig(
+            data_dir=data_dir,
+            artifact_dir=artifact_dir,
+            chunk_size=10,
+            parity=ParityConfig(max_probability_diff=0.05, worst_rows=5),
+        )
+    )
+
+    parity = result["parity"]
+    assert parity["rows"] == 36
+    assert parity["passed"] is True
+    assert parity["argmax_disagreement_rate"] == 0.0
+    assert parity["max_abs_probability_diff"] == parity["worst_rows"][0]["max_abs_probability_diff"]
+    assert len(parity["worst_rows"]) == 5
+    assert {"row", "label", "text", "mccCode", "reference_label", "candidate_label"} <= set(parity["worst_rows"][0])
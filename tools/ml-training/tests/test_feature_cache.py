@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training import feature_cache as feature_cache_module  # noqa: E402
+from ml_training import model  # noqa: E402
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.feature_cache import FeatureCacheConfig, cached_entry, evict_entries  # noqa: E402
+from ml_training.model import EvaluationConfig, PipelineConfig, TrainingConfig, evaluate_artifacts, train_model  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_cached_features_are_reused_by_training_and_evaluation(workspace_tmp: Path, monkeypatch) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    feature_cache = FeatureCacheConfig(cache_dir=workspace_tmp / "cache")
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=16,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=59,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    uncached = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir, feature_cache=feature_cache))
+    first = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, feature_cache=feature_cache))
+    assert len(list(feature_cache.cache_dir.iterdir())) == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("dataset should be served from the feature cache")
+
+    monkeypatch.setattr(model, "load_dataset", fail)
+    ignored_vocabulary = PipelineConfig(vocabulary_size=99)
+    train_model(
+        TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir, pipeline=ignored_vocabulary, feature_cache=feature_cache)
+    )
+    second = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, feature_cache=feature_cache))
+    chunked = evaluate_artifacts(
+        EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, feature_cache=feature_cache, chunk_size=10)
+    )
+    assert len(list(feature_cache.cache_dir.iterdir())) == 2 + 4
+
+    for result in (first, second, chunked):
+        assert result["sklearn"]["accuracy"] == uncached["sklearn"]["accuracy"]
+        assert result["onnx"]["accuracy"] == uncached["onnx"]["accuracy"]
+        assert result["onnx"]["confusion_matrix"] == uncached["onnx"]["confusion_matrix"]
+
+
+def test_feature_cache_evicts_least_recently_used_entries(workspace_tmp: Path) -> None:
+    feature_cache = FeatureCacheConfig(cache_dir=workspace_tmp / "cache", max_bytes=10**9)
+    for index, key in enumerate(("a", "b", "c")):
+        cached_entry(feature_cache, lambda key=key: key, lambda: {"x": np.zeros(1000, dtype=np.float64)})
+        os.utime(feature_cache.cache_dir / key, (index, index))
+    cached_entry(feature_cache, lambda: "a", lambda: pytest.fail("entry a should be cached"))
+
+    evicted = evict_entries(FeatureCacheConfig(cache_dir=feature_cache.cache_dir, max_bytes=20000))
+
+    assert evicted == ["b"]
+    assert sorted(path.name for path in feature_cache.cache_dir.iterdir()) == ["a", "c"]
+
+
+def test_feature_cache_treats_entries_evicted_mid_read_as_misses(workspace_tmp: Path, monkeypatch) -> None:
+    feature_cache = FeatureCacheConfig(cache_dir=workspace_tmp / "cache", max_bytes=10**9)
+
+    def build():
+        return {"x": np.zeros(1000, dtype=np.float64), "y": np.ones(1000, dtype=np.float64)}
+
+    cached_entry(feature_cache, lambda: "a", build)
+    load = np.load
+
+    def evicting_load(path, *args, **kwargs):
+        evict_entries(FeatureCacheConfig(cache_dir=feature_cache.cache_dir, max_bytes=1))
+        return load(path, *args, **kwargs)
+
+    monkeypatch.setattr(feature_cache_module.np, "load", evicting_load)
+    entry = cached_entry(feature_cache, lambda: "a", build)
+    monkeypatch.setattr(feature_cache_module.np, "load", load)
+
+    assert set(entry) == {"x", "y"}
+    cached = cached_entry(feature_cache, lambda: "a", lambda: pytest.fail("entry a should be cached again"))
+    assert np.array_equal(cached["y"], build()["y"])
+    assert [path.name for path in feature_cache.cache_dir.iterdir()] == ["a"]
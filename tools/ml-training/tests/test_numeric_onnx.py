@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+pytest.importorskip("pandas")
+joblib = pytest.importorskip("joblib")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+from sklearn.feature_extraction.text import CountVectorizer  # noqa: E402
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.dataset import DatasetExportConfig, export_datasets, split_path  # noqa: E402
+from ml_training.model import (  # noqa: E402
+    MISSING_MCC_TOKEN,
+    EvaluationConfig,
+    PipelineConfig,
+    TrainingConfig,
+    evaluate_artifacts,
+    feature_frame,
+    load_dataset,
+    load_labels,
+    predict_onnx_probabilities,
+    train_model,
+)
+from ml_training.numeric_onnx import (  # noqa: E402
+    NUMERIC_FEATURES_FILENAME,
+    NUMERIC_ONNX_MODEL_FILENAME,
+    analyze_text,
+    load_numeric_feature_spec,
+    numeric_feed,
+    numeric_feature_spec,
+    text_term_counts,
+)
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def export_small_dataset(path: Path, seed: int) -> None:
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=path,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=12,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=seed,
+        )
+    )
+
+
+def test_reference_preprocessing_matches_fitted_vectorizer(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_small_dataset(data_dir, seed=89)
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir, numeric_onnx=True))
+    pipeline = joblib.load(artifact_dir / "sklearn-pipeline.joblib")
+    vectorizer = pipeline.named_steps["features"].named_transformers_["text"]
+    analyzer = vectorizer.build_analyzer()
+
+    spec = load_numeric_feature_spec(artifact_dir / NUMERIC_FEATURES_FILENAME)
+    assert spec == numeric_feature_spec(pipeline)
+    texts = [
+        *feature_frame(load_dataset(split_path(data_dir, "test")))["text"],
+        "UBER *TRIP  Uber-Eats",
+        "Пятёрочка ПРОДУКТЫ 24/7",
+        "café_bar a b c",
+        "",
+    ]
+    counts = CountVectorizer(
+        vocabulary=vectorizer.vocabulary_,
+        ngram_range=vectorizer.ngram_range,
+        token_pattern=vectorizer.token_pattern,
+    ).transform(texts)
+    for row, text in enumerate(texts):
+        assert sorted(analyze_text(spec, text)) == sorted(analyzer(text))
+        expected = counts[row].tocoo()
+        assert text_term_counts(spec, text) == dict(sorted(zip(expected.col.tolist(), expected.data.tolist())))
+
+    mcc_codes = ["5812"] * len(texts)
+    mcc_codes[:2] = [MISSING_MCC_TOKEN, "not-a-code"]
+    feed = numeric_feed(spec, texts, mcc_codes, np.zeros(len(texts)))
+    assert feed["text_indices"].shape == feed["text_counts"].shape
+    assert feed["text_indices"][-1].tolist() == [spec.text_padding_index] * feed["text_indices"].shape[1]
+    assert feed["mcc_index"][0, 0] == spec.mcc_categories.index(MISSING_MCC_TOKEN)
+    assert feed["mcc_index"][1, 0] == spec.mcc_unknown_index
+
+
+def test_numeric_onnx_variant_matches_sklearn_probabilities(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_small_dataset(data_dir, seed=97)
+    result = train_model(
+        TrainingConfig(
+            data_dir=data_dir,
+            artifact_dir=artifact_dir,
+            numeric_onnx=True,
+            pipeline=PipelineConfig(sublinear_tf=True, ngram_range=(1, 2)),
+        )
+    )
+
+    assert Path(result["onnx_numeric_model_path"]).name == NUMERIC_ONNX_MODEL_FILENAME
+    metadata = json.loads((artifact_dir / "metadata.json").read_text(encoding="utf-8"))
+    assert metadata["numeric_features"] == NUMERIC_FEATURES_FILENAME
+    features = feature_frame(load_dataset(split_path(data_dir, "test")))
+    labels = load_labels(artifact_dir / "labels.json")
+    expected = joblib.load(artifact_dir / "sklearn-pipeline.joblib").predict_proba(features)
+    actual = predict_onnx_probabilities(artifact_dir / NUMERIC_ONNX_MODEL_FILENAME, features, labels)
+    assert np.abs(actual - expected).max() < 1e-5
+
+    evaluation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, chunk_size=7))
+    numeric = evaluation["onnx_variants"]["numeric"]
+    assert numeric["accuracy"] == pytest.approx(evaluation["sklearn"]["accuracy"])
+    assert numeric["model_bytes"] > 0
+
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    assert not (artifact_dir / NUMERIC_ONNX_MODEL_FILENAME).exists()
+    assert not (artifact_dir / NUMERIC_FEATURES_FILENAME).exists()
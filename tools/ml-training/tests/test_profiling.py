@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.model import TrainingConfig, train_model  # noqa: E402
+from ml_training.profiling import PROFILE_STAGES, ProfileConfig, profile_onnx  # noqa: E402
+from ml_training.sessions import cached_session_count, clear_session_cache  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_onnx_profile_attributes_operator_time_to_rows(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=12,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=83,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    clear_session_cache()
+
+    report = profile_onnx(
+        ProfileConfig(data_dir=data_dir, artifact_dir=artifact_dir, max_rows=25, warmup_rows=3, slowest_rows=5)
+    )
+
+    assert report["rows"] == 25
+    assert cached_session_count() == 0
+    op_types = {operator["op_type"] for operator in report["operators"]}
+    assert {"Tokenizer", "TfIdfVectorizer", "LinearClassifier"} <= op_types
+    assert sum(report["stages"][stage]["share"] for stage in PROFILE_STAGES) == pytest.approx(1.0)
+    assert report["stages"]["tokenizer"]["total_us"] > 0
+    assert sum(bucket["rows"] for bucket in report["by_text_length"]) == 25
+    assert sum(bucket["rows"] for bucket in report["by_token_count"]) == 25
+    slowest = [row["latency_us"] for row in report["slowest_rows"]]
+    assert len(slowest) == 5
+    assert slowest == sorted(slowest, reverse=True)
+    assert slowest[0] == pytest.approx(report["latency_us"]["max"])
+    trace = json.loads(Path(report["trace_path"]).read_text(encoding="utf-8"))
+    assert sum(event.get("name") == "model_run" for event in trace) == 28
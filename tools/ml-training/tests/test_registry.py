@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training import registry  # noqa: E402
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.feature_cache import FeatureCacheConfig, file_digest  # noqa: E402
+from ml_training.model import TrainingConfig  # noqa: E402
+from ml_training.registry import (  # noqa: E402
+    RegistryConfig,
+    list_models,
+    promote_model,
+    registry_summary,
+    rollback_model,
+    train_registered_model,
+)
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_registry_reuses_identical_builds_and_promotes_with_rollback(workspace_tmp: Path, monkeypatch) -> None:
+    data_dir = workspace_tmp / "data"
+    registry_config = RegistryConfig(registry_dir=workspace_tmp / "registry")
+    service_dir = workspace_tmp / "service"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=12,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=101,
+        )
+    )
+    plain = TrainingConfig(data_dir=data_dir, artifact_dir=workspace_tmp / "plain")
+    calibrated = TrainingConfig(data_dir=data_dir, artifact_dir=workspace_tmp / "calibrated", calibration="temperature")
+
+    first = train_registered_model(plain, registry_config)
+    second = train_registered_model(calibrated, registry_config)
+    assert not first["reused"] and not second["reused"]
+    assert first["registry_key"] != second["registry_key"]
+    summary = registry_summary(registry_config.registry_dir)
+    assert summary["models"] == 2
+    assert summary["blobs"] < 11
+    assert summary["blob_bytes"] < summary["artifact_bytes"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("an identical build should be served from the registry")
+
+    monkeypatch.setattr(registry, "train_model", fail)
+    reused_dir = workspace_tmp / "reused"
+    feature_cache = FeatureCacheConfig(cache_dir=workspace_tmp / "cache")
+    reused = train_registered_model(
+        TrainingConfig(data_dir=data_dir, artifact_dir=reused_dir, feature_cache=feature_cache), registry_config
+    )
+    assert reused["reused"]
+    assert reused["registry_key"] == first["registry_key"]
+    assert set(reused) == set(first)
+    for name in ("sklearn_model_path", "onnx_model_path", "labels_path", "metadata_path"):
+        assert Path(reused[name]).parent == reused_dir
+        assert file_digest(Path(reused[name])) == file_digest(Path(first[name]))
+
+    promote_model(registry_config.registry_dir, first["registry_key"][:12], service_dir)
+    promote_model(registry_config.registry_dir, second["registry_key"], service_dir)
+    assert (service_dir / "calibration.json").exists()
+    assert [model["promoted"] for model in list_models(registry_config.registry_dir)] == [False, True]
+
+    manifest = rollback_model(registry_config.registry_dir, service_dir)
+    assert manifest["key"] == first["registry_key"]
+    assert not (service_dir / "calibration.json").exists()
+    assert file_digest(service_dir / "transaction-classifier.onnx") == file_digest(Path(first["onnx_model_path"]))
+    with pytest.raises(ValueError, match="No earlier promoted model"):
+        rollback_model(registry_config.registry_dir, service_dir)
+
+    listing = subprocess.run(
+        [sys.executable, str(ML_TRAINING_DIR / "registry.py"), "--registry-dir", str(registry_config.registry_dir), "list"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert f"* {first['registry_key'][:16]}" in listing.stdout
+    assert "storage: " in listing.stdout
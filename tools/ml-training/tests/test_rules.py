@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.hybrid import HybridEvaluationConfig, evaluate_hybrid  # noqa: E402
+from ml_training.model import TrainingConfig, train_model  # noqa: E402
+from ml_training.paths import RULES_PATH  # noqa: E402
+from ml_training.rules import RuleConfidence, RuleSet, classify_rules, load_rule_set, normalize_text  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def engine_rule_set() -> RuleSet:
+    return RuleSet(
+        mcc_rules={"5812": "FOOD_AND_DRINKS", "4111": "TRANSPORT", "5411": "GROCERIES"},
+        keyword_rules={
+            "FOOD_AND_DRINKS": ("coffee", "restaurant"),
+            "TRANSPORT": ("taxi", "metro", "train"),
+            "RETAIL_SHOPPING": ("store", "marketplace"),
+            "GROCERIES": ("grocery", "supermarket"),
+        },
+        keyword_priority=("FOOD_AND_DRINKS", "TRANSPORT", "GROCERIES", "RETAIL_SHOPPING"),
+        confidence=RuleConfidence(0.95, 0.75, 0.85, 0.05, 0.07, 0.55, 0.99),
+    )
+
+
+def test_normalize_text_matches_classifier_service() -> None:
+    assert normalize_text("  STARBUCKS.Coffee!!!   SHOP ") == "starbucks coffee shop"
+    assert normalize_text(None) == ""
+    assert normalize_text("   ") == ""
+
+
+def test_classify_rules_matches_rule_engine() -> None:
+    cases = [
+        ("coffee", "5812", "FOOD_AND_DRINKS", 0.99),
+        ("unknown merchant", "5812", "FOOD_AND_DRINKS", 0.75),
+        ("taxi metro", "5812", "FOOD_AND_DRINKS", 0.61),
+        ("taxi metro train", "5812", "FOOD_AND_DRINKS", 0.55),
+        ("taxi metro", None, "TRANSPORT", 0.95),
+        ("coffee taxi", None, "FOOD_AND_DRINKS", 0.90),
+        ("unknown merchant", None, "UNDEFINED", 0.0),
+    ]
+
+    categories, confidences = classify_rules(
+        engine_rule_set(),
+        descriptions=[case[0] for case in cases],
+        merchant_names=[None] * len(cases),
+        mcc_codes=[case[1] for case in cases],
+    )
+
+    assert categories.tolist() == [case[2] for case in cases]
+    assert confidences.tolist() == pytest.approx([case[3] for case in cases])
+
+
+def test_load_rule_set_reads_service_rules() -> None:
+    rule_set = load_rule_set(RULES_PATH)
+
+    assert rule_set.mcc_rules
+    assert rule_set.keyword_priority
+    assert all(word == normalize_text(word) for words in rule_set.keyword_rules.values() for word in words)
+    assert rule_set.confidence.mcc_min <= rule_set.confidence.mcc_base_unconfirmed <= rule_set.confidence.max
+
+
+def test_load_rule_set_rejects_unknown_categories(workspace_tmp: Path) -> None:
+    rules_path = workspace_tmp / "rules.yaml"
+    confidence = "\n".join(
+        f"  {name}: 0.5" for name in ("mcc_base_confirmed", "mcc_base_unconfirmed", "keyword_base", "mcc_min", "max")
+    )
+    rules_path.write_text(f"confidence:\n{confidence}\nmcc:\n  '5812': food_and_drink\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Unsupported category 'food_and_drink' for: mcc.5812"):
+        load_rule_set(rules_path)
+    corrected = rules_path.read_text(encoding="utf-8").replace("food_and_drink", "food_and_drinks")
+    rules_path.write_text(corrected, encoding="utf-8")
+    assert load_rule_set(rules_path).mcc_rules == {"5812": "FOOD_AND_DRINKS"}
+
+
+def test_hybrid_evaluation_routes_between_rules_ml_and_llm(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=12,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=79,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    report = evaluate_hybrid(HybridEvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, chunk_size=10))
+
+    strategies = report["strategies"]
+    rows = strategies["rule"]["routing"]["rows"]
+    assert rows == 36
+    for strategy in ("rule", "ml", "hybrid"):
+        routing = strategies[strategy]["routing"]
+        assert routing["auto_accepted"] + routing["llm_calls"] == rows
+    sources = strategies["hybrid"]["routing"]["sources"]
+    assert sum(sources.values()) == rows
+    assert sources["LLM"] == strategies["hybrid"]["routing"]["llm_calls"]
+    assert strategies["hybrid"]["routing"]["auto_accepted"] >= max(
+        strategies["rule"]["routing"]["auto_accepted"],
+        strategies["ml"]["routing"]["auto_accepted"],
+    )
+    assert 0.0 <= report["rule_ml_agreement"] <= 1.0
+    assert json.loads(Path(report["report_path"]).read_text(encoding="utf-8"))["primary"] == "rule"
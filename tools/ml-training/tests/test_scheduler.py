@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.scheduler import BatchScheduler, SchedulerConfig, ThreadedBatchScheduler  # noqa: E402
+
+
+def test_batch_scheduler_coalesces_requests_and_reports_metrics() -> None:
+    batch_sizes = []
+
+    def run_batch(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        config = SchedulerConfig(max_batch_size=4, max_wait_ms=200, latency_slo_ms=10_000)
+        async with BatchScheduler(run_batch, config) as scheduler:
+            results = await asyncio.gather(*(scheduler.submit(value) for value in range(6)))
+            return results, scheduler.metrics()
+
+    results, metrics = asyncio.run(scenario())
+
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert batch_sizes == [4, 2]
+    assert metrics["requests"] == 6
+    assert metrics["batches"] == 2
+    assert metrics["queue_depth"] == 0
+    assert metrics["batch_size_histogram"] == {"2": 1, "4": 1}
+    assert metrics["latency_ms"]["samples"] == 6
+    assert metrics["latency_ms"]["p99"] >= metrics["latency_ms"]["p50"] > 0.0
+    assert metrics["slo_violations"] == 0
+
+
+def test_batch_scheduler_propagates_batch_errors_to_every_future() -> None:
+    def run_batch(items):
+        raise RuntimeError("session failed")
+
+    scheduler = ThreadedBatchScheduler(run_batch, SchedulerConfig(max_batch_size=8, max_wait_ms=50))
+    try:
+        futures = scheduler.submit(["a", "b"])
+        for future in futures:
+            with pytest.raises(RuntimeError, match="session failed"):
+                future.result(timeout=5)
+        assert scheduler.metrics()["requests"] == 2
+    finally:
+        scheduler.close()
+
+
+def test_batch_scheduler_fails_every_future_when_results_are_short() -> None:
+    def run_batch(items):
+        return items[:-1]
+
+    scheduler = ThreadedBatchScheduler(run_batch, SchedulerConfig(max_batch_size=8, max_wait_ms=50))
+    try:
+        futures = scheduler.submit(["a", "b", "c"])
+        for future in futures:
+            with pytest.raises(RuntimeError, match=r"run_batch returned \d+ results for \d+ requests"):
+                future.result(timeout=5)
+    finally:
+        scheduler.close()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.model import TrainingConfig, predict_onnx_scores, train_model  # noqa: E402
+from ml_training.serving import ScoringServer, ServingConfig  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def post_json(url: str, document: object) -> tuple[int, object]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(document).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_scoring_server_classifies_single_and_batch_requests(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=30,
+            validation_per_category=6,
+            test_per_category=6,
+            users_per_split=12,
+            seed=61,
+        )
+    )
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+
+    server = ScoringServer(ServingConfig(artifact_dir=artifact_dir, port=0, batch_window_ms=2.0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    taxi = {
+        "transactionId": "00000000-0000-0000-0000-000000000001",
+        "amount": 900,
+        "description": "taxi ride",
+        "merchantName": "Yandex Taxi",
+        "mccCode": "4121",
+    }
+    grocery = {
+        "transactionId": "00000000-0000-0000-0000-000000000002",
+        "amount": 350,
+        "description": "grocery delivery samokat",
+        "merchantName": "Samokat",
+        "mccCode": None,
+    }
+    try:
+        single_status, single = post_json(f"{base_url}/api/classify", taxi)
+        batch_status, batch = post_json(f"{base_url}/classify", [taxi, grocery])
+        invalid_status, invalid = post_json(f"{base_url}/classify", {"amount": 10})
+        with urllib.request.urlopen(f"{base_url}/metrics", timeout=10) as response:
+            metrics = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    expected = predict_onnx_scores(
+        model_path=artifact_dir / "transaction-classifier.onnx",
+        labels_path=artifact_dir / "labels.json",
+        amount=900,
+        description="taxi ride",
+        merchant_name="Yandex Taxi",
+        mcc_code="4121",
+    )
+    assert single_status == 200
+    assert single["transactionId"] == taxi["transactionId"]
+    assert single["category"] == expected[0][0]
+    assert single["confidence"] == pytest.approx(expected[0][1], abs=1e-6)
+    assert single["source"] == "ML"
+    assert batch_status == 200
+    assert [item["transactionId"] for item in batch] == [taxi["transactionId"], grocery["transactionId"]]
+    assert invalid_status == 400
+    assert invalid["message"] == "transactionId must not be null"
+    assert metrics["requests"] == 3
+    assert metrics["queue_depth"] == 0
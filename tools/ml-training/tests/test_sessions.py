@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.sessions import (  # noqa: E402
+    SessionConfig,
+    cached_session_count,
+    clear_session_cache,
+    get_session,
+)
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    clear_session_cache()
+    try:
+        yield root
+    finally:
+        clear_session_cache()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def write_identity_model(path: Path) -> None:
+    from onnx import TensorProto, helper
+
+    graph = helper.make_graph(
+        [helper.make_node("Identity", ["amount"], ["output"])],
+        "identity",
+        [helper.make_tensor_value_info("amount", TensorProto.FLOAT, [None, 1])],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, [None, 1])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 15)], ir_version=8)
+    path.write_bytes(model.SerializeToString())
+
+
+def test_get_session_reuses_warm_session_until_model_file_changes(workspace_tmp: Path) -> None:
+    model_path = workspace_tmp / "model.onnx"
+    write_identity_model(model_path)
+
+    first = get_session(model_path)
+    second = get_session(model_path)
+    tuned = get_session(model_path, SessionConfig(intra_op_num_threads=1, graph_optimization_level="basic"))
+
+    assert first is second
+    assert tuned is not first
+    assert cached_session_count() == 2
+
+    stat = model_path.stat()
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = get_session(model_path)
+
+    assert reloaded is not first
+    assert cached_session_count() == 1
+
+
+def test_get_session_rejects_invalid_config(workspace_tmp: Path) -> None:
+    model_path = workspace_tmp / "model.onnx"
+    write_identity_model(model_path)
+
+    with pytest.raises(ValueError):
+        get_session(model_path, SessionConfig(graph_optimization_level="fast"))
+    with pytest.raises(ValueError):
+        get_session(model_path, SessionConfig(intra_op_num_threads=-1))
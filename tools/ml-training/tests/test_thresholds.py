@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import csv
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.model import write_json  # noqa: E402
+from ml_training.thresholds import (  # noqa: E402
+    ALL_CATEGORIES,
+    ThresholdReportConfig,
+    ThresholdSweep,
+    build_threshold_report,
+    threshold_grid,
+)
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def random_predictions(rows: int, labels: int, seed: int):
+    rng = np.random.default_rng(seed)
+    probabilities = rng.dirichlet(np.full(labels, 0.3), size=rows).astype(np.float32)
+    true_indices = np.where(
+        rng.random(rows) < 0.7,
+        probabilities.argmax(axis=1),
+        rng.integers(-1, labels, size=rows),
+    )
+    return probabilities, true_indices
+
+
+def test_threshold_sweep_matches_per_threshold_loop() -> None:
+    labels = ["A", "B", "C"]
+    probabilities, true_indices = random_predictions(3001, len(labels), seed=3)
+    thresholds = threshold_grid(0.05)
+
+    sweep = ThresholdSweep(labels, thresholds)
+    for start in range(0, len(true_indices), 400):
+        batch = slice(start, start + 400)
+        sweep.merge(ThresholdSweep(labels, thresholds).update(probabilities[batch], true_indices[batch]))
+    curves = sweep.curves()
+
+    confidences = probabilities.max(axis=1).astype(np.float64)
+    predicted = probabilities.argmax(axis=1)
+    correct = predicted == true_indices
+    for row in curves[ALL_CATEGORIES]:
+        accepted = confidences >= row["threshold"]
+        assert row["rows"] == len(true_indices)
+        assert row["accepted"] == int(accepted.sum())
+        assert row["llm_calls"] == int((~accepted).sum())
+        if accepted.any():
+            assert row["accepted_accuracy"] == pytest.approx(correct[accepted].mean())
+    for index, label in enumerate(labels):
+        for row in curves[label]:
+            accepted = confidences >= row["threshold"]
+            own = true_indices == index
+            predicted_own = accepted & (predicted == index)
+            assert row["rows"] == int(own.sum())
+            assert row["accepted"] == int((accepted & own).sum())
+            if predicted_own.any():
+                assert row["accepted_precision"] == pytest.approx(correct[predicted_own].mean())
+
+
+def test_threshold_report_reads_spilled_probabilities(workspace_tmp: Path) -> None:
+    labels = ["FOOD", "TRANSPORT", "UNDEFINED"]
+    probabilities, true_indices = random_predictions(500, len(labels), seed=8)
+    artifact_dir = workspace_tmp / "artifacts"
+    data_dir = workspace_tmp / "data"
+    write_json(artifact_dir / "labels.json", {"labels": labels})
+    np.save(artifact_dir / "test-evaluation-data-onnx-probabilities.npy", probabilities)
+    np.save(artifact_dir / "test-evaluation-data-y-true.npy", true_indices.astype(np.int16))
+
+    report = build_threshold_report(
+        ThresholdReportConfig(data_dir=data_dir, artifact_dir=artifact_dir, chunk_size=64, accuracy_targets=(0.8, 1.0))
+    )
+
+    assert report["source"]["probabilities"].endswith("test-evaluation-data-onnx-probabilities.npy")
+    assert report["rows"] == 500
+    assert report["current"]["threshold"] == pytest.approx(0.9)
+    fallback = [row["fallback_fraction"] for row in report["overall"]]
+    assert fallback == sorted(fallback)
+    low, high = report["recommendations"]
+    assert low["accepted_accuracy"] >= 0.8
+    assert high["threshold"] is None or high["accepted_accuracy"] == 1.0
+    assert set(report["per_category"]) == set(labels)
+    with Path(report["csv_path"]).open(encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == len(report["overall"]) * (len(labels) + 1)
+    assert {row["category"] for row in rows} == {ALL_CATEGORIES, *labels}
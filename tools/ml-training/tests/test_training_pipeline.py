@@ -10,6 +10,7 @@ import pytest
 
 
 pd = pytest.importorskip("pandas")
+joblib = pytest.importorskip("joblib")
 pytest.importorskip("sklearn")
 pytest.importorskip("skl2onnx")
 pytest.importorskip("onnxruntime")
@@ -22,15 +23,22 @@ if str(ML_TRAINING_DIR) not in sys.path:
 from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
 from ml_training.model import (  # noqa: E402
     AMOUNT_CLIP_MAX,
+    BOUNDED_TFIDF_MODEL_TYPE,
     EvaluationConfig,
+    PipelineConfig,
+    StreamingConfig,
     TrainingConfig,
     evaluate_artifacts,
     feature_frame,
+    load_dataset,
     load_labels,
     predict_onnx_scores,
     predict_sklearn_scores,
+    records_feature_arrays,
     train_model,
+    transaction_features,
 )
+from ml_training.pruning import nonzero_text_terms, text_vocabulary  # noqa: E402
 
 
 EXPECTED_LABELS = [
@@ -133,6 +141,37 @@ def test_feature_frame_clips_and_log_scales_amount_outliers() -> None:
     assert features["amount"].iloc[2] == pytest.approx(-10.819798, abs=1e-6)
 
 
+def test_feature_arrays_match_feature_frame_exactly(workspace_tmp: Path) -> None:
+    np = pytest.importorskip("numpy")
+    edge_records = [
+        {"amount": 50, "description": "coffee", "merchantName": "Starbucks", "mccCode": "5812"},
+        {"amount": "350.50", "description": " taxi ", "merchantName": None, "mccCode": None},
+        {"amount": None, "description": None, "merchantName": "  ", "mccCode": ""},
+        {"amount": "not-a-number", "description": "", "merchantName": "", "mccCode": 5411},
+        {"amount": -353303, "description": "refund", "merchantName": "Ozon", "mccCode": float("nan")},
+        {"amount": 1e12, "description": 42, "merchantName": "Магнит", "mccCode": "  "},
+        {"amount": "nan", "description": "fee", "merchantName": "", "mccCode": "6012"},
+        {"amount": "inf", "description": "", "merchantName": "Lenta", "mccCode": "5411"},
+        {"amount": "-inf", "description": "chargeback", "merchantName": "", "mccCode": None},
+    ]
+    export_small_balanced_mixed_dataset(workspace_tmp / "data", seed=17)
+    dataset = load_dataset(workspace_tmp / "data" / "test.csv")
+    dataset_records = dataset[["amount", "description", "merchantName", "mccCode"]].to_dict("records")
+
+    for records in (edge_records, dataset_records):
+        expected = feature_frame(pd.DataFrame(records))
+        actual = records_feature_arrays(records)
+
+        assert actual["text"].tolist() == expected["text"].tolist()
+        assert actual["mccCode"].tolist() == expected["mccCode"].tolist()
+        assert actual["amount"].dtype == np.float32
+        assert np.array_equal(actual["amount"], expected["amount"].to_numpy())
+
+    single = transaction_features(amount=350, description="coffee", merchant_name="", mcc_code="")
+    assert single["text"].tolist() == ["coffee"]
+    assert single["mccCode"].tolist() == ["__MISSING_MCC__"]
+
+
 def test_high_amount_outlier_does_not_override_obvious_transport_signal(workspace_tmp: Path) -> None:
     data_dir = workspace_tmp / "data"
     artifact_dir = workspace_tmp / "artifacts"
@@ -251,6 +290,223 @@ def test_evaluate_artifacts_records_unique_dataset_specific_reports(workspace_tm
     assert onnx_gap <= 0.08
 
 
+def test_optimized_and_quantized_onnx_variants_are_evaluated(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_small_balanced_mixed_dataset(data_dir, seed=27)
+
+    result = train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir, optimize_onnx=True))
+    evaluation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, split="test"))
+
+    assert Path(result["onnx_optimized_model_path"]).exists()
+    assert Path(result["onnx_int8_model_path"]).exists()
+    model_metadata = json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8"))
+    assert set(model_metadata["onnx_variants"]) == {"optimized", "int8"}
+
+    variants = evaluation["onnx_variants"]
+    assert variants["optimized"]["accuracy_delta"] == pytest.approx(0.0, abs=1e-9)
+    assert variants["int8"]["model_bytes"] < evaluation["onnx"]["model_bytes"]
+    assert abs(variants["int8"]["macro_f1_delta"]) <= 0.03
+    assert variants["int8"]["max_probability_diff"] < 0.1
+
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    assert not (artifact_dir / "transaction-classifier.int8.onnx").exists()
+
+
+def test_bounded_vocabulary_model_type_caps_artifact_size(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    unbounded_dir = workspace_tmp / "unbounded"
+    bounded_dir = workspace_tmp / "bounded"
+    export_small_realistic_dataset(data_dir, seed=37)
+
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=unbounded_dir))
+    result = train_model(
+        TrainingConfig(
+            data_dir=data_dir,
+            artifact_dir=bounded_dir,
+            pipeline=PipelineConfig(model_type=BOUNDED_TFIDF_MODEL_TYPE, vocabulary_size=64),
+        )
+    )
+    evaluation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=bounded_dir, split="test"))
+
+    model_metadata = json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8"))
+    assert model_metadata["model_type"] == BOUNDED_TFIDF_MODEL_TYPE
+    assert model_metadata["text_vocabulary_size"] == 64
+    unbounded_metadata = json.loads((unbounded_dir / "metadata.json").read_text(encoding="utf-8"))
+    assert unbounded_metadata["text_vocabulary_size"] > 64
+    for filename in ("transaction-classifier.onnx", "sklearn-pipeline.joblib"):
+        assert (bounded_dir / filename).stat().st_size < (unbounded_dir / filename).stat().st_size
+    assert evaluation["onnx"]["accuracy"] == pytest.approx(evaluation["sklearn"]["accuracy"])
+
+
+def test_elasticnet_pruning_shrinks_vocabulary_and_keeps_quality(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    dense_dir = workspace_tmp / "dense"
+    sparse_dir = workspace_tmp / "sparse"
+    export_small_realistic_dataset(data_dir, seed=43)
+    sparse = PipelineConfig(
+        penalty="elasticnet", l1_ratio=0.5, solver="saga", c=4.0, max_iter=5000, prune_vocabulary=True
+    )
+
+    with pytest.raises(ValueError, match="requires solver"):
+        train_model(TrainingConfig(data_dir=data_dir, artifact_dir=sparse_dir, pipeline=PipelineConfig(penalty="l1")))
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=dense_dir))
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=sparse_dir, pipeline=sparse))
+    dense = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=dense_dir))
+    evaluation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=sparse_dir))
+
+    metadata = json.loads((sparse_dir / "metadata.json").read_text(encoding="utf-8"))
+    pruning = metadata["pruning"]
+    assert pruning["rounds"] >= 1
+    assert pruning["text_vocabulary_before"] == dense["model"]["text_vocabulary_size"]
+    assert pruning["text_vocabulary_after"] == metadata["text_vocabulary_size"] < pruning["text_vocabulary_before"]
+    assert evaluation["model"]["pruning"] == pruning
+    assert dense["model"]["pruning"] is None
+    assert evaluation["model"]["onnx_bytes"] < dense["model"]["onnx_bytes"]
+    assert evaluation["model"]["nonzero_coefficients"] < dense["model"]["nonzero_coefficients"]
+
+    pipeline = joblib.load(sparse_dir / "sklearn-pipeline.joblib")
+    vocabulary = text_vocabulary(pipeline)
+    assert nonzero_text_terms(pipeline).size == len(vocabulary)
+    assert all(token in vocabulary for term in vocabulary for token in term.split(" "))
+    assert evaluation["onnx"]["accuracy"] == pytest.approx(evaluation["sklearn"]["accuracy"])
+    assert evaluation["sklearn"]["macro_f1"] >= dense["sklearn"]["macro_f1"] - 0.05
+
+
+def test_footprint_is_recorded_and_compared_with_previous_build(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_small_realistic_dataset(data_dir, seed=41)
+    bounded = PipelineConfig(model_type=BOUNDED_TFIDF_MODEL_TYPE, vocabulary_size=32)
+
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir, pipeline=bounded))
+    first = json.loads((artifact_dir / "metadata.json").read_text(encoding="utf-8"))
+    footprint = first["footprint"]
+    assert footprint["text_vocabulary_size"] == 32
+    assert footprint["onnx_bytes"] == (artifact_dir / "transaction-classifier.onnx").stat().st_size
+    assert 0 < footprint["nonzero_coefficients"] <= footprint["coefficients"]
+    assert footprint["session_seconds"] > 0
+    assert footprint["first_inference_ms"] > 0
+    assert first["footprint_comparison"] == {"baseline": None, "deltas": {}, "regressions": []}
+
+    with pytest.warns(RuntimeWarning) as warnings:
+        train_model(TrainingConfig(data_dir=data_dir, artifact_dir=artifact_dir))
+    assert any("onnx_bytes grew" in str(warning.message) for warning in warnings)
+    second = json.loads((artifact_dir / "metadata.json").read_text(encoding="utf-8"))
+    comparison = second["footprint_comparison"]
+    assert comparison["baseline"] == str(artifact_dir)
+    assert comparison["deltas"]["text_vocabulary_size"]["previous"] == 32
+    assert any(regression.startswith("text_vocabulary_size grew") for regression in comparison["regressions"])
+
+
+def test_streaming_training_exports_onnx_matching_sklearn(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    artifact_dir = workspace_tmp / "artifacts"
+    export_small_balanced_mixed_dataset(data_dir, seed=47)
+
+    result = train_model(
+        TrainingConfig(
+            data_dir=data_dir,
+            artifact_dir=artifact_dir,
+            optimize_onnx=True,
+            pipeline=PipelineConfig(vocabulary_size=200),
+            streaming=StreamingConfig(chunk_size=25, epochs=5),
+        )
+    )
+    evaluation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, split="test"))
+
+    model_metadata = json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8"))
+    assert model_metadata["model_type"] == "streaming_tfidf_sgd"
+    assert model_metadata["streaming"]["chunk_size"] == 25
+    assert model_metadata["text_vocabulary_size"] <= 200
+    assert load_labels(Path(result["labels_path"])) == EXPECTED_LABELS
+    assert evaluation["onnx"]["accuracy"] == pytest.approx(evaluation["sklearn"]["accuracy"], abs=0.02)
+    assert evaluation["onnx"]["accuracy"] > 0.6
+    assert abs(evaluation["onnx_variants"]["int8"]["macro_f1_delta"]) <= 0.05
+
+    validation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=artifact_dir, split="validation"))
+    streamed = json.loads((artifact_dir / "metrics.json").read_text(encoding="utf-8"))["validation"]
+    assert streamed["accuracy"] == pytest.approx(validation["sklearn"]["accuracy"])
+    assert streamed["macro_f1"] == pytest.approx(validation["sklearn"]["macro_f1"])
+
+
+def test_warm_start_reuses_parent_features_and_records_lineage(workspace_tmp: Path) -> None:
+    parent_data_dir = workspace_tmp / "parent-data"
+    data_dir = workspace_tmp / "data"
+    parent_dir = workspace_tmp / "parent"
+    child_dir = workspace_tmp / "child"
+    export_small_balanced_mixed_dataset(parent_data_dir, seed=53)
+    export_small_balanced_mixed_dataset(data_dir, seed=54)
+    train_model(TrainingConfig(data_dir=parent_data_dir, artifact_dir=parent_dir))
+
+    ignored_vocabulary = PipelineConfig(vocabulary_size=1024)
+    result = train_model(
+        TrainingConfig(data_dir=data_dir, artifact_dir=child_dir, pipeline=ignored_vocabulary, warm_start_from=parent_dir)
+    )
+    evaluation = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=child_dir, split="test"))
+
+    lineage = json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8"))["lineage"]
+    assert lineage["warm_started"] is True
+    assert lineage["generation"] == 1
+    assert lineage["parent_artifact_dir"] == str(parent_dir)
+    assert lineage["parent_training_data"]["dataset_id"]
+    assert lineage["vectorizer_mismatch"] == {}
+    assert "vocabulary_size" not in json.loads((parent_dir / "metadata.json").read_text(encoding="utf-8"))["pipeline"]
+    parent_vocabulary = joblib.load(parent_dir / "sklearn-pipeline.joblib").named_steps["features"].named_transformers_["text"].vocabulary_
+    child_vocabulary = joblib.load(child_dir / "sklearn-pipeline.joblib").named_steps["features"].named_transformers_["text"].vocabulary_
+    assert child_vocabulary == parent_vocabulary
+    assert evaluation["onnx"]["accuracy"] == pytest.approx(evaluation["sklearn"]["accuracy"])
+
+    grandchild = train_model(TrainingConfig(data_dir=data_dir, artifact_dir=child_dir, warm_start_from=child_dir))
+    assert json.loads(Path(grandchild["metadata_path"]).read_text(encoding="utf-8"))["lineage"]["generation"] == 2
+
+    reduced_dir = workspace_tmp / "reduced-data"
+    shutil.copytree(data_dir, reduced_dir)
+    for split in ("train", "validation"):
+        split_df = pd.read_csv(reduced_dir / f"{split}.csv", dtype={"mccCode": "string"})
+        split_df[split_df["label"] != "HEALTH"].to_csv(reduced_dir / f"{split}.csv", index=False)
+    fallback = train_model(TrainingConfig(data_dir=reduced_dir, artifact_dir=workspace_tmp / "refit", warm_start_from=parent_dir))
+    fallback_lineage = json.loads(Path(fallback["metadata_path"]).read_text(encoding="utf-8"))["lineage"]
+    assert fallback_lineage["warm_started"] is False
+    assert fallback_lineage["fallback_reason"] == "training labels differ from the parent model"
+
+    bounded = PipelineConfig(model_type=BOUNDED_TFIDF_MODEL_TYPE, vocabulary_size=64)
+    refit = train_model(
+        TrainingConfig(data_dir=data_dir, artifact_dir=workspace_tmp / "bounded", pipeline=bounded, warm_start_from=parent_dir)
+    )
+    refit_metadata = json.loads(Path(refit["metadata_path"]).read_text(encoding="utf-8"))
+    assert refit_metadata["lineage"]["warm_started"] is False
+    assert refit_metadata["lineage"]["fallback_reason"] == (
+        "vectorizer settings differ from the parent model: model_type, vocabulary_size"
+    )
+    assert refit_metadata["lineage"]["vectorizer_mismatch"]["vocabulary_size"] == {"requested": 64, "parent": None}
+    assert refit_metadata["pipeline"]["vocabulary_size"] == refit_metadata["text_vocabulary_size"] == 64
+
+
+def test_temperature_calibration_is_folded_into_exported_model(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    raw_dir = workspace_tmp / "raw"
+    calibrated_dir = workspace_tmp / "calibrated"
+    export_small_realistic_dataset(data_dir, seed=59)
+
+    train_model(TrainingConfig(data_dir=data_dir, artifact_dir=raw_dir))
+    result = train_model(TrainingConfig(data_dir=data_dir, artifact_dir=calibrated_dir, calibration="temperature"))
+    raw = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=raw_dir, split="test"))
+    calibrated = evaluate_artifacts(EvaluationConfig(data_dir=data_dir, artifact_dir=calibrated_dir, split="test"))
+
+    calibration = json.loads(Path(result["calibration_path"]).read_text(encoding="utf-8"))
+    metrics = json.loads(Path(result["metrics_path"]).read_text(encoding="utf-8"))
+    assert metrics["calibration"] == calibration
+    assert calibration["temperature"] > 0
+    assert calibration["after"]["negative_log_likelihood"] <= calibration["before"]["negative_log_likelihood"]
+    assert metrics["validation"]["expected_calibration_error"] == pytest.approx(
+        calibration["after"]["expected_calibration_error"]
+    )
+    assert calibrated["onnx"]["accuracy"] == pytest.approx(raw["onnx"]["accuracy"])
+    assert calibrated["onnx"]["accuracy"] == pytest.approx(calibrated["sklearn"]["accuracy"])
+    assert calibrated["onnx"]["confidence"]["mean"] != pytest.approx(raw["onnx"]["confidence"]["mean"])
+
+
 def test_training_and_evaluate_cli_smoke(workspace_tmp: Path) -> None:
     data_dir = workspace_tmp / "data"
     artifact_dir = workspace_tmp / "artifacts"
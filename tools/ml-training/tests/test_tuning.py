@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("skl2onnx")
+
+
+ML_TRAINING_DIR = Path(__file__).resolve().parents[1]
+if str(ML_TRAINING_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_TRAINING_DIR))
+
+from ml_training.dataset import DatasetExportConfig, export_datasets  # noqa: E402
+from ml_training.tuning import TuningConfig, candidate_configs, tune_pipeline  # noqa: E402
+
+
+@pytest.fixture()
+def workspace_tmp(request) -> Path:
+    root = ML_TRAINING_DIR / ".test-output" / request.node.name
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_tuning_fits_each_vectorizer_once_and_reports_every_trial(workspace_tmp: Path) -> None:
+    data_dir = workspace_tmp / "data"
+    export_datasets(
+        DatasetExportConfig(
+            output_dir=data_dir,
+            dataset_profile="balanced",
+            split_strategy="mixed",
+            train_per_category=20,
+            validation_per_category=4,
+            test_per_category=4,
+            users_per_split=8,
+            seed=83,
+        )
+    )
+    search_space = {
+        "ngram_range": [[1, 1], [1, 2]],
+        "c": [0.5, 2.0],
+        "max_iter": [200],
+    }
+
+    report = tune_pipeline(
+        TuningConfig(
+            data_dir=data_dir,
+            output_dir=workspace_tmp / "artifacts",
+            n_jobs=2,
+            search_space=search_space,
+        )
+    )
+
+    assert report["trial_count"] == 4
+    assert [group["trials"] for group in report["vectorizers"]] == [2, 2]
+    scores = [trial["validation_macro_f1"] for trial in report["trials"]]
+    assert scores == sorted(scores, reverse=True)
+    assert report["best"] == report["trials"][0]
+    for trial in report["trials"]:
+        assert 0.0 <= trial["validation_macro_f1"] <= 1.0
+        assert trial["inference_us_per_row"] > 0
+        assert trial["onnx_bytes"] > 0
+    saved = json.loads((workspace_tmp / "artifacts" / "tuning.json").read_text(encoding="utf-8"))
+    assert saved["trial_count"] == 4
+
+    sampled = candidate_configs(
+        TuningConfig(data_dir=data_dir, output_dir=workspace_tmp, search="random", n_trials=3, search_space=search_space)
+    )
+    assert len(sampled) == 3
+    assert all(isinstance(candidate.ngram_range, tuple) for candidate in sampled)
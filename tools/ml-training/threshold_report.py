@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ml_training.thresholds import (
+    DEFAULT_ACCURACY_TARGETS,
+    DEFAULT_THRESHOLD_STEP,
+    ThresholdReportConfig,
+    build_threshold_report,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sweep the LLM routing threshold and report fallback rate against accepted accuracy."
+    )
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--split", choices=("train", "validation", "test"), default="test")
+    parser.add_argument("--runtime", default="onnx", help="sklearn, onnx or an ONNX variant name.")
+    parser.add_argument(
+        "--probabilities",
+        type=Path,
+        help="Probability matrix written by evaluate.py --save-probabilities; defaults to the spilled file if present.",
+    )
+    parser.add_argument("--y-true", type=Path, help="True label indices matching --probabilities.")
+    parser.add_argument("--step", type=float, default=DEFAULT_THRESHOLD_STEP, help="Threshold grid spacing.")
+    parser.add_argument(
+        "--accuracy-targets",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_ACCURACY_TARGETS),
+        help="Recommend the lowest-fallback threshold reaching each accepted accuracy.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = build_threshold_report(
+        ThresholdReportConfig(
+            data_dir=args.data_dir,
+            artifact_dir=args.artifact_dir,
+            split=args.split,
+            runtime=args.runtime,
+            probabilities_path=args.probabilities,
+            y_true_path=args.y_true,
+            threshold_step=args.step,
+            accuracy_targets=tuple(args.accuracy_targets),
+            chunk_size=args.chunk_size,
+        )
+    )
+    current = report["current"]
+    print(f"rows: {report['rows']}")
+    print(
+        f"current threshold {current['threshold']:.3f}: fallback {current['fallback_fraction']:.4f}, "
+        f"accepted accuracy {format_accuracy(current['accepted_accuracy'])}"
+    )
+    for recommendation in report["recommendations"]:
+        if recommendation["threshold"] is None:
+            print(f"target {recommendation['target_accuracy']:.3f}: not reachable")
+            continue
+        print(
+            f"target {recommendation['target_accuracy']:.3f}: threshold {recommendation['threshold']:.3f}, "
+            f"fallback {recommendation['fallback_fraction']:.4f}, "
+            f"{recommendation['llm_calls_per_million']:.0f} LLM calls per million"
+        )
+    print(f"report: {report['report_path']}")
+    print(f"csv: {report['csv_path']}")
+
+
+def format_accuracy(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.4f}"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import json
 from pathlib import Path
 
-from ml_training.model import TrainingConfig, train_model
+from ml_training.calibration import CALIBRATION_METHODS
+from ml_training.feature_cache import FeatureCacheConfig
+from ml_training.model import (
+    DEFAULT_VOCABULARY_SIZE,
+    MODEL_TYPES,
+    PENALTIES,
+    TFIDF_MODEL_TYPE,
+    PipelineConfig,
+    StreamingConfig,
+    TrainingConfig,
+    train_model,
+)
+from ml_training.registry import RegistryConfig, train_registered_model
 
 
 def parse_args() -> argparse.Namespace:
@@ -11,22 +24,140 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--data-dir", type=Path, default=Path("data"))
     parser.add_argument("--artifact-dir", type=Path, default=Path("artifacts"))
     parser.add_argument("--target-opset", type=int, default=15)
+    parser.add_argument("--model-type", choices=MODEL_TYPES, default=TFIDF_MODEL_TYPE)
+    parser.add_argument(
+        "--vocabulary-size",
+        type=int,
+        default=DEFAULT_VOCABULARY_SIZE,
+        help="Maximum TF-IDF terms kept by the bounded model type.",
+    )
+    parser.add_argument("--c", type=float, default=1.0, help="Inverse regularization strength.")
+    parser.add_argument(
+        "--penalty",
+        choices=PENALTIES,
+        default="l2",
+        help="Logistic regression regularization; l1 and elasticnet produce sparse coefficients.",
+    )
+    parser.add_argument("--l1-ratio", type=float, default=0.5, help="L1 share of the elasticnet penalty.")
+    parser.add_argument("--solver", help="Logistic regression solver; defaults to saga for l1/elasticnet, else lbfgs.")
+    parser.add_argument(
+        "--prune-vocabulary",
+        action="store_true",
+        help="Drop TF-IDF terms whose coefficients are zero for every class and refit before export.",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Train out of core: read train.csv in chunks and fit an SGD classifier with partial_fit.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Rows per chunk in streaming mode.")
+    parser.add_argument("--epochs", type=int, default=3, help="Passes over train.csv in streaming mode.")
+    parser.add_argument("--alpha", type=float, default=1e-4, help="SGD regularization strength in streaming mode.")
+    parser.add_argument(
+        "--warm-start-from",
+        type=Path,
+        help="Artifact directory whose fitted features and coefficients seed this training run.",
+    )
+    parser.add_argument(
+        "--calibration",
+        choices=CALIBRATION_METHODS,
+        help="Fit a calibration on the validation split and fold it into the exported model.",
+    )
+    parser.add_argument(
+        "--optimize-onnx",
+        action="store_true",
+        help="Also write ORT-optimized and int8 dynamically quantized ONNX variants.",
+    )
+    parser.add_argument(
+        "--numeric-onnx",
+        action="store_true",
+        help="Also write an ONNX variant that takes pre-tokenized vocabulary indices instead of strings.",
+    )
+    parser.add_argument(
+        "--footprint-baseline",
+        type=Path,
+        help="Artifact directory whose metadata.json footprint this build is compared against; "
+        "defaults to the previous build in --artifact-dir.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Reuse cached feature matrices from this directory.",
+    )
+    parser.add_argument("--cache-max-mb", type=int, default=2048, help="Feature cache size limit.")
+    parser.add_argument(
+        "--registry-dir",
+        type=Path,
+        help="Store the build in this content-addressed registry and reuse an identical earlier build.",
+    )
+    parser.add_argument(
+        "--retrain",
+        action="store_true",
+        help="Train and re-register even when the registry already has this data and config.",
+    )
     return parser.parse_args()
 
 
+def feature_cache_config(args: argparse.Namespace) -> FeatureCacheConfig | None:
+    if args.cache_dir is None:
+        return None
+    return FeatureCacheConfig(cache_dir=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
 def main() -> None:
     args = parse_args()
-    result = train_model(
-        TrainingConfig(
-            data_dir=args.data_dir,
-            artifact_dir=args.artifact_dir,
-            target_opset=args.target_opset,
-        )
+    config = TrainingConfig(
+        data_dir=args.data_dir,
+        artifact_dir=args.artifact_dir,
+        target_opset=args.target_opset,
+        optimize_onnx=args.optimize_onnx,
+        numeric_onnx=args.numeric_onnx,
+        footprint_baseline=args.footprint_baseline,
+        pipeline=PipelineConfig(
+            model_type=args.model_type,
+            vocabulary_size=args.vocabulary_size,
+            c=args.c,
+            penalty=args.penalty,
+            l1_ratio=args.l1_ratio,
+            solver=args.solver or ("lbfgs" if args.penalty == "l2" else "saga"),
+            prune_vocabulary=args.prune_vocabulary,
+        ),
+        feature_cache=feature_cache_config(args),
+        warm_start_from=args.warm_start_from,
+        calibration=args.calibration,
+        streaming=(
+            StreamingConfig(chunk_size=args.chunk_size, epochs=args.epochs, alpha=args.alpha)
+            if args.streaming
+            else None
+        ),
     )
+    if args.registry_dir is not None:
+        result = train_registered_model(config, RegistryConfig(registry_dir=args.registry_dir, retrain=args.retrain))
+        print(f"registry: {result['registry_key']} ({'reused' if result['reused'] else 'registered'})")
+    else:
+        result = train_model(config)
     print(f"sklearn model: {result['sklearn_model_path']}")
     print(f"onnx model: {result['onnx_model_path']}")
+    for key, path in result.items():
+        if key.startswith("onnx_") and key != "onnx_model_path":
+            print(f"{key.removeprefix('onnx_').removesuffix('_model_path')} onnx model: {path}")
     print(f"labels: {result['labels_path']}")
+    if "calibration_path" in result:
+        print(f"calibration: {result['calibration_path']}")
     print(f"metrics: {result['metrics_path']}")
+    metadata = json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8"))
+    pruning = metadata["pruning"]
+    if pruning is not None:
+        print(
+            f"pruning: {pruning['text_vocabulary_before']} -> {pruning['text_vocabulary_after']} terms, "
+            f"validation macro F1 {pruning['validation_macro_f1_delta']:+.4f}"
+        )
+    footprint = metadata["footprint"]
+    print(
+        f"footprint: onnx {footprint['onnx_bytes']} bytes, "
+        f"{footprint['nonzero_coefficients']}/{footprint['coefficients']} nonzero coefficients, "
+        f"session {footprint['session_seconds'] * 1000:.0f} ms, first inference {footprint['first_inference_ms']:.1f} ms"
+    )
 
 
 if __name__ == "__main__":
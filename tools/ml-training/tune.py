@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from ml_training.feature_cache import FeatureCacheConfig
+from ml_training.tuning import SEARCH_STRATEGIES, TuningConfig, tune_pipeline
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search TF-IDF and LogisticRegression hyperparameters.")
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--output-dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--search", choices=SEARCH_STRATEGIES, default="grid")
+    parser.add_argument("--n-trials", type=int, default=20, help="Trials sampled by random search.")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="joblib worker count; -1 uses every CPU.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--target-opset", type=int, default=15)
+    parser.add_argument(
+        "--space",
+        type=Path,
+        help="JSON file mapping PipelineConfig fields to candidate value lists.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Reuse cached feature matrices from this directory.",
+    )
+    parser.add_argument("--cache-max-mb", type=int, default=2048, help="Feature cache size limit.")
+    return parser.parse_args()
+
+
+def feature_cache_config(args: argparse.Namespace) -> FeatureCacheConfig | None:
+    if args.cache_dir is None:
+        return None
+    return FeatureCacheConfig(cache_dir=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
+def main() -> None:
+    args = parse_args()
+    search_space = json.loads(args.space.read_text(encoding="utf-8")) if args.space else None
+    report = tune_pipeline(
+        TuningConfig(
+            data_dir=args.data_dir,
+            output_dir=args.output_dir,
+            search=args.search,
+            n_trials=args.n_trials,
+            n_jobs=args.n_jobs,
+            seed=args.seed,
+            target_opset=args.target_opset,
+            search_space=search_space,
+            feature_cache=feature_cache_config(args),
+        )
+    )
+    print(f"{'macro_f1':>8} {'train s':>8} {'us/row':>8} {'onnx KiB':>9}  pipeline")
+    for trial in report["trials"]:
+        print(
+            f"{trial['validation_macro_f1']:>8.4f} {trial['train_seconds']:>8.2f} "
+            f"{trial['inference_us_per_row']:>8.1f} {trial['onnx_bytes'] / 1024:>9.1f}  "
+            f"{json.dumps(trial['pipeline'], sort_keys=True)}"
+        )
+    print(f"report: {report['report_path']}")
+
+
+if __name__ == "__main__":
+    main()